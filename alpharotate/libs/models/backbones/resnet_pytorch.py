@@ -1,8 +1,104 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
+import os
+import re
+
+import numpy as np
 import tensorflow as tf
 import tensorflow.contrib.slim as slim
 
+# variables whose values are assigned from the pretrained weights after the session is created
+PRETRAINED_WEIGHTS = 'pytorch_pretrained_weights'
+_SUFFIX = {'weights': '_weight', 'bias': '_bias', 'mean': '_mean', 'var': '_var', 'scale': '_scale'}
+
+
+def load_weight_file(weight_file):
+    '''
+    :param weight_file: pickled dict of the converted model (.npy) or a directory written by save_weight_dir,
+                        whose tensors are memory-mapped (only the headers are read until the values are used)
+    :return: dict, node name --> {key: array}
+    '''
+    if os.path.isdir(weight_file):
+        weights_dict = {}
+        for file_name in os.listdir(weight_file):
+            if file_name.endswith('.npy'):
+                name, key = file_name[:-4].split('.')
+                weights_dict.setdefault(name, {})[key] = np.load(os.path.join(weight_file, file_name), mmap_mode='r')
+        return weights_dict
+    try:
+        return np.load(weight_file, allow_pickle=True).item()
+    except:
+        return np.load(weight_file, allow_pickle=True, encoding='bytes').item()
+
+
+def save_weight_dir(weight_file, weight_dir):
+    '''
+    convert the pickled dict to one uncompressed <node>.<key>.npy per tensor, which can be memory-mapped
+    '''
+    if not os.path.exists(weight_dir):
+        os.makedirs(weight_dir)
+    for name, tensors in load_weight_file(weight_file).items():
+        name = name.decode() if isinstance(name, bytes) else name
+        for key, value in tensors.items():
+            key = key.decode() if isinstance(key, bytes) else key
+            np.save(os.path.join(weight_dir, '{}.{}.npy'.format(name, key)), np.ascontiguousarray(value))
+
+
+def group_convolution(inputs, w, group, method='split', strides=(1, 1), padding='VALID', name=None):
+    '''
+    :param w: [kh, kw, cin / group, cout], pytorch layout of the grouped kernel
+    :param method: 'depthwise': one depthwise conv with cout / group outputs per input channel,
+                   summed over the input channels of each group (more memory, cin / group times the output)
+                   'native': grouped conv2d, tf >= 1.14 on gpu
+                   'split': a conv per group and concat
+    '''
+    strides = list(strides)
+    if method == 'split':
+        weight_groups = tf.split(w, num_or_size_splits=group, axis=-1)
+        xs = tf.split(inputs, num_or_size_splits=group, axis=-1)
+        convolved = [tf.nn.convolution(x, weight, strides=strides, padding=padding, name=name) for
+                     (x, weight) in zip(xs, weight_groups)]
+        return tf.concat(convolved, axis=-1)
+    elif method == 'native':
+        return tf.nn.conv2d(inputs, w, strides=[1] + strides + [1], padding=padding, name=name)
+    elif method == 'depthwise':
+        kh, kw, cin_g, cout = w.get_shape().as_list()
+        cout_g = cout // group
+        # input channel g * cin_g + i --> the cout_g outputs of group g
+        dw = tf.reshape(tf.transpose(tf.reshape(w, [kh, kw, cin_g, group, cout_g]), [0, 1, 3, 2, 4]),
+                        [kh, kw, group * cin_g, cout_g])
+        layer = tf.nn.depthwise_conv2d(inputs, dw, strides=[1] + strides + [1], padding=padding)
+        shape = tf.shape(layer)
+        layer = tf.reduce_sum(tf.reshape(layer, [shape[0], shape[1], shape[2], group, cin_g, cout_g]), axis=4)
+        return tf.reshape(layer, [shape[0], shape[1], shape[2], cout], name=name)
+    else:
+        raise ValueError('unknown group convolution: {}'.format(method))
+
+
+class PretrainedWeightRestorer(object):
+    '''
+    Assigns the pretrained weights to the variables of PRETRAINED_WEIGHTS (and their moving averages),
+    with the interface of tf.train.Saver so that the train / test drivers restore it the same way.
+    Variable.load feeds the value to the initializer, no op is added to the graph.
+    '''
+
+    def restore(self, sess, weight_file):
+        weights_dict = load_weight_file(weight_file)
+        global_variables = {var.op.name: var for var in tf.global_variables()}
+        for var in tf.get_collection(PRETRAINED_WEIGHTS):
+            # tf.Variable makes the names unique with _1, _2 ...
+            var_name = re.sub(r'_\d+$', '', var.op.name.split('/')[-1])
+            for key, suffix in _SUFFIX.items():
+                if var_name.endswith(suffix):
+                    value = weights_dict[var_name[:-len(suffix)]][key]
+                    break
+            else:
+                raise ValueError('{} is not a pretrained weight'.format(var.op.name))
+            var.load(value, sess)
+            average = global_variables.get(var.op.name + '/ExponentialMovingAverage')
+            if average is not None:
+                average.load(value, sess)
+
 
 class ResNetPytorchBackbone(object):
 
@@ -15,16 +111,19 @@ class ResNetPytorchBackbone(object):
         self.scope_name = 'resnet50'
 
     def load_weights(self, weight_file):
-        import numpy as np
-
         if weight_file is None:
             return
-        try:
-            weights_dict = np.load(weight_file, allow_pickle=True).item()
-        except:
-            weights_dict = np.load(weight_file, allow_pickle=True, encoding='bytes').item()
+        return load_weight_file(weight_file)
 
-        return weights_dict
+    def pretrained_variable(self, name, key, trainable):
+        '''
+        the graph only holds the shape, the value is assigned by PretrainedWeightRestorer
+        '''
+        value = self._weights_dict[name][key]
+        var = tf.Variable(tf.zeros(value.shape, tf.as_dtype(value.dtype)), trainable=trainable,
+                          name=name + _SUFFIX[key])
+        tf.add_to_collection(PRETRAINED_WEIGHTS, var)
+        return var
 
     def resnext50_32x4d(self, inputs, weight_file=None):
         feature_dict = {}
@@ -1019,26 +1118,23 @@ class ResNetPytorchBackbone(object):
         return feature_dict
 
     def convolution(self, inputs, name, group, **kwargs):
-        w = tf.Variable(self._weights_dict[name]['weights'], trainable=self.is_training and int(name[4:]) > self.freeze_blocks_node_index[self.scope_name], name=name + "_weight")
+        trainable = self.is_training and int(name[4:]) > self.freeze_blocks_node_index[self.scope_name]
+        w = self.pretrained_variable(name, 'weights', trainable)
         if group == 1:
             layer = tf.nn.convolution(inputs, w, name=name, **kwargs)
         else:
-            weight_groups = tf.split(w, num_or_size_splits=group, axis=-1)
-            xs = tf.split(inputs, num_or_size_splits=group, axis=-1)
-            convolved = [tf.nn.convolution(x, weight, name=name, **kwargs) for
-                         (x, weight) in zip(xs, weight_groups)]
-            layer = tf.concat(convolved, axis=-1)
+            layer = group_convolution(inputs, w, group, self.cfgs.GROUP_CONV, name=name, **kwargs)
 
         if 'bias' in self._weights_dict[name]:
-            b = tf.Variable(self._weights_dict[name]['bias'], trainable=self.is_training and int(name[4:]) > self.freeze_blocks_node_index[self.scope_name], name=name + "_bias")
+            b = self.pretrained_variable(name, 'bias', trainable)
             layer += b
         return layer
 
     def batch_normalization(self, inputs, name, **kwargs):
-        mean = tf.Variable(self._weights_dict[name]['mean'], name=name + "_mean", trainable=False)
-        variance = tf.Variable(self._weights_dict[name]['var'], name=name + "_var", trainable=False)
-        offset = tf.Variable(self._weights_dict[name]['bias'], name=name + "_bias", trainable=False) if 'bias' in self._weights_dict[name] else None
-        scale = tf.Variable(self._weights_dict[name]['scale'], name=name + "_scale", trainable=False) if 'scale' in self._weights_dict[name] else None
+        mean = self.pretrained_variable(name, 'mean', False)
+        variance = self.pretrained_variable(name, 'var', False)
+        offset = self.pretrained_variable(name, 'bias', False) if 'bias' in self._weights_dict[name] else None
+        scale = self.pretrained_variable(name, 'scale', False) if 'scale' in self._weights_dict[name] else None
         return tf.nn.batch_normalization(inputs, mean, variance, offset, scale, name=name, **kwargs)
 
     def resnet_base(self, img_batch, scope_name, is_training=True):
@@ -1060,3 +1156,70 @@ class ResNetPytorchBackbone(object):
             return feature_dict
 
 
+
+
+if __name__ == '__main__':
+    # 1. graph size and startup time, pickled weights vs memory-mapped weights
+    # 2. cpu latency of the grouped convs of resnext50_32x4d (800 x 800 input), split vs depthwise
+    #   python resnet_pytorch.py --weight_file ../../../../dataloader/pretrained_weights/resnet50.npy
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser('Pretrained weights and grouped convs of the PyTorch backbones')
+    parser.add_argument('--weight_file', default=None, type=str)
+    parser.add_argument('--net_name', default='resnet50', type=str)
+    parser.add_argument('--group_conv', default='split', type=str)
+    parser.add_argument('--runs', default=20, type=int)
+    args = parser.parse_args()
+
+    if args.weight_file is not None:
+        weight_dir = os.path.splitext(args.weight_file)[0]
+        if not os.path.isdir(weight_dir):
+            save_weight_dir(args.weight_file, weight_dir)
+
+        print('%-10s %12s %12s %12s %12s' % ('weights', 'graph(MB)', 'baked(MB)', 'build(s)', 'restore(s)'))
+        for name, weight_file in [('pickled', args.weight_file), ('mmap', weight_dir)]:
+            class Cfgs(object):
+                NET_NAME = args.net_name
+                PRETRAINED_CKPT = weight_file
+                GROUP_CONV = args.group_conv
+
+            start = time.time()
+            with tf.Graph().as_default() as graph:
+                img = tf.placeholder(tf.float32, [1, 800, 800, 3])
+                ResNetPytorchBackbone(Cfgs).resnet_base(img, args.net_name, is_training=True)
+                build_time = time.time() - start
+                graph_size = graph.as_graph_def().ByteSize()
+                # the size of the constants the graph held before the weights were assigned in the session
+                embed_size = sum([v.nbytes for t in load_weight_file(weight_file).values() for v in t.values()])
+                with tf.Session() as sess:
+                    sess.run(tf.global_variables_initializer())
+                    start = time.time()
+                    PretrainedWeightRestorer().restore(sess, weight_file)
+                    restore_time = time.time() - start
+            print('%-10s %12.2f %12.2f %12.2f %12.2f' % (name, graph_size / 1024. ** 2,
+                                                         (graph_size + embed_size) / 1024. ** 2,
+                                                         build_time, restore_time))
+
+    # (feature size, channels, stride) of the 3x3 grouped conv of every stage
+    layers = [(200, 128, 1), (200, 256, 2), (100, 512, 2), (50, 1024, 2)]
+    print('%-16s %12s %12s %14s' % ('layer', 'split(ms)', 'depthwise(ms)', 'max abs diff'))
+    config = tf.ConfigProto(device_count={'GPU': 0})
+    for size, channels, stride in layers:
+        with tf.Graph().as_default():
+            x = tf.constant(np.random.randn(1, size, size, channels).astype(np.float32))
+            w = tf.constant(np.random.randn(3, 3, channels // 32, channels).astype(np.float32) * 0.1)
+            x_pad = tf.pad(x, [[0, 0], [1, 1], [1, 1], [0, 0]])
+            outputs = [group_convolution(x_pad, w, 32, method, strides=[stride, stride])
+                       for method in ['split', 'depthwise']]
+            with tf.Session(config=config) as sess:
+                ref, res = sess.run(outputs)
+                latency = []
+                for out in outputs:
+                    sess.run(out)
+                    start = time.time()
+                    for _ in range(args.runs):
+                        sess.run(out)
+                    latency.append((time.time() - start) / args.runs * 1000)
+        print('%-16s %12.2f %12.2f %14.3e' % ('%dx%dx%d/%d' % (size, size, channels, stride),
+                                              latency[0], latency[1], np.max(np.abs(ref - res))))
@@ -12,28 +12,27 @@ class BoxHead(object):
     def __init__(self, cfgs):
         self.cfgs = cfgs
 
-    def fpn_fc_head(self, roi_extractor, rois_list, feature_pyramid, img_shape, is_training, mode=0):
+    def multilevel_roi_pooling(self, roi_extractor, rois, roi_levels, feature_pyramid, img_shape, mode=0):
+        '''
+        :param rois: [-1, 4] (mode=0) or [-1, 5] (mode=1)
+        :param roi_levels: [-1, ], output of assign_levels
+        :return: roi features, in the same order as rois
+        '''
+        if mode == 1:
+            rois = tf.py_func(forward_convert,
+                              inp=[rois, False],
+                              Tout=tf.float32)
+            rois = get_horizen_minAreaRectangle(rois, False)
+
+        return roi_extractor.multilevel_roi_align(feature_pyramid=feature_pyramid, rois=rois,
+                                                  roi_levels=roi_levels, img_shape=img_shape)
+
+    def fpn_fc_head(self, roi_extractor, rois, roi_levels, feature_pyramid, img_shape, is_training, mode=0):
         with tf.variable_scope('Fast-RCNN'):
 
             with tf.variable_scope('rois_pooling'):
-                roi_features_list = []
-                for level_name, rois in zip(self.cfgs.LEVEL, rois_list):  # exclude P6_rois
-
-                    if mode == 1:
-                        rois = tf.py_func(forward_convert,
-                                          inp=[rois, False],
-                                          Tout=tf.float32)
-                        rois = get_horizen_minAreaRectangle(rois, False)
-
-                    roi_features = roi_extractor.roi_align(feature_maps=feature_pyramid[level_name],
-                                                           rois=rois, img_shape=img_shape,
-                                                           scope=level_name)
-                    # else:
-                    #     raise Exception('only support roi align (mode=0)')
-
-                    roi_features_list.append(roi_features)
-
-                all_roi_features = tf.concat(roi_features_list, axis=0)  # [minibatch_size, H, W, C]
+                all_roi_features = self.multilevel_roi_pooling(roi_extractor, rois, roi_levels, feature_pyramid,
+                                                               img_shape, mode)  # [minibatch_size, H, W, C]
 
             with tf.variable_scope('build_fc_layers'):
                 inputs = slim.flatten(inputs=all_roi_features, scope='flatten_inputs')
@@ -58,28 +57,12 @@ class BoxHead(object):
 
                 return bbox_pred, cls_score
 
-    def fpn_double_head(self, roi_extractor, rois_list, feature_pyramid, img_shape, is_training, mode=0):
+    def fpn_double_head(self, roi_extractor, rois, roi_levels, feature_pyramid, img_shape, is_training, mode=0):
         with tf.variable_scope('Fast-RCNN'):
 
             with tf.variable_scope('rois_pooling'):
-                roi_features_list = []
-                for level_name, rois in zip(self.cfgs.LEVEL, rois_list):  # exclude P6_rois
-
-                    if mode == 1:
-                        rois = tf.py_func(forward_convert,
-                                          inp=[rois, False],
-                                          Tout=tf.float32)
-                        rois = get_horizen_minAreaRectangle(rois, False)
-
-                    roi_features = roi_extractor.roi_align(feature_maps=feature_pyramid[level_name],
-                                                           rois=rois, img_shape=img_shape,
-                                                           scope=level_name)
-                    # else:
-                    #     raise Exception('only support roi align (mode=0)')
-
-                    roi_features_list.append(roi_features)
-
-                all_roi_features = tf.concat(roi_features_list, axis=0)  # [minibatch_size, H, W, C]
+                all_roi_features = self.multilevel_roi_pooling(roi_extractor, rois, roi_levels, feature_pyramid,
+                                                               img_shape, mode)  # [minibatch_size, H, W, C]
 
             with tf.variable_scope('build_fc_layers'):
                 inputs = slim.flatten(inputs=all_roi_features, scope='flatten_inputs')
@@ -169,28 +152,12 @@ class BoxHead(object):
 
             return bbox_pred_h, cls_score_h, bbox_pred_r, cls_score_r
 
-    def fpn_fc_sigmoid_head(self, roi_extractor, rois_list, feature_pyramid, img_shape, is_training, mode=0):
+    def fpn_fc_sigmoid_head(self, roi_extractor, rois, roi_levels, feature_pyramid, img_shape, is_training, mode=0):
         with tf.variable_scope('Fast-RCNN'):
 
             with tf.variable_scope('rois_pooling'):
-                roi_features_list = []
-                for level_name, rois in zip(self.cfgs.LEVEL, rois_list):  # exclude P6_rois
-
-                    if mode == 1:
-                        rois = tf.py_func(forward_convert,
-                                          inp=[rois, False],
-                                          Tout=tf.float32)
-                        rois = get_horizen_minAreaRectangle(rois, False)
-
-                    roi_features = roi_extractor.roi_align(feature_maps=feature_pyramid[level_name],
-                                                           rois=rois, img_shape=img_shape,
-                                                           scope=level_name)
-                    # else:
-                    #     raise Exception('only support roi align (mode=0)')
-
-                    roi_features_list.append(roi_features)
-
-                all_roi_features = tf.concat(roi_features_list, axis=0)  # [minibatch_size, H, W, C]
+                all_roi_features = self.multilevel_roi_pooling(roi_extractor, rois, roi_levels, feature_pyramid,
+                                                               img_shape, mode)  # [minibatch_size, H, W, C]
 
             with tf.variable_scope('build_fc_layers'):
                 inputs = slim.flatten(inputs=all_roi_features, scope='flatten_inputs')
@@ -215,22 +182,11 @@ class BoxHead(object):
 
                 return bbox_pred, cls_score
 
-    def fpn_fc_head_cls(self, roi_extractor, rois_list, feature_pyramid, img_shape, is_training, coding_len):
+    def fpn_fc_head_cls(self, roi_extractor, rois, roi_levels, feature_pyramid, img_shape, is_training, coding_len):
         with tf.variable_scope('Fast-RCNN'):
             with tf.variable_scope('rois_pooling'):
-                roi_features_list = []
-                for level_name, rois in zip(self.cfgs.LEVEL, rois_list):  # exclude P6_rois
-
-                    # if mode == 0:
-                    roi_features = roi_extractor.roi_align(feature_maps=feature_pyramid[level_name],
-                                                           rois=rois, img_shape=img_shape,
-                                                           scope=level_name)
-                    # else:
-                    #     raise Exception('only support roi align (mode=0)')
-
-                    roi_features_list.append(roi_features)
-
-                all_roi_features = tf.concat(roi_features_list, axis=0)  # [minibatch_size, H, W, C]
+                all_roi_features = self.multilevel_roi_pooling(roi_extractor, rois, roi_levels, feature_pyramid,
+                                                               img_shape)  # [minibatch_size, H, W, C]
 
             with tf.variable_scope('build_fc_layers'):
                 inputs = slim.flatten(inputs=all_roi_features, scope='flatten_inputs')
@@ -238,8 +238,9 @@ class DetectionNetworkCSL(DetectionNetworkBase):
             nms_indices = nms_rotate.nms_rotate(decode_boxes=boxes_pred_angle,
                                                 scores=scores,
                                                 iou_threshold=self.cfgs.NMS_IOU_THRESHOLD,
+                                                metric=self.cfgs.NMS_OVERLAP_METRIC,
                                                 max_output_size=100 if self.is_training else max_output_size,
-                                                use_gpu=True,
+                                                use_gpu=self.cfgs.ROTATE_NMS_USE_GPU,
                                                 gpu_id=gpu_id)
 
             tmp_boxes_pred = tf.reshape(tf.gather(boxes_pred, nms_indices), [-1, 5])
@@ -125,17 +125,11 @@ class DetectionNetworkR2CNN(DetectionNetworkBase):
                     self.add_roi_batch_img_smry(input_img_batch, rois, labels, method=0)
 
         # 6. assign level
-        if self.is_training:
-            rois_list, labels, bbox_targets = self.assign_levels(all_rois=rois,
-                                                                 labels=labels,
-                                                                 bbox_targets=bbox_targets)
-        else:
-            rois_list = self.assign_levels(all_rois=rois)
+        roi_levels = self.assign_levels(all_rois=rois)
 
         # 7. build Fast-RCNN, include roi align/pooling, box head
-        bbox_pred, cls_score = self.box_head.fpn_fc_head(self.roi_extractor, rois_list, feature_pyramid,
+        bbox_pred, cls_score = self.box_head.fpn_fc_head(self.roi_extractor, rois, roi_levels, feature_pyramid,
                                                          img_shape, self.is_training)
-        rois = tf.concat(rois_list, axis=0, name='concat_rois')
         cls_prob = slim.softmax(cls_score, 'cls_prob')
 
         if self.is_training:
@@ -465,8 +465,9 @@ class DetectionNetworkR3DetGWD(DetectionNetworkBase):
                 nms_indices = nms_rotate.nms_rotate(decode_boxes=filtered_boxes,
                                                     scores=filtered_scores,
                                                     iou_threshold=self.cfgs.NMS_IOU_THRESHOLD,
+                                                    metric=self.cfgs.NMS_OVERLAP_METRIC,
                                                     max_output_size=100 if self.is_training else max_output_size,
-                                                    use_gpu=True,
+                                                    use_gpu=self.cfgs.ROTATE_NMS_USE_GPU,
                                                     gpu_id=gpu_id)
 
                 # filter indices based on NMS
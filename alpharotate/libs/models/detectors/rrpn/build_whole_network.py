@@ -156,79 +156,15 @@ class DetectionNetworkRRPN(DetectionNetworkBase):
 
         return final_boxes, final_probs
 
-    def assign_levels(self, all_rois, labels=None, bbox_targets=None):
+    def assign_levels(self, all_rois):
         '''
-        :param all_rois:
-        :param labels:
-        :param bbox_targets:
-        :return:
+        :param all_rois: [-1, 5], [x, y, w, h, theta]
+        :return: level index of each roi (0 means cfgs.LEVEL[0]), in the same order as all_rois
         '''
         with tf.name_scope('assign_levels'):
-            # all_rois = tf.Print(all_rois, [tf.shape(all_rois)], summarize=10, message='ALL_ROIS_SHAPE*****')
             x, y, w, h, theta = tf.unstack(all_rois, axis=1)
 
-            levels = tf.floor(4. + tf.log(tf.sqrt(w * h + 1e-8) / 224.0) / tf.log(2.))  # 4 + log_2(***)
-            # use floor instead of round
-
-            min_level = int(self.cfgs.LEVEL[0][-1])
-            max_level = min(5, int(self.cfgs.LEVEL[-1][-1]))
-            levels = tf.maximum(levels, tf.ones_like(levels) * min_level)  # level minimum is 2
-            levels = tf.minimum(levels, tf.ones_like(levels) * max_level)  # level maximum is 5
-
-            levels = tf.stop_gradient(tf.reshape(levels, [-1]))
-
-            def get_rois(levels, level_i, rois, labels, bbox_targets):
-
-                level_i_indices = tf.reshape(tf.where(tf.equal(levels, level_i)), [-1])
-
-                tf.summary.scalar('LEVEL/LEVEL_%d_rois_NUM' % level_i, tf.shape(level_i_indices)[0])
-                level_i_rois = tf.gather(rois, level_i_indices)
-
-                if self.is_training:
-                    if not self.cfgs.CUDA8:
-                        # Note: for > cuda 9
-                        level_i_rois = tf.stop_gradient(level_i_rois)
-                        level_i_labels = tf.gather(labels, level_i_indices)
-
-                        level_i_targets = tf.gather(bbox_targets, level_i_indices)
-                    else:
-
-                        # Note: for cuda 8
-                        level_i_rois = tf.stop_gradient(tf.concat([level_i_rois, [[0, 0, 0., 0., 0.]]], axis=0))
-                        # to avoid the num of level i rois is 0.0, which will broken the BP in tf
-
-                        level_i_labels = tf.gather(labels, level_i_indices)
-                        level_i_labels = tf.stop_gradient(tf.concat([level_i_labels, [0]], axis=0))
-
-                        level_i_targets = tf.gather(bbox_targets, level_i_indices)
-                        level_i_targets = tf.stop_gradient(tf.concat([level_i_targets,
-                                                                      tf.zeros(shape=(1, 5 * (self.cfgs.CLASS_NUM + 1)),
-                                                                               dtype=tf.float32)], axis=0))
-
-                    return level_i_rois, level_i_labels, level_i_targets
-                else:
-                    if self.cfgs.CUDA8:
-                        # Note: for cuda 8
-                        level_i_rois = tf.concat([level_i_rois, [[0, 0, 0., 0., 0.]]], axis=0)
-                    return level_i_rois, None, None
-
-            rois_list = []
-            labels_list = []
-            targets_list = []
-            for i in range(min_level, max_level + 1):
-                P_i_rois, P_i_labels, P_i_targets = get_rois(levels, level_i=i, rois=all_rois,
-                                                             labels=labels,
-                                                             bbox_targets=bbox_targets)
-                rois_list.append(P_i_rois)
-                labels_list.append(P_i_labels)
-                targets_list.append(P_i_targets)
-
-            if self.is_training:
-                all_labels = tf.concat(labels_list, axis=0)
-                all_targets = tf.concat(targets_list, axis=0)
-                return rois_list, all_labels, all_targets
-            else:
-                return rois_list  # [P2_rois, P3_rois, P4_rois, P5_rois] Note: P6 do not assign rois
+            return self.levels_from_size(w, h)
 
     def build_whole_detection_network(self, input_img_batch, gtboxes_batch_h=None, gtboxes_batch_r=None, gpu_id=0):
 
@@ -297,17 +233,11 @@ class DetectionNetworkRRPN(DetectionNetworkBase):
                     self.add_roi_batch_img_smry(input_img_batch, rois, labels, method=1)
 
         # 6. assign level
-        if self.is_training:
-            rois_list, labels, bbox_targets = self.assign_levels(all_rois=rois,
-                                                                 labels=labels,
-                                                                 bbox_targets=bbox_targets)
-        else:
-            rois_list = self.assign_levels(all_rois=rois)
+        roi_levels = self.assign_levels(all_rois=rois)
 
         # 7. build Fast-RCNN, include roi align/pooling, box head
-        bbox_pred, cls_score = self.box_head.fpn_fc_head(self.roi_extractor, rois_list, feature_pyramid,
+        bbox_pred, cls_score = self.box_head.fpn_fc_head(self.roi_extractor, rois, roi_levels, feature_pyramid,
                                                          img_shape, self.is_training, mode=1)
-        rois = tf.concat(rois_list, axis=0, name='concat_rois')
         cls_prob = slim.softmax(cls_score, 'cls_prob')
 
         if self.is_training:
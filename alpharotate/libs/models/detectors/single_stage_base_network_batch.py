@@ -7,6 +7,7 @@ import os
 import tensorflow as tf
 import tensorflow.contrib.slim as slim
 from alpharotate.libs.models.anchor_heads.generate_anchors import GenerateAnchors
+from alpharotate.libs.models.backbones import resnet_pytorch
 from alpharotate.libs.models.backbones.build_backbone_p3top7 import BuildBackbone
 from alpharotate.libs.utils.show_box_in_tensor import DrawBoxTensor
 
@@ -170,7 +171,8 @@ class DetectionNetworkBase(object):
             print("model restore from :", checkpoint_path)
         else:
             if self.cfgs.NET_NAME in self.pretrain_zoo.pth_zoo:
-                return None, None
+                print("model restore from pretrained mode, path is :", self.cfgs.PRETRAINED_CKPT)
+                return resnet_pytorch.PretrainedWeightRestorer(), self.cfgs.PRETRAINED_CKPT
             checkpoint_path = self.cfgs.PRETRAINED_CKPT
             print("model restore from pretrained mode, path is :", checkpoint_path)
 
@@ -7,6 +7,7 @@ import os
 import tensorflow as tf
 import tensorflow.contrib.slim as slim
 from alpharotate.libs.models.anchor_heads.generate_anchors import GenerateAnchors
+from alpharotate.libs.models.backbones import resnet_pytorch
 from alpharotate.libs.models.backbones.build_backbone_p2top6 import BuildBackbone
 from alpharotate.libs.utils import bbox_transform
 from alpharotate.libs.utils.show_box_in_tensor import DrawBoxTensor
@@ -186,7 +187,8 @@ class DetectionNetworkBase(object):
             print("model restore from :", checkpoint_path)
         else:
             if self.cfgs.NET_NAME in self.pretrain_zoo.pth_zoo:
-                return None, None
+                print("model restore from pretrained mode, path is :", self.cfgs.PRETRAINED_CKPT)
+                return resnet_pytorch.PretrainedWeightRestorer(), self.cfgs.PRETRAINED_CKPT
             checkpoint_path = self.cfgs.PRETRAINED_CKPT
             print("model restore from pretrained mode, path is :", checkpoint_path)
 
@@ -229,81 +231,38 @@ class DetectionNetworkBase(object):
             print("restore from pretrained_weighs in IMAGE_NET")
         return restorer, checkpoint_path
 
-    def assign_levels(self, all_rois, labels=None, bbox_targets=None):
+    def assign_levels(self, all_rois):
         '''
-        :param all_rois:
-        :param labels:
-        :param bbox_targets:
-        :return:
+        :param all_rois: [-1, 4], [x1, y1, x2, y2]
+        :return: level index of each roi (0 means cfgs.LEVEL[0]), in the same order as all_rois
         '''
         with tf.name_scope('assign_levels'):
-            # all_rois = tf.Print(all_rois, [tf.shape(all_rois)], summarize=10, message='ALL_ROIS_SHAPE*****')
             xmin, ymin, xmax, ymax = tf.unstack(all_rois, axis=1)
 
             h = tf.maximum(0., ymax - ymin)
             w = tf.maximum(0., xmax - xmin)
 
-            levels = tf.floor(4. + tf.log(tf.sqrt(w * h + 1e-8) / 224.0) / tf.log(2.))  # 4 + log_2(***)
-            # use floor instead of round
-
-            min_level = int(self.cfgs.LEVEL[0][-1])
-            max_level = min(5, int(self.cfgs.LEVEL[-1][-1]))
-            levels = tf.maximum(levels, tf.ones_like(levels) * min_level)  # level minimum is 2
-            levels = tf.minimum(levels, tf.ones_like(levels) * max_level)  # level maximum is 5
-
-            levels = tf.stop_gradient(tf.reshape(levels, [-1]))
-
-            def get_rois(levels, level_i, rois, labels, bbox_targets):
-
-                level_i_indices = tf.reshape(tf.where(tf.equal(levels, level_i)), [-1])
-
-                tf.summary.scalar('LEVEL/LEVEL_%d_rois_NUM' % level_i, tf.shape(level_i_indices)[0])
-                level_i_rois = tf.gather(rois, level_i_indices)
-
-                if self.is_training:
-                    if not self.cfgs.CUDA8:
-                        # Note: for > cuda 9
-                        level_i_rois = tf.stop_gradient(level_i_rois)
-                        level_i_labels = tf.gather(labels, level_i_indices)
+            return self.levels_from_size(w, h)
 
-                        level_i_targets = tf.gather(bbox_targets, level_i_indices)
-                    else:
-
-                        # Note: for cuda 8
-                        level_i_rois = tf.stop_gradient(tf.concat([level_i_rois, [[0, 0, 0., 0.]]], axis=0))
-                        # to avoid the num of level i rois is 0.0, which will broken the BP in tf
-
-                        level_i_labels = tf.gather(labels, level_i_indices)
-                        level_i_labels = tf.stop_gradient(tf.concat([level_i_labels, [0]], axis=0))
+    def levels_from_size(self, w, h):
+        '''
+        rois keep their original order, so labels and targets need not be regathered per level.
+        :param w: [-1, ]
+        :param h: [-1, ]
+        :return: [-1, ] int32
+        '''
+        levels = tf.floor(4. + tf.log(tf.sqrt(w * h + 1e-8) / 224.0) / tf.log(2.))  # 4 + log_2(***)
+        # use floor instead of round
 
-                        level_i_targets = tf.gather(bbox_targets, level_i_indices)
-                        level_i_targets = tf.stop_gradient(tf.concat([level_i_targets,
-                                                                      tf.zeros(shape=(1, 5 * (self.cfgs.CLASS_NUM + 1)),
-                                                                               dtype=tf.float32)], axis=0))
+        min_level = int(self.cfgs.LEVEL[0][-1])
+        max_level = min(5, int(self.cfgs.LEVEL[-1][-1]))
+        levels = tf.maximum(levels, tf.ones_like(levels) * min_level)  # level minimum is 2
+        levels = tf.minimum(levels, tf.ones_like(levels) * max_level)  # level maximum is 5
 
-                    return level_i_rois, level_i_labels, level_i_targets
-                else:
-                    if self.cfgs.CUDA8:
-                        # Note: for cuda 8
-                        level_i_rois = tf.concat([level_i_rois, [[0, 0, 0., 0.]]], axis=0)
-                    return level_i_rois, None, None
-
-            rois_list = []
-            labels_list = []
-            targets_list = []
-            for i in range(min_level, max_level + 1):
-                P_i_rois, P_i_labels, P_i_targets = get_rois(levels, level_i=i, rois=all_rois,
-                                                             labels=labels,
-                                                             bbox_targets=bbox_targets)
-                rois_list.append(P_i_rois)
-                labels_list.append(P_i_labels)
-                targets_list.append(P_i_targets)
-
-            if self.is_training:
-                all_labels = tf.concat(labels_list, axis=0)
-                all_targets = tf.concat(targets_list, axis=0)
-                return rois_list, all_labels, all_targets
-            else:
-                return rois_list  # [P2_rois, P3_rois, P4_rois, P5_rois] Note: P6 do not assign rois
+        levels = tf.stop_gradient(tf.reshape(tf.to_int32(levels), [-1]))
 
+        for level_i in range(min_level, max_level + 1):
+            tf.summary.scalar('LEVEL/LEVEL_%d_rois_NUM' % level_i,
+                              tf.reduce_sum(tf.to_int32(tf.equal(levels, level_i))))
 
+        return levels - min_level  # Note: P6 do not assign rois
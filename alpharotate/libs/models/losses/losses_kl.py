@@ -15,68 +15,32 @@ from alpharotate.libs.utils.coordinate_convert import coordinate_present_convert
 
 from alpharotate.utils.quad2rbox import quad2rbox_tf
 from alpharotate.utils.order_points import re_order
+from alpharotate.utils import gaussian_kernels
 
 
 class LossKL(LossGWD):
 
     def get_gaussian_param(self, boxes_pred, target_boxes, shrink_ratio=1.):
-        x1, y1, w1, h1, theta1 = tf.unstack(boxes_pred, axis=1)
-        x2, y2, w2, h2, theta2 = tf.unstack(target_boxes, axis=1)
-        x1 = tf.reshape(x1, [-1, 1])
-        y1 = tf.reshape(y1, [-1, 1])
-        h1 = tf.reshape(h1, [-1, 1]) * shrink_ratio
-        w1 = tf.reshape(w1, [-1, 1]) * shrink_ratio
-        theta1 = tf.reshape(theta1, [-1, 1])
-        x2 = tf.reshape(x2, [-1, 1])
-        y2 = tf.reshape(y2, [-1, 1])
-        h2 = tf.reshape(h2, [-1, 1]) * shrink_ratio
-        w2 = tf.reshape(w2, [-1, 1]) * shrink_ratio
-        theta2 = tf.reshape(theta2, [-1, 1])
-        theta1 *= np.pi / 180
-        theta2 *= np.pi / 180
-
-        sigma1_1 = w1 / 2 * tf.cos(theta1) ** 2 + h1 / 2 * tf.sin(theta1) ** 2
-        sigma1_2 = w1 / 2 * tf.sin(theta1) * tf.cos(theta1) - h1 / 2 * tf.sin(theta1) * tf.cos(theta1)
-        sigma1_3 = w1 / 2 * tf.sin(theta1) * tf.cos(theta1) - h1 / 2 * tf.sin(theta1) * tf.cos(theta1)
-        sigma1_4 = w1 / 2 * tf.sin(theta1) ** 2 + h1 / 2 * tf.cos(theta1) ** 2
-        sigma1 = tf.reshape(tf.concat([sigma1_1, sigma1_2, sigma1_3, sigma1_4], axis=-1), [-1, 2, 2]) + tf.linalg.eye(
-            2) * 1e-5
-
-        sigma2_1 = w2 / 2 * tf.cos(theta2) ** 2 + h2 / 2 * tf.sin(theta2) ** 2
-        sigma2_2 = w2 / 2 * tf.sin(theta2) * tf.cos(theta2) - h2 / 2 * tf.sin(theta2) * tf.cos(theta2)
-        sigma2_3 = w2 / 2 * tf.sin(theta2) * tf.cos(theta2) - h2 / 2 * tf.sin(theta2) * tf.cos(theta2)
-        sigma2_4 = w2 / 2 * tf.sin(theta2) ** 2 + h2 / 2 * tf.cos(theta2) ** 2
-        sigma2 = tf.reshape(tf.concat([sigma2_1, sigma2_2, sigma2_3, sigma2_4], axis=-1), [-1, 2, 2]) + tf.linalg.eye(
-            2) * 1e-5
-
-        mu1 = tf.reshape(tf.concat([x1, y1], axis=-1), [-1, 1, 2])
-        mu2 = tf.reshape(tf.concat([x2, y2], axis=-1), [-1, 1, 2])
-
-        mu1_T = tf.reshape(tf.concat([x1, y1], axis=-1), [-1, 2, 1])
-        mu2_T = tf.reshape(tf.concat([x2, y2], axis=-1), [-1, 2, 1])
-        return sigma1, sigma2, mu1, mu2, mu1_T, mu2_T
-
-    def KL_divergence(self, mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
-        sigma1_square = tf.linalg.matmul(sigma1, sigma1)
-        sigma2_square = tf.linalg.matmul(sigma2, sigma2)
-        item1 = tf.linalg.trace(tf.linalg.matmul(tf.linalg.inv(sigma2_square), sigma1_square))
-        item2 = tf.linalg.matmul(tf.linalg.matmul(mu2-mu1, tf.linalg.inv(sigma2_square)), mu2_T-mu1_T)
-        item3 = tf.log(tf.linalg.det(sigma2_square) / (tf.linalg.det(sigma1_square) + 1e-4))
-        return (item1 + item2 + item3 - 2) / 2.
-
-    def KL_divergence_(self, mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
+        mu1, sigma1 = gaussian_kernels.rbox2gaussian(boxes_pred, shrink_ratio, eps=1e-5, degrees=True)
+        mu2, sigma2 = gaussian_kernels.rbox2gaussian(target_boxes, shrink_ratio, eps=1e-5, degrees=True)
+        return sigma1, sigma2, mu1, mu2
+
+    def pairwise_sum(self, per_row, per_col):
+        # the batched matmul version added the [N, 1, 1] mahalanobis term to the [N, ] trace and log det terms,
+        # so the loss sums all N x N combinations, kept as is since the released models are trained with it
+        return tf.reshape(per_row, [-1, 1]) + tf.reshape(per_col, [1, -1])
+
+    def KL_divergence(self, mu1, mu2, sigma1, sigma2):
+        trace, mahalanobis, log_det = gaussian_kernels.kl_divergence_terms(
+            mu1, gaussian_kernels.square(sigma1), mu2, gaussian_kernels.square(sigma2), det_eps=1e-4)
+        return (self.pairwise_sum(mahalanobis, trace + log_det) - 2) / 2.
+
+    def KL_divergence_(self, mu1, mu2, sigma1, sigma2):
         """
         Need large weight
         """
-        sigma1_square = tf.linalg.matmul(sigma1, sigma1)
-        sigma2_square = tf.linalg.matmul(sigma2, sigma2)
-        item1 = tf.linalg.trace(tf.linalg.matmul(tf.linalg.inv(sigma2_square), sigma1_square))
-        item2 = tf.linalg.matmul(tf.linalg.matmul(mu2-mu1, tf.linalg.inv(sigma2_square)), mu2_T-mu1_T)
-        item3 = tf.log(tf.linalg.det(sigma2_square) / (tf.linalg.det(sigma1_square) + 1e-4))
-        item1 = tf.reshape(item1, [-1, ])
-        item2 = tf.reshape(item2, [-1, ])
-        item3 = tf.reshape(item3, [-1, ])
-        return (item1 + item2 + item3 - 2) / 2.
+        return gaussian_kernels.kl_divergence(mu1, gaussian_kernels.square(sigma1),
+                                              mu2, gaussian_kernels.square(sigma2), det_eps=1e-4)
 
     def KL_divergence_loss(self, preds, anchor_state, target_boxes, anchors, is_refine=False, tau=1.0, func=0, shrink_ratio=1.):
         if self.cfgs.METHOD == 'H' and not is_refine:
@@ -114,12 +78,12 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=anchors, deltas=preds)
         boxes_pred = tf.reshape(boxes_pred, [-1, 5])
 
-        # sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)  # D(Np||Nt)
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(target_boxes_, boxes_pred, shrink_ratio=shrink_ratio)  # D(Nt||Np)
+        # sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)  # D(Np||Nt)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(target_boxes_, boxes_pred, shrink_ratio=shrink_ratio)  # D(Nt||Np)
 
         # KL_divergence need normalizer == KL_divergence_ do not need normalizer
-        KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
-        # KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
+        # KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance = tf.maximum(KL_distance, 0.0)
 
         if func == 0:
@@ -172,12 +136,12 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=anchors, deltas=preds)
         boxes_pred = tf.reshape(boxes_pred, [-1, 5])
 
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)
 
-        KL_distance1 = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance1 = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance1 = tf.maximum(KL_distance1, 0.0)
 
-        KL_distance2 = tf.reshape(self.KL_divergence(mu2, mu1, mu2_T, mu1_T, sigma2, sigma1), [-1, 1])
+        KL_distance2 = tf.reshape(self.KL_divergence(mu2, mu1, sigma2, sigma1), [-1, 1])
         KL_distance2 = tf.maximum(KL_distance2, 0.0)
 
         KL_distance = tf.maximum(KL_distance1, KL_distance2)
@@ -230,12 +194,12 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=anchors, deltas=preds)
         boxes_pred = tf.reshape(boxes_pred, [-1, 5])
 
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)
 
-        KL_distance1 = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance1 = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance1 = tf.maximum(KL_distance1, 0.0)
 
-        KL_distance2 = tf.reshape(self.KL_divergence(mu2, mu1, mu2_T, mu1_T, sigma2, sigma1), [-1, 1])
+        KL_distance2 = tf.reshape(self.KL_divergence(mu2, mu1, sigma2, sigma1), [-1, 1])
         KL_distance2 = tf.maximum(KL_distance2, 0.0)
 
         KL_distance = tf.minimum(KL_distance1, KL_distance2)
@@ -287,12 +251,12 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=anchors, deltas=preds)
         boxes_pred = tf.reshape(boxes_pred, [-1, 5])
 
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)
 
-        KL_distance1 = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance1 = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance1 = tf.maximum(KL_distance1, 0.0)
 
-        KL_distance2 = tf.reshape(self.KL_divergence(mu2, mu1, mu2_T, mu1_T, sigma2, sigma1), [-1, 1])
+        KL_distance2 = tf.reshape(self.KL_divergence(mu2, mu1, sigma2, sigma1), [-1, 1])
         KL_distance2 = tf.maximum(KL_distance2, 0.0)
 
         KL_distance = KL_distance1 + KL_distance2
@@ -314,24 +278,18 @@ class LossKL(LossGWD):
 
         return tf.reduce_sum(KL_loss) / normalizer
 
-    def JS_divergence(self, mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
+    def JS_divergence(self, mu1, mu2, sigma1, sigma2):
+        sigma1_square = gaussian_kernels.square(sigma1)
+        sigma2_square = gaussian_kernels.square(sigma2)
 
-        def kl_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
-            item1 = tf.linalg.trace(tf.linalg.matmul(tf.linalg.inv(sigma2), sigma1))
-            item2 = tf.linalg.matmul(tf.linalg.matmul(mu2 - mu1, tf.linalg.inv(sigma2)), mu2_T - mu1_T)
-            item3 = tf.log(tf.linalg.det(sigma2) / (tf.linalg.det(sigma1) + 1e-4))
-            return (item1 + item2 + item3 - 2) / 2.
+        sigma_square = gaussian_kernels.mean(sigma1_square, sigma2_square)
+        mu = gaussian_kernels.mean(mu1, mu2)
 
-        sigma1_square = tf.linalg.matmul(sigma1, sigma1)
-        sigma2_square = tf.linalg.matmul(sigma2, sigma2)
-
-        sigma_square = (sigma1_square + sigma2_square) / 2.
-        mu = (mu1 + mu2) / 2.
-        mu_T = (mu1_T + mu2_T) / 2.
-
-        js1 = kl_divergence(mu1, mu, mu1_T, mu_T, sigma1_square, sigma_square)
-        js2 = kl_divergence(mu2, mu, mu2_T, mu_T, sigma2_square, sigma_square)
-        js = js1 + js2
+        trace1, mahalanobis1, log_det1 = gaussian_kernels.kl_divergence_terms(mu1, sigma1_square, mu, sigma_square,
+                                                                              det_eps=1e-4)
+        trace2, mahalanobis2, log_det2 = gaussian_kernels.kl_divergence_terms(mu2, sigma2_square, mu, sigma_square,
+                                                                              det_eps=1e-4)
+        js = (self.pairwise_sum(mahalanobis1 + mahalanobis2, trace1 + log_det1 + trace2 + log_det2) - 4) / 2.
 
         return js
 
@@ -373,16 +331,9 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=anchors, deltas=preds)
         boxes_pred = tf.reshape(boxes_pred, [-1, 5])
 
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)
-
-        # sigma1, sigma2 = tf.py_func(self.debug,
-        #                             inp=[mu1, mu2, mu1_T, mu2_T, tf.linalg.matmul(sigma1, sigma1),
-        #                                  tf.linalg.matmul(sigma2, sigma2)],
-        #                             Tout=[tf.float32, tf.float32])
-        # sigma1 = tf.reshape(sigma1, [-1, 2, 2])
-        # sigma2 = tf.reshape(sigma2, [-1, 2, 2])
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)
 
-        JS_distance = tf.reshape(self.JS_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        JS_distance = tf.reshape(self.JS_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
         JS_distance = tf.maximum(JS_distance, 0.0)
 
         if func == 0:
@@ -428,18 +379,18 @@ class LossKL(LossGWD):
         boxes_pred = quad2rbox_tf(boxes_pred)
 
         target_boxes_1 = quad2rbox_tf(tf.transpose(tf.stack([x1, y1, x2, y2, x3, y3, x4, y4])))
-        sigma1_1, sigma2_1, mu1_1, mu2_1, mu1_T_1, mu2_T_1 = self.get_gaussian_param(boxes_pred, target_boxes_1)
-        KL_distance_1 = tf.reshape(self.KL_divergence(mu1_1, mu2_1, mu1_T_1, mu2_T_1, sigma1_1, sigma2_1), [-1, 1])
+        sigma1_1, sigma2_1, mu1_1, mu2_1 = self.get_gaussian_param(boxes_pred, target_boxes_1)
+        KL_distance_1 = tf.reshape(self.KL_divergence(mu1_1, mu2_1, sigma1_1, sigma2_1), [-1, 1])
         KL_distance_1 = tf.maximum(KL_distance_1, 0.0)
 
         target_boxes_2 = quad2rbox_tf(tf.transpose(tf.stack([x2, y2, x3, y3, x4, y4, x1, y1])))
-        sigma1_2, sigma2_2, mu1_2, mu2_2, mu1_T_2, mu2_T_2 = self.get_gaussian_param(boxes_pred, target_boxes_2)
-        KL_distance_2 = tf.reshape(self.KL_divergence(mu1_2, mu2_2, mu1_T_2, mu2_T_2, sigma1_2, sigma2_2), [-1, 1])
+        sigma1_2, sigma2_2, mu1_2, mu2_2 = self.get_gaussian_param(boxes_pred, target_boxes_2)
+        KL_distance_2 = tf.reshape(self.KL_divergence(mu1_2, mu2_2, sigma1_2, sigma2_2), [-1, 1])
         KL_distance_2 = tf.maximum(KL_distance_2, 0.0)
 
         target_boxes_3 = quad2rbox_tf(tf.transpose(tf.stack([x4, y4, x1, y1, x2, y2, x3, y3])))
-        sigma1_3, sigma2_3, mu1_3, mu2_3, mu1_T_3, mu2_T_3 = self.get_gaussian_param(boxes_pred, target_boxes_3)
-        KL_distance_3 = tf.reshape(self.KL_divergence(mu1_3, mu2_3, mu1_T_3, mu2_T_3, sigma1_3, sigma2_3), [-1, 1])
+        sigma1_3, sigma2_3, mu1_3, mu2_3 = self.get_gaussian_param(boxes_pred, target_boxes_3)
+        KL_distance_3 = tf.reshape(self.KL_divergence(mu1_3, mu2_3, sigma1_3, sigma2_3), [-1, 1])
         KL_distance_3 = tf.maximum(KL_distance_3, 0.0)
 
         KL_distance = tf.minimum(tf.minimum(KL_distance_1, KL_distance_2), KL_distance_3)
@@ -484,9 +435,9 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=rois, deltas=tf.reshape(bbox_pred, [-1, 5]),
                                                         scale_factors=self.cfgs.ROI_SCALE_FACTORS)
 
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_gt)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_gt)
 
-        KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance = tf.maximum(KL_distance, 0.0)
 
         if func == 0:
@@ -537,9 +488,9 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=rois, deltas=tf.reshape(bbox_pred, [-1, 5]),
                                                         scale_factors=self.cfgs.ROI_SCALE_FACTORS)
 
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_gt)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_gt)
 
-        KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance = tf.maximum(KL_distance, 0.0)
 
         if func == 0:
@@ -597,12 +548,12 @@ class LossKL(LossGWD):
         boxes_pred = bbox_transform.rbbox_transform_inv(boxes=anchors, deltas=preds)
         boxes_pred = tf.reshape(boxes_pred, [-1, 5])
 
-        # sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)  # D(Np||Nt)
-        sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(target_boxes_, boxes_pred)  # D(Nt||Np)
+        # sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)  # D(Np||Nt)
+        sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(target_boxes_, boxes_pred)  # D(Nt||Np)
 
         # KL_divergence need normalizer == KL_divergence_ do not need normalizer
-        KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
-        # KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+        KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
+        # KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, sigma1, sigma2), [-1, 1])
         KL_distance = tf.maximum(KL_distance, 0.0)
 
         if func == 0:
@@ -619,12 +570,12 @@ class LossKL(LossGWD):
             KL_loss = KL_distance * 0.05
 
         for sr in shrink_ratio:
-            # sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(boxes_pred, target_boxes_)  # D(Np||Nt)
-            sigma1, sigma2, mu1, mu2, mu1_T, mu2_T = self.get_gaussian_param(target_boxes_, boxes_pred, shrink_ratio=sr)  # D(Nt||Np)
+            # sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(boxes_pred, target_boxes_)  # D(Np||Nt)
+            sigma1, sigma2, mu1, mu2 = self.get_gaussian_param(target_boxes_, boxes_pred, shrink_ratio=sr)  # D(Nt||Np)
 
             # KL_divergence need normalizer == KL_divergence_ do not need normalizer
-            KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
-            # KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
+            KL_distance = tf.reshape(self.KL_divergence(mu1, mu2, sigma1, sigma2), [-1, 1])
+            # KL_distance = tf.reshape(self.KL_divergence_(mu1, mu2, sigma1, sigma2), [-1, 1])
             KL_distance = tf.maximum(KL_distance, 0.0)
 
             if func == 0:
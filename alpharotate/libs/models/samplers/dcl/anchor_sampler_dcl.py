@@ -6,7 +6,6 @@ import numpy as np
 
 from alpharotate.libs.models.samplers.samper import Sampler
 from alpharotate.libs.utils.cython_utils.cython_bbox import bbox_overlaps
-from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
 from alpharotate.libs.utils import bbox_transform
 from alpharotate.libs.utils.coordinate_convert import coordinate_present_convert
 
@@ -24,8 +23,7 @@ class AnchorSamplerDCL(Sampler):
                 overlaps = bbox_overlaps(np.ascontiguousarray(anchors, dtype=np.float),
                                          np.ascontiguousarray(gt_boxes_h, dtype=np.float))
             else:
-                overlaps = rbbx_overlaps(np.ascontiguousarray(anchors, dtype=np.float32),
-                                         np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32), gpu_id)
+                overlaps = self.rbbx_overlaps(anchors, gt_boxes_r[:, :-1], gpu_id)
 
                 # overlaps = get_iou_matrix(np.ascontiguousarray(anchors, dtype=np.float32),
                 #                           np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32))
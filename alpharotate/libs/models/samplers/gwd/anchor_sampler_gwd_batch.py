@@ -5,8 +5,6 @@ from __future__ import print_function
 import numpy as np
 
 from alpharotate.libs.models.samplers.samper import Sampler
-from alpharotate.libs.utils.cython_utils.cython_bbox import bbox_overlaps
-from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
 from alpharotate.libs.utils import bbox_transform
 from alpharotate.libs.utils.coordinate_convert import coordinate_present_convert
 
@@ -14,63 +12,60 @@ from alpharotate.libs.utils.coordinate_convert import coordinate_present_convert
 class AnchorSamplerGWD(Sampler):
 
     def anchor_target_layer(self, gt_boxes_h_batch, gt_boxes_r_batch, anchor_batch, gpu_id=0):
-
-        all_labels, all_target_delta, all_anchor_states, all_target_boxes = [], [], [], []
-        for i in range(self.cfgs.BATCH_SIZE):
-            anchors = np.array(anchor_batch[i], np.float32)
-            gt_boxes_h = gt_boxes_h_batch[i, :, :]
-            gt_boxes_r = gt_boxes_r_batch[i, :, :]
-            anchor_states = np.zeros((anchors.shape[0],))
-            labels = np.zeros((anchors.shape[0], self.cfgs.CLASS_NUM))
-            if gt_boxes_r.shape[0]:
-                # [N, M]
-
-                if self.cfgs.METHOD == 'H':
-                    overlaps = bbox_overlaps(np.ascontiguousarray(anchors, dtype=np.float),
-                                             np.ascontiguousarray(gt_boxes_h, dtype=np.float))
-                else:
-                    overlaps = rbbx_overlaps(np.ascontiguousarray(anchors, dtype=np.float32),
-                                             np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32), gpu_id)
-
-                argmax_overlaps_inds = np.argmax(overlaps, axis=1)
-                max_overlaps = overlaps[np.arange(overlaps.shape[0]), argmax_overlaps_inds]
-
-                # compute box regression targets
-                target_boxes = gt_boxes_r[argmax_overlaps_inds]
-
-                positive_indices = max_overlaps >= self.cfgs.IOU_POSITIVE_THRESHOLD
-                ignore_indices = (max_overlaps > self.cfgs.IOU_NEGATIVE_THRESHOLD) & ~positive_indices
-
-                anchor_states[ignore_indices] = -1
-                anchor_states[positive_indices] = 1
-
-                # compute target class labels
-                labels[positive_indices, target_boxes[positive_indices, -1].astype(int) - 1] = 1
-            else:
-                # no annotations? then everything is background
-                target_boxes = np.zeros((anchors.shape[0], gt_boxes_r.shape[1]))
-
+        '''
+        targets of a whole batch in one vectorized pass, the images share their anchors and the gt are padded
+        to the largest number of objects of the batch (dynamic_pad, label 0)
+
+        :return: labels [B, N, CLASS_NUM], target_delta [B, N, 5], anchor_states [B, N], target_boxes [B, N, 6]
+        '''
+        batch_size = self.cfgs.BATCH_SIZE
+        anchors = np.array(anchor_batch[0], np.float32)
+        num = anchors.shape[0]
+        gt_boxes_h_batch = np.reshape(gt_boxes_h_batch, [batch_size, -1, 5])
+        gt_boxes_r_batch = np.reshape(gt_boxes_r_batch, [batch_size, -1, 6])
+
+        anchor_states = np.zeros((batch_size, num))
+        labels = np.zeros((batch_size, num, self.cfgs.CLASS_NUM))
+        if gt_boxes_r_batch.shape[1]:
+            valid = gt_boxes_r_batch[:, :, -1] > 0
+            # [B, N]
             if self.cfgs.METHOD == 'H':
-                x_c = (anchors[:, 2] + anchors[:, 0]) / 2
-                y_c = (anchors[:, 3] + anchors[:, 1]) / 2
-                h = anchors[:, 2] - anchors[:, 0] + 1
-                w = anchors[:, 3] - anchors[:, 1] + 1
-                theta = -90 * np.ones_like(x_c)
-                anchors = np.vstack([x_c, y_c, w, h, theta]).transpose()
-
-            if self.cfgs.ANGLE_RANGE == 180:
-                anchors = coordinate_present_convert(anchors, mode=-1)
-                target_boxes = coordinate_present_convert(target_boxes, mode=-1)
-            target_delta = bbox_transform.rbbox_transform(ex_rois=anchors, gt_rois=target_boxes)
-
-            all_labels.append(labels)
-            all_target_delta.append(target_delta)
-            all_anchor_states.append(anchor_states)
-            all_target_boxes.append(target_boxes)
-
-        return np.array(all_labels, np.float32), np.array(all_target_delta, np.float32), \
-               np.array(all_anchor_states, np.float32), np.array(all_target_boxes, np.float32)
-
-
-
-
+                argmax_overlaps_inds, max_overlaps = self.batch_max_overlaps(anchors, gt_boxes_h_batch[:, :, :-1],
+                                                                             valid, gpu_id, method='H')
+            else:
+                # anchors below the negative threshold are background whatever their best gt is
+                argmax_overlaps_inds, max_overlaps = self.batch_max_overlaps(
+                    anchors, gt_boxes_r_batch[:, :, :-1], valid, gpu_id,
+                    min_overlap=self.cfgs.IOU_NEGATIVE_THRESHOLD)
+
+            # compute box regression targets
+            target_boxes = gt_boxes_r_batch[np.arange(batch_size)[:, None], argmax_overlaps_inds]
+
+            positive_indices = max_overlaps >= self.cfgs.IOU_POSITIVE_THRESHOLD
+            ignore_indices = (max_overlaps > self.cfgs.IOU_NEGATIVE_THRESHOLD) & ~positive_indices
+
+            anchor_states[ignore_indices] = -1
+            anchor_states[positive_indices] = 1
+
+            # compute target class labels
+            labels[positive_indices, target_boxes[positive_indices, -1].astype(int) - 1] = 1
+        else:
+            # no annotations? then everything is background
+            target_boxes = np.zeros((batch_size, num, gt_boxes_r_batch.shape[2]))
+
+        if self.cfgs.METHOD == 'H':
+            x_c = (anchors[:, 2] + anchors[:, 0]) / 2
+            y_c = (anchors[:, 3] + anchors[:, 1]) / 2
+            h = anchors[:, 2] - anchors[:, 0] + 1
+            w = anchors[:, 3] - anchors[:, 1] + 1
+            theta = -90 * np.ones_like(x_c)
+            anchors = np.vstack([x_c, y_c, w, h, theta]).transpose()
+
+        target_boxes = np.reshape(target_boxes, [batch_size * num, -1])
+        if self.cfgs.ANGLE_RANGE == 180:
+            anchors = coordinate_present_convert(anchors, mode=-1)
+            target_boxes = coordinate_present_convert(target_boxes, mode=-1)
+        target_delta = bbox_transform.rbbox_transform(ex_rois=np.tile(anchors, [batch_size, 1]), gt_rois=target_boxes)
+
+        return np.array(labels, np.float32), np.reshape(np.array(target_delta, np.float32), [batch_size, num, -1]), \
+               np.array(anchor_states, np.float32), np.reshape(np.array(target_boxes, np.float32), [batch_size, num, -1])
@@ -5,7 +5,6 @@ from __future__ import print_function
 import numpy as np
 
 from alpharotate.libs.models.samplers.samper import Sampler
-from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
 from alpharotate.libs.utils import bbox_transform
 
 
@@ -21,8 +20,7 @@ class RefineAnchorSamplerR3Det(Sampler):
             # overlaps = get_iou_matrix(np.ascontiguousarray(anchors, dtype=np.float32),
             #                           np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32))
             #
-            overlaps = rbbx_overlaps(np.ascontiguousarray(anchors, dtype=np.float32),
-                                     np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32), gpu_id)
+            overlaps = self.rbbx_overlaps(anchors, gt_boxes_r[:, :-1], gpu_id)
 
             argmax_overlaps_inds = np.argmax(overlaps, axis=1)
             max_overlaps = overlaps[np.arange(overlaps.shape[0]), argmax_overlaps_inds]
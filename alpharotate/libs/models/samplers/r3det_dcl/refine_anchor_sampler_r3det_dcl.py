@@ -5,7 +5,6 @@ from __future__ import print_function
 import numpy as np
 
 from alpharotate.libs.models.samplers.samper import Sampler
-from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
 from alpharotate.libs.utils import bbox_transform
 from alpharotate.libs.utils.coordinate_convert import coordinate_present_convert
 
@@ -25,8 +24,7 @@ class RefineAnchorSamplerR3DetDCL(Sampler):
             #     overlaps = rbbx_overlaps(np.ascontiguousarray(anchors, dtype=np.float32),
             #                              np.ascontiguousarray(gt_boxes_r_, dtype=np.float32), gpu_id)
             # else:
-            overlaps = rbbx_overlaps(np.ascontiguousarray(anchors, dtype=np.float32),
-                                     np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32), gpu_id)
+            overlaps = self.rbbx_overlaps(anchors, gt_boxes_r[:, :-1], gpu_id)
 
             # overlaps = np.clip(overlaps, 0.0, 1.0)
 
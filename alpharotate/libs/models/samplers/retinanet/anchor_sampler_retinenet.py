@@ -6,7 +6,6 @@ import numpy as np
 
 from alpharotate.libs.models.samplers.samper import Sampler
 from alpharotate.libs.utils.cython_utils.cython_bbox import bbox_overlaps
-from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
 from alpharotate.libs.utils import bbox_transform
 from alpharotate.libs.utils.coordinate_convert import coordinate_present_convert
 
@@ -23,12 +22,12 @@ class AnchorSamplerRetinaNet(Sampler):
             if self.cfgs.METHOD == 'H':
                 overlaps = bbox_overlaps(np.ascontiguousarray(anchors, dtype=np.float),
                                          np.ascontiguousarray(gt_boxes_h, dtype=np.float))
+                argmax_overlaps_inds = np.argmax(overlaps, axis=1)
+                max_overlaps = overlaps[np.arange(overlaps.shape[0]), argmax_overlaps_inds]
             else:
-                overlaps = rbbx_overlaps(np.ascontiguousarray(anchors, dtype=np.float32),
-                                         np.ascontiguousarray(gt_boxes_r[:, :-1], dtype=np.float32), gpu_id)
-
-            argmax_overlaps_inds = np.argmax(overlaps, axis=1)
-            max_overlaps = overlaps[np.arange(overlaps.shape[0]), argmax_overlaps_inds]
+                # anchors below the negative threshold are background whatever their best gt is
+                argmax_overlaps_inds, max_overlaps = self.rbbx_max_overlaps(
+                    anchors, gt_boxes_r[:, :-1], gpu_id, min_overlap=self.cfgs.IOU_NEGATIVE_THRESHOLD)
 
             # compute box regression targets
             target_boxes = gt_boxes_r[argmax_overlaps_inds]
@@ -2,7 +2,246 @@
 
 from __future__ import absolute_import, print_function, division
 
+import numpy as np
+
+from alpharotate.utils.gaussian_kernels import gaussian_similarity
+from alpharotate.libs.utils.coordinate_convert import rbox2quad
+from alpharotate.libs.utils.polygon_overlaps import convex_intersection_area, to_counter_clockwise
+
+
+def rbox_aabb(boxes):
+    '''
+    :param boxes: [N, 5], (x, y, w, h, theta), theta in degrees
+    :return: [N, 4] horizontal bounding boxes (x_min, y_min, x_max, y_max)
+    '''
+    theta = boxes[:, 4] * np.pi / 180
+    cos, sin = np.abs(np.cos(theta)), np.abs(np.sin(theta))
+    half_w = (boxes[:, 2] * cos + boxes[:, 3] * sin) / 2
+    half_h = (boxes[:, 2] * sin + boxes[:, 3] * cos) / 2
+    return np.stack([boxes[:, 0] - half_w, boxes[:, 1] - half_h, boxes[:, 0] + half_w, boxes[:, 1] + half_h], axis=1)
+
+
+def frame_intersection_bound(boxes1, boxes2):
+    '''
+    pairwise upper bound of the intersection area: box1 against the bounding box of box2 in the frame of box1
+
+    :param boxes1: [P, 5]
+    :param boxes2: [P, 5]
+    :return: [P, ]
+    '''
+    theta1 = boxes1[:, 4] * np.pi / 180
+    delta = (boxes2[:, 4] - boxes1[:, 4]) * np.pi / 180
+    cos, sin = np.abs(np.cos(delta)), np.abs(np.sin(delta))
+    half_w2 = (boxes2[:, 2] * cos + boxes2[:, 3] * sin) / 2
+    half_h2 = (boxes2[:, 2] * sin + boxes2[:, 3] * cos) / 2
+    dx, dy = boxes2[:, 0] - boxes1[:, 0], boxes2[:, 1] - boxes1[:, 1]
+    u = dx * np.cos(theta1) + dy * np.sin(theta1)
+    v = dy * np.cos(theta1) - dx * np.sin(theta1)
+    iw = np.minimum(boxes1[:, 2] / 2, u + half_w2) - np.maximum(-boxes1[:, 2] / 2, u - half_w2)
+    ih = np.minimum(boxes1[:, 3] / 2, v + half_h2) - np.maximum(-boxes1[:, 3] / 2, v - half_h2)
+    return np.maximum(iw, 0) * np.maximum(ih, 0)
+
 
 class Sampler(object):
     def __init__(self, cfgs):
         self.cfgs = cfgs
+
+    def rbbx_overlaps(self, anchors, gt_boxes, gpu_id=0, chunk_size=16384):
+        '''
+        :param anchors: [N, 5]
+        :param gt_boxes: [M, 5]
+        :return: [N, M] rotated iou (gpu), or the gaussian similarity of cfgs.SAMPLE_OVERLAP_METRIC (cpu)
+        '''
+        anchors = np.ascontiguousarray(anchors, dtype=np.float32)
+        gt_boxes = np.ascontiguousarray(gt_boxes, dtype=np.float32)
+        if self.cfgs.SAMPLE_OVERLAP_METRIC == 'iou':
+            from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
+            return rbbx_overlaps(anchors, gt_boxes, gpu_id)
+
+        overlaps = np.zeros([anchors.shape[0], gt_boxes.shape[0]], np.float32)
+        for i in range(0, anchors.shape[0], chunk_size):
+            overlaps[i:i + chunk_size] = gaussian_similarity(anchors[i:i + chunk_size], gt_boxes,
+                                                             self.cfgs.SAMPLE_OVERLAP_METRIC, backend=np)
+        return overlaps
+
+    def candidate_pairs(self, anchors, gt_boxes, min_overlap=0., num_buckets=16):
+        '''
+        pairs that can have a rotated iou > min_overlap: their horizontal bounding boxes overlap and the upper
+        bounds of the iou (area ratio, bounding boxes in the image and in the frames of both boxes) > min_overlap.
+        The anchors are bucketed by the half width of their bounding box and sorted by x in a bucket,
+        the anchors that can reach a gt are then a slice of every bucket.
+
+        :return: anchor indices [P, ], gt indices [P, ]
+        '''
+        aabb1, aabb2 = rbox_aabb(anchors), rbox_aabb(gt_boxes)
+        area1, area2 = anchors[:, 2] * anchors[:, 3], gt_boxes[:, 2] * gt_boxes[:, 3]
+        half_w1 = (aabb1[:, 2] - aabb1[:, 0]) / 2
+
+        edges = np.unique(np.percentile(half_w1, np.linspace(0, 100, num_buckets + 1)[1:-1]))
+        bucket_ids = np.searchsorted(edges, half_w1)
+        order = np.lexsort((anchors[:, 0], bucket_ids))
+        bounds = np.searchsorted(bucket_ids[order], np.arange(len(edges) + 2))
+
+        rows, cols = [np.zeros([0], np.int64)], [np.zeros([0], np.int64)]
+        for b in range(len(edges) + 1):
+            inds = order[bounds[b]:bounds[b + 1]]
+            if inds.shape[0] == 0:
+                continue
+            x_b, max_half_w = anchors[inds, 0], half_w1[inds].max()
+            for j in range(gt_boxes.shape[0]):
+                lo, hi = np.searchsorted(x_b, [aabb2[j, 0] - max_half_w, aabb2[j, 2] + max_half_w])
+                sub = inds[lo:hi]
+                iw = np.minimum(aabb1[sub, 2], aabb2[j, 2]) - np.maximum(aabb1[sub, 0], aabb2[j, 0])
+                ih = np.minimum(aabb1[sub, 3], aabb2[j, 3]) - np.maximum(aabb1[sub, 1], aabb2[j, 1])
+                keep = (iw > 0) & (ih > 0)
+                if min_overlap > 0:
+                    inter = np.minimum(np.maximum(iw, 0) * np.maximum(ih, 0), np.minimum(area1[sub], area2[j]))
+                    keep &= inter > min_overlap * (area1[sub] + area2[j] - inter)
+                rows.append(sub[keep])
+                cols.append(np.full([int(keep.sum())], j, np.int64))
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+
+        if min_overlap > 0 and rows.shape[0] > 0:
+            boxes1, boxes2 = anchors[rows], gt_boxes[cols]
+            inter = np.minimum(np.minimum(frame_intersection_bound(boxes1, boxes2),
+                                          frame_intersection_bound(boxes2, boxes1)),
+                               np.minimum(area1[rows], area2[cols]))
+            keep = inter > min_overlap * (area1[rows] + area2[cols] - inter)
+            rows, cols = rows[keep], cols[keep]
+        return rows, cols
+
+    def sparse_rbbx_overlaps(self, anchors, gt_boxes, min_overlap=0., chunk_size=16384):
+        '''
+        rotated iou of the candidate pairs only (cpu), every other pair is 0
+
+        :param anchors: [N, 5]
+        :param gt_boxes: [M, 5]
+        :param min_overlap: the pairs with iou <= min_overlap can be dropped
+        :return: anchor indices [P, ], gt indices [P, ], iou [P, ] of the pairs with iou > min_overlap
+        '''
+        anchors = np.reshape(np.array(anchors, np.float64), [-1, 5])
+        gt_boxes = np.reshape(np.array(gt_boxes, np.float64), [-1, 5])
+        rows, cols = self.candidate_pairs(anchors, gt_boxes, min_overlap)
+
+        # only the anchors of a candidate pair are converted to polygons
+        anchor_inds, rows_ = np.unique(rows, return_inverse=True)
+        polys1 = to_counter_clockwise(np.reshape(rbox2quad(anchors[anchor_inds]), [-1, 4, 2]))
+        polys2 = to_counter_clockwise(np.reshape(rbox2quad(gt_boxes), [-1, 4, 2]))
+        area1, area2 = anchors[:, 2] * anchors[:, 3], gt_boxes[:, 2] * gt_boxes[:, 3]
+
+        ious = np.zeros([rows.shape[0]], np.float32)
+        for i in range(0, rows.shape[0], chunk_size):
+            inter = convex_intersection_area(polys1[rows_[i:i + chunk_size]], polys2[cols[i:i + chunk_size]])
+            ious[i:i + chunk_size] = inter / (area1[rows[i:i + chunk_size]] + area2[cols[i:i + chunk_size]] -
+                                              inter + 1e-6)
+        keep = ious > min_overlap
+        return rows[keep], cols[keep], ious[keep]
+
+    def rbbx_max_overlaps(self, anchors, gt_boxes, gpu_id=0, min_overlap=0.):
+        '''
+        best gt of every anchor, from the sparse overlaps if cfgs.SAMPLE_SPARSE_OVERLAPS (rotated iou only),
+        from the dense [N, M] matrix otherwise. Ties go to the first gt in both cases.
+
+        :param anchors: [N, 5]
+        :param gt_boxes: [M, 5]
+        :param min_overlap: sparse only, the anchors whose best iou <= min_overlap get 0 and gt 0,
+                            e.g. IOU_NEGATIVE_THRESHOLD as these anchors are negative anyway
+        :return: argmax_overlaps_inds [N, ], max_overlaps [N, ]
+        '''
+        if self.cfgs.SAMPLE_OVERLAP_METRIC == 'iou' and self.cfgs.SAMPLE_SPARSE_OVERLAPS:
+            rows, cols, ious = self.sparse_rbbx_overlaps(anchors, gt_boxes, min_overlap)
+            order = np.lexsort((cols, -ious, rows))
+            rows, cols, ious = rows[order], cols[order], ious[order]
+            first = np.ones([rows.shape[0]], np.bool_)
+            first[1:] = rows[1:] != rows[:-1]
+
+            argmax_overlaps_inds = np.zeros([anchors.shape[0]], np.int64)
+            max_overlaps = np.zeros([anchors.shape[0]], np.float32)
+            argmax_overlaps_inds[rows[first]] = cols[first]
+            max_overlaps[rows[first]] = ious[first]
+            return argmax_overlaps_inds, max_overlaps
+
+        overlaps = self.rbbx_overlaps(anchors, gt_boxes, gpu_id)
+        argmax_overlaps_inds = np.argmax(overlaps, axis=1)
+        max_overlaps = overlaps[np.arange(overlaps.shape[0]), argmax_overlaps_inds]
+        return argmax_overlaps_inds, max_overlaps
+
+    def batch_max_overlaps(self, anchors, gt_boxes_batch, valid, gpu_id=0, min_overlap=0., method='R'):
+        '''
+        best gt of every anchor in every image of a batch, the overlaps of the whole batch are one pass
+        against the gt of all images (one kernel call, or one sparse pass)
+
+        :param anchors: [N, 4] horizontal (method 'H') or [N, 5] rotated anchors, shared by the images
+        :param gt_boxes_batch: [B, M, 4] or [B, M, 5], padded to the largest number of gt
+        :param valid: [B, M], False for the padding
+        :param min_overlap: see rbbx_max_overlaps
+        :return: argmax_overlaps_inds [B, N] (index of the gt in its image), max_overlaps [B, N]
+        '''
+        batch_size, max_num = valid.shape
+        num = anchors.shape[0]
+        gt_boxes = np.reshape(gt_boxes_batch, [batch_size * max_num, -1])
+
+        if method != 'H' and self.cfgs.SAMPLE_OVERLAP_METRIC == 'iou' and self.cfgs.SAMPLE_SPARSE_OVERLAPS:
+            gt_inds = np.where(np.reshape(valid, [-1]))[0]
+            rows, cols, ious = self.sparse_rbbx_overlaps(anchors, gt_boxes[gt_inds], min_overlap)
+            cols = gt_inds[cols]
+            # (image, anchor) pairs
+            keys = cols // max_num * num + rows
+            order = np.lexsort((cols, -ious, keys))
+            keys, cols, ious = keys[order], cols[order], ious[order]
+            first = np.ones([keys.shape[0]], np.bool_)
+            first[1:] = keys[1:] != keys[:-1]
+
+            argmax_overlaps_inds = np.zeros([batch_size * num], np.int64)
+            max_overlaps = np.zeros([batch_size * num], np.float32)
+            argmax_overlaps_inds[keys[first]] = cols[first] % max_num
+            max_overlaps[keys[first]] = ious[first]
+            return np.reshape(argmax_overlaps_inds, [batch_size, num]), np.reshape(max_overlaps, [batch_size, num])
+
+        if method == 'H':
+            from alpharotate.libs.utils.cython_utils.cython_bbox import bbox_overlaps
+            overlaps = bbox_overlaps(np.ascontiguousarray(anchors, dtype=np.float64),
+                                     np.ascontiguousarray(gt_boxes, dtype=np.float64))
+        else:
+            overlaps = self.rbbx_overlaps(anchors, gt_boxes, gpu_id)
+        overlaps = np.reshape(overlaps, [num, batch_size, max_num]) * np.reshape(valid, [1, batch_size, max_num])
+        argmax_overlaps_inds = np.argmax(overlaps, axis=2)
+        max_overlaps = np.take_along_axis(overlaps, argmax_overlaps_inds[..., None], axis=2)[..., 0]
+        return np.transpose(argmax_overlaps_inds), np.transpose(max_overlaps)
+
+
+if __name__ == '__main__':
+    # sparse against dense overlaps on the rotated anchors of an 800x800 image (126 anchors per location)
+    import time
+    from alpharotate.libs.utils.polygon_overlaps import polygon_overlaps
+
+    class Cfgs(object):
+        SAMPLE_OVERLAP_METRIC = 'iou'
+        SAMPLE_SPARSE_OVERLAPS = True
+
+    np.random.seed(0)
+    anchors = []
+    for stride, base in zip([8, 16, 32, 64, 128], [32, 64, 128, 256, 512]):
+        ys, xs = np.meshgrid(np.arange(0, 800, stride) + stride / 2., np.arange(0, 800, stride) + stride / 2.)
+        for scale in [2 ** 0, 2 ** (1 / 3.), 2 ** (2 / 3.)]:
+            for ratio in [1, 1 / 2., 2., 1 / 3., 3., 5., 1 / 5.]:
+                for angle in [-90, -75, -60, -45, -30, -15]:
+                    w, h = base * scale * np.sqrt(ratio), base * scale / np.sqrt(ratio)
+                    anchors.append(np.stack([xs.ravel(), ys.ravel(), np.full(xs.size, w), np.full(xs.size, h),
+                                             np.full(xs.size, angle)], axis=1))
+    anchors = np.concatenate(anchors, axis=0)
+    gt_boxes = np.concatenate([np.random.uniform(50, 750, [100, 2]), np.random.uniform(10, 120, [100, 2]),
+                               np.random.uniform(-90, 0, [100, 1])], axis=1)
+
+    sampler = Sampler(Cfgs())
+    sub = np.random.choice(anchors.shape[0], 20000, replace=False)
+    dense = polygon_overlaps(rbox2quad(anchors[sub]), rbox2quad(gt_boxes))
+    for min_overlap in [0., 0.4]:
+        start = time.time()
+        argmax_overlaps_inds, max_overlaps = sampler.rbbx_max_overlaps(anchors, gt_boxes, min_overlap=min_overlap)
+        cost = time.time() - start
+        valid = dense.max(axis=1) > min_overlap
+        print('{} anchors x {} gt, min_overlap {}: {:.2f}s, max abs diff {:.2e}, same argmax: {}'.format(
+            anchors.shape[0], gt_boxes.shape[0], min_overlap, cost,
+            np.max(np.abs(dense.max(axis=1)[valid] - max_overlaps[sub][valid])),
+            np.all(dense.argmax(axis=1)[valid] == argmax_overlaps_inds[sub][valid])))
@@ -30,6 +30,20 @@ def forward_convert(coordinate, with_label=True):
     return np.array(boxes, dtype=np.float32)
 
 
+def rbox2quad(boxes):
+    """
+    vectorized cv2.boxPoints, the same as forward_convert(boxes, False)
+    :param boxes: [N, 5], format [x_c, y_c, w, h, theta]
+    :return: [N, 8], format [x1, y1, x2, y2, x3, y3, x4, y4]
+    """
+    boxes = np.reshape(np.array(boxes, np.float32), [-1, 5])
+    x, y, w, h, theta = [boxes[:, i] for i in range(5)]
+    b, a = np.cos(theta * np.pi / 180) * 0.5, np.sin(theta * np.pi / 180) * 0.5
+    x0, y0 = x - a * h - b * w, y + b * h - a * w
+    x1, y1 = x + a * h - b * w, y - b * h - a * w
+    return np.stack([x0, y0, x1, y1, 2 * x - x0, 2 * y - y0, 2 * x - x1, 2 * y - y1], axis=1)
+
+
 def backward_convert(coordinate, with_label=True):
     """
     :param coordinate: format [x1, y1, x2, y2, x3, y3, x4, y4, (label)]
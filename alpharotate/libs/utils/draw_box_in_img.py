@@ -6,10 +6,10 @@ import random
 
 import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
 from alpharotate.libs.label_name_dict.label_dict import LabelMap
-from alpharotate.libs.utils.coordinate_convert import forward_convert
+from alpharotate.libs.utils.coordinate_convert import forward_convert, rbox2quad
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
 from alpharotate.utils.tools import get_dota_short_names
 
@@ -50,6 +50,7 @@ class DrawBox(object):
             'Teal', 'Thistle', 'Tomato', 'Turquoise', 'Violet', 'Wheat', 'White',
             'WhiteSmoke', 'Yellow', 'YellowGreen', 'LightBlue', 'LightGreen'
         ]
+        self.STANDARD_RGB = [ImageColor.getrgb(c) for c in self.STANDARD_COLORS]
         self.FONT = ImageFont.load_default()
 
     def find_head_edge(self, box, head):
@@ -207,7 +208,86 @@ class DrawBox(object):
                               font=self.FONT)
                 self.draw_head(draw_obj, box, head, color)
 
-    def draw_boxes_with_label_and_scores(self, img_array, boxes, labels, scores, method, head=None, is_csl=False, in_graph=True):
+    def boxes_to_polys(self, boxes, method):
+        '''
+        :param boxes: method 0: [N, 4] (x1, y1, x2, y2), method 1: [N, 5] (x, y, w, h, theta), method 2: [N, 2K] polygons
+        :return: [N, K, 2] int32
+        '''
+        # no detection: backward_convert([]) is 1-D
+        if len(boxes) == 0:
+            return np.zeros([0, 4, 2], np.int32)
+        if method == 0:
+            x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+            polys = np.stack([x1, y1, x2, y1, x2, y2, x1, y2], axis=1)
+        elif method == 1:
+            polys = rbox2quad(boxes[:, :5])
+        else:
+            polys = boxes[:, :boxes.shape[1] // 2 * 2]
+        return np.reshape(polys, [boxes.shape[0], polys.shape[1] // 2, 2]).astype(np.int32)
+
+    def draw_text(self, img_array, x, y, lines):
+        for i, txt in enumerate(lines):
+            y0 = int(y) + 10 * i
+            cv2.rectangle(img_array, (int(x), y0), (int(x) + 60, y0 + 10), (255, 255, 255), -1)
+            cv2.putText(img_array, txt, (int(x), y0 + 8), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 0, 0), 1)
+
+    def box_texts(self, box, label, score, method, is_csl):
+        if label == self.ONLY_DRAW_BOXES_WITH_SCORES:
+            return ['obj:' + str(round(score, 2))]
+        if not is_csl:
+            return [self.label_name_map[label] + ':' + str(round(score, 2))]
+        if self.cfgs.DATASET_NAME.startswith('DOTA'):
+            label_name = get_dota_short_names(self.label_name_map[label])
+        else:
+            label_name = self.label_name_map[label]
+        lines = [label_name + ':' + str(round(score, 2))]
+        if method == 1:
+            if self.cfgs.ANGLE_RANGE == 180 and box[2] < box[3]:
+                angle = box[4] + 90
+            else:
+                angle = box[4]
+            lines.append('angle:%.1f' % angle)
+        return lines
+
+    def draw_boxes_vectorized(self, img_array, boxes, labels, scores, method, is_csl=False, alpha=0.7,
+                              preview_max_len=None):
+        '''
+        all boxes are converted at once and drawn with one cv2.polylines per color on the uint8 buffer,
+        the blend is skipped when alpha is 1.
+
+        :param img_array: [h, w, 3] uint8
+        :param preview_max_len: downscale the image (and boxes) so that its long side is at most this, for huge scenes
+        '''
+        img_array = np.ascontiguousarray(img_array)
+        keep = labels != self.NOT_DRAW_BOXES
+        boxes, labels, scores = boxes[keep], labels[keep], scores[keep]
+
+        scale = 1.
+        if preview_max_len is not None and max(img_array.shape[:2]) > preview_max_len:
+            scale = preview_max_len / float(max(img_array.shape[:2]))
+            img_array = cv2.resize(img_array, (int(img_array.shape[1] * scale), int(img_array.shape[0] * scale)),
+                                   interpolation=cv2.INTER_AREA)
+        width = max(int(round(3 * min(scale * 2, 1))), 1)
+
+        polys = self.boxes_to_polys(boxes, method)
+        if scale != 1.:
+            polys = (polys * scale).astype(np.int32)
+
+        canvas = img_array if alpha == 1 else img_array.copy()
+        for label in np.unique(labels):
+            cv2.polylines(canvas, list(polys[labels == label]), isClosed=True,
+                          color=self.STANDARD_RGB[label], thickness=width)
+        for box, a_label, a_score in zip(boxes, labels, scores):
+            if a_label == self.ONLY_DRAW_BOXES:
+                continue
+            self.draw_text(canvas, box[0] * scale, box[1] * scale, self.box_texts(box, a_label, a_score, method, is_csl))
+
+        if alpha != 1:
+            cv2.addWeighted(img_array, 1 - alpha, canvas, alpha, 0, dst=canvas)
+        return canvas
+
+    def draw_boxes_with_label_and_scores(self, img_array, boxes, labels, scores, method, head=None, is_csl=False,
+                                         in_graph=True, alpha=0.7, preview_max_len=None):
         if in_graph:
             pretrain_zoo = PretrainModelZoo()
             if self.cfgs.NET_NAME in pretrain_zoo.pth_zoo or self.cfgs.NET_NAME in pretrain_zoo.mxnet_zoo:
@@ -224,15 +304,19 @@ class DrawBox(object):
         labels = labels.astype(np.int32)
         img_array = np.array(img_array * 255 / np.max(img_array), dtype=np.uint8)
 
+        if head is None:
+            head = np.ones_like(labels) * -1
+
+        # the heads are only drawn by the PIL path
+        if method in [0, 1, 2] and not (is_csl and method == 1 and np.any(np.array(head) != -1)):
+            return self.draw_boxes_vectorized(img_array, boxes, labels, scores, method, is_csl, alpha, preview_max_len)
+
         img_obj = Image.fromarray(img_array)
         raw_img_obj = img_obj.copy()
 
         draw_obj = ImageDraw.Draw(img_obj)
         num_of_objs = 0
 
-        if head is None:
-            head = np.ones_like(labels) * -1
-
         for box, a_label, a_score, a_head in zip(boxes, labels, scores, head):
 
             if a_label != self.NOT_DRAW_BOXES:
@@ -248,7 +332,13 @@ class DrawBox(object):
                     else:
                         self.draw_label_with_scores(draw_obj, box, a_label, a_score, color='White')
 
-        out_img_obj = Image.blend(raw_img_obj, img_obj, alpha=0.7)
+        out_img_obj = Image.blend(raw_img_obj, img_obj, alpha=alpha)
+
+        # drawn at full size here, only the result is downscaled
+        if preview_max_len is not None and max(out_img_obj.size) > preview_max_len:
+            scale = preview_max_len / float(max(out_img_obj.size))
+            out_img_obj = out_img_obj.resize((int(out_img_obj.size[0] * scale), int(out_img_obj.size[1] * scale)),
+                                             Image.BILINEAR)
 
         return np.array(out_img_obj)
 
@@ -276,3 +366,26 @@ class DrawBox(object):
 
 
 
+
+
+if __name__ == '__main__':
+    # images without detections go through both paths, the preview is downscaled on both
+    from alpharotate.libs.utils.coordinate_convert import backward_convert
+
+    class Cfgs(object):
+        DATASET_NAME = 'DOTA'
+        CLASS_NUM = 15
+        ANGLE_RANGE = 90
+
+    drawer = DrawBox(Cfgs)
+    img = np.random.uniform(1, 255, [600, 800, 3]).astype(np.float32)
+    empty_rboxes = np.array(backward_convert(np.zeros([0, 8]), with_label=False))
+    rboxes = np.array([[200, 150, 120, 40, -30], [500, 400, 60, 30, -80]], np.float32)
+    labels, scores = np.array([1, 5], np.int32), np.array([0.9, 0.6], np.float32)
+    for name, boxes, head in [('empty', empty_rboxes, None), ('empty, heads', empty_rboxes, np.zeros([0])),
+                              ('boxes', rboxes, None), ('boxes, heads', rboxes, np.array([0, 2]))]:
+        num = len(boxes)
+        out = drawer.draw_boxes_with_label_and_scores(img, boxes, labels[:num], scores[:num], method=1, head=head,
+                                                      is_csl=True, in_graph=False, preview_max_len=400)
+        print('%-14s input %s --> %s' % (name, list(np.shape(boxes)), list(out.shape)))
+        assert out.shape == (300, 400, 3)
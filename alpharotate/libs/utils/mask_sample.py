@@ -72,8 +72,93 @@ def points_sampling(mask, num=4):
         return psamplenp
 
 
+def pad_polygons(polys):
+    '''
+    :param polys: list of [K_i, 2]
+    :return: [N, K, 2] padded with zeros, [N, ] number of points of each polygon
+    '''
+    pnums = np.array([len(p) for p in polys], np.int64)
+    dtype = np.result_type(*[np.asarray(p).dtype for p in polys]) if len(polys) else np.float32
+    padded = np.zeros([len(polys), int(pnums.max()) if len(polys) else 0, 2], dtype)
+    for i, p in enumerate(polys):
+        padded[i, :pnums[i]] = np.reshape(p, [-1, 2])
+    return padded, pnums
+
+
+def points_sampling_batch(masks, pnums=None, num=4):
+    '''
+    vectorized points_sampling over padded polygons, the same points in the same order
+    (ties of the edge lengths are broken by the edge index)
+
+    :param masks: [N, K, 2]
+    :param pnums: [N, ] number of valid points of each polygon, None if all of them are valid
+    :return: [N, num, 2]
+    '''
+    masks = np.asarray(masks)
+    n, k = masks.shape[0], masks.shape[1]
+    pnums = np.full([n], k, np.int64) if pnums is None else np.asarray(pnums, np.int64)
+    idx = np.arange(k)[None, :]
+    valid = idx < pnums[:, None]
+    idxnext = np.where(idx + 1 < pnums[:, None], idx + 1, 0)
+    pnext = np.take_along_axis(masks, idxnext[..., None], axis=1)
+    edgelen = np.sqrt(np.sum((pnext - masks) ** 2, axis=2))
+    # padded edges are sorted first
+    edgeidxsort = np.argsort(np.where(valid, edgelen, -np.inf), axis=1, kind='stable')
+
+    out = np.zeros([n, num, 2], np.result_type(masks.dtype, np.float32))
+
+    # remove the start points of the shortest edges
+    down = pnums > num
+    if down.any():
+        edgeidxkeep = np.sort(edgeidxsort[down][:, k - num:], axis=1)
+        out[down] = np.take_along_axis(masks[down], edgeidxkeep[..., None], axis=1)
+
+    # add points uniformly
+    up = ~down
+    if up.any():
+        mask, masknext, valid_up = masks[up], pnext[up], valid[up]
+        edgelen_up = np.where(valid_up, edgelen[up], 0)
+        edgesum = np.maximum(np.sum(edgelen_up, axis=1, keepdims=True), 1e-12)
+        edgenum = np.round(edgelen_up * num / edgesum).astype(np.int32)
+        edgenum = np.where(valid_up, np.maximum(edgenum, 1), 0)
+
+        # after round, it may has 1 or 2 mismatch, the longest edges give up their extra points first
+        # and the missing ones go to the longest edge
+        edgeidxdesc = edgeidxsort[up][:, ::-1]
+        mismatch = np.sum(edgenum, axis=1) - num
+        extra = np.maximum(np.take_along_axis(edgenum, edgeidxdesc, axis=1) - 1, 0)
+        passnum = np.clip(np.maximum(mismatch, 0)[:, None] - (np.cumsum(extra, axis=1) - extra), 0, extra)
+        np.put_along_axis(edgenum, edgeidxdesc, np.take_along_axis(edgenum, edgeidxdesc, axis=1) - passnum, axis=1)
+        rows = np.arange(edgenum.shape[0])
+        edgenum[rows, edgeidxdesc[:, 0]] += np.maximum(-mismatch, 0).astype(np.int32)
+        assert np.all(np.sum(edgenum, axis=1) == num)
+
+        # the edge and the position on the edge of every sampled point
+        edgeend = np.cumsum(edgenum, axis=1)
+        pidx = np.arange(num)
+        edgeid = np.sum(edgeend[:, None, :] <= pidx[None, :, None], axis=2)
+        pnewnum = np.take_along_axis(edgenum, edgeid, axis=1)
+        pos = pidx[None, :] - np.take_along_axis(edgeend, edgeid, axis=1) + pnewnum
+        wnp = (pos.astype(np.float32) / pnewnum.astype(np.float32))[..., None]
+
+        pb = np.take_along_axis(mask, edgeid[..., None], axis=1)
+        pe = np.take_along_axis(masknext, edgeid[..., None], axis=1)
+        out[up] = pb * (1 - wnp) + pe * wnp
+    return out
+
+
 def mask_sampling(masks, num=8):
-    return np.array([points_sampling(m, num) for m in masks], np.float32)
+    '''
+    :param masks: [N, K, 2] or list of polygons with different number of points
+    :return: [N, num, 2]
+    '''
+    if isinstance(masks, np.ndarray) and masks.ndim == 3:
+        return np.array(points_sampling_batch(masks, num=num), np.float32)
+    if len(masks) == 0:
+        return np.zeros([0, num, 2], np.float32)
+    padded, pnums = pad_polygons(masks)
+    return np.array(points_sampling_batch(padded, pnums, num), np.float32)
+
 
 if __name__ == '__main__':
     mask1 = np.array([[[10, 0], [5, 10], [0, 10], [10, 5], [0, 0], [5, 0], [10, 10], [0, 5]],
@@ -82,3 +167,16 @@ if __name__ == '__main__':
 
     points = mask_sampling(mask2, num=16)
     print(points)
+
+    import time
+    # float points, so that no two edges have the same length
+    polys = [np.random.uniform(0, 500, [np.random.randint(3, 21), 2]) for _ in range(20000)]
+    for num in [8, 12]:
+        start = time.time()
+        ref = np.array([points_sampling(p, num) for p in polys], np.float32)
+        loop_time = time.time() - start
+        start = time.time()
+        res = mask_sampling(polys, num)
+        batch_time = time.time() - start
+        print('num=%d: loop %.3fs, batch %.3fs, max abs diff %.3e' % (num, loop_time, batch_time,
+                                                                     np.max(np.abs(ref - res))))
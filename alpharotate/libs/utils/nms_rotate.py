@@ -12,34 +12,41 @@ import sys
 sys.path.append('../../')
 from alpharotate.libs.utils.rotate_polygon_nms import rotate_gpu_nms
 from alpharotate.libs.utils.coordinate_convert import coordinate5_2_8_tf
+from alpharotate.utils.gaussian_kernels import gaussian_similarity
 
 
-def nms_rotate(decode_boxes, scores, iou_threshold, max_output_size, use_gpu=True, gpu_id=0):
+def nms_rotate(decode_boxes, scores, iou_threshold, max_output_size, use_gpu=True, gpu_id=0, metric='iou'):
     """
     :param boxes: format [x_c, y_c, w, h, theta]
     :param scores: scores of boxes
     :param threshold: iou threshold (0.7 or 0.5)
     :param max_output_size: max number of output
+    :param metric: 'iou', or the gaussian similarity 'gwd' / 'kld' which runs in graph on any device
     :return: the remaining index of boxes
     """
 
-    if use_gpu:
-        keep = nms_rotate_gpu(boxes_list=decode_boxes,
-                              scores=scores,
-                              iou_threshold=iou_threshold,
-                              device_id=gpu_id,
-                              max_output_size=max_output_size)
+    # one scope for all metrics, so that the nms can be told apart in a trace
+    with tf.name_scope('nms_rotate'):
+        if metric != 'iou':
+            keep = nms_rotate_gaussian(decode_boxes, scores, iou_threshold, max_output_size, metric)
 
-        keep = tf.cond(
-            tf.greater(tf.shape(keep)[0], max_output_size),
-            true_fn=lambda: tf.slice(keep, [0], [max_output_size]),
-            false_fn=lambda: keep)
+        elif use_gpu:
+            keep = nms_rotate_gpu(boxes_list=decode_boxes,
+                                  scores=scores,
+                                  iou_threshold=iou_threshold,
+                                  device_id=gpu_id,
+                                  max_output_size=max_output_size)
 
-    else:
-        keep = tf.py_func(nms_rotate_cpu,
-                          inp=[decode_boxes, scores, iou_threshold, max_output_size],
-                          Tout=tf.int64)
-    return tf.cast(keep, tf.int64)
+            keep = tf.cond(
+                tf.greater(tf.shape(keep)[0], max_output_size),
+                true_fn=lambda: tf.slice(keep, [0], [max_output_size]),
+                false_fn=lambda: keep)
+
+        else:
+            keep = tf.py_func(nms_rotate_cpu,
+                              inp=[decode_boxes, scores, iou_threshold, max_output_size],
+                              Tout=tf.int64)
+        return tf.cast(keep, tf.int64)
 
 
 def nms_rotate_cpu(boxes, scores, iou_threshold, max_output_size):
@@ -99,6 +106,29 @@ def nms_rotate_cpu(boxes, scores, iou_threshold, max_output_size):
     return np.array(keep, np.int64)
 
 
+def nms_rotate_gaussian(decode_boxes, scores, threshold, max_output_size, metric='gwd'):
+    overlaps = gaussian_similarity(decode_boxes, decode_boxes, metric)
+    return tf.image.non_max_suppression_overlaps(overlaps, tf.reshape(scores, [-1, ]),
+                                                 max_output_size, overlap_threshold=threshold)
+
+
+def nms_rotate_gaussian_cpu(boxes, scores, threshold, max_output_size, metric='gwd'):
+    if boxes.shape[0] == 0:
+        return np.array([], np.int64)
+    order = scores.argsort()[::-1]
+    overlaps = gaussian_similarity(boxes[order], boxes[order], metric, backend=np)
+    suppressed = np.zeros([boxes.shape[0]], np.bool_)
+    keep = []
+    for i in range(boxes.shape[0]):
+        if len(keep) >= max_output_size:
+            break
+        if suppressed[i]:
+            continue
+        keep.append(order[i])
+        suppressed |= overlaps[i] > threshold
+    return np.array(keep, np.int64)
+
+
 def rnms_gpu(det_boxes, iou_threshold, device_id):
     if det_boxes.shape[0] == 0:
         return np.array([], np.int64)
@@ -154,3 +184,18 @@ if __name__ == '__main__':
     os.environ["CUDA_VISIBLE_DEVICES"] = '0'
     with tf.Session() as sess:
         print(sess.run(keep))
+
+    # cpu cost of the rotated iou nms and the gaussian nms, and how many kept boxes they share
+    import time
+    np.random.seed(0)
+    boxes = np.concatenate([np.random.uniform(0, 800, [2000, 2]), np.random.uniform(10, 100, [2000, 2]),
+                            np.random.uniform(-90, 0, [2000, 1])], axis=1).astype(np.float32)
+    scores = np.random.uniform(0, 1, [2000]).astype(np.float32)
+    start = time.time()
+    keep_iou = nms_rotate_cpu(boxes, scores, 0.3, 2000)
+    print('rotated iou nms: {} kept, {:.3f}s'.format(len(keep_iou), time.time() - start))
+    for metric, threshold in [('gwd', 0.5), ('kld', 0.3)]:
+        start = time.time()
+        keep_gaussian = nms_rotate_gaussian_cpu(boxes, scores, threshold, 2000, metric)
+        print('{} nms: {} kept, {:.3f}s, {} shared with the iou nms'.format(
+            metric, len(keep_gaussian), time.time() - start, len(np.intersect1d(keep_iou, keep_gaussian))))
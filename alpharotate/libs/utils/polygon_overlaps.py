@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+
+def polygon_area(polys):
+    '''
+    shoelace formula, the result is positive for counter-clockwise polygons
+    (in image coordinates, y axis points down).
+    :param polys: [N, K, 2]
+    :return: [N, ] signed area
+    '''
+    x, y = polys[..., 0], polys[..., 1]
+    return 0.5 * np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1)
+
+
+def to_counter_clockwise(polys):
+    '''
+    :param polys: [N, K, 2]
+    :return: [N, K, 2] with the same vertices in counter-clockwise order
+    '''
+    polys = np.array(polys, dtype=np.float64)
+    clockwise = polygon_area(polys) < 0
+    polys[clockwise] = polys[clockwise, ::-1]
+    return polys
+
+
+def _clip_by_edge(poly, num, edge_start, edge_end):
+    '''
+    one step of Sutherland-Hodgman for a batch of polygons.
+    :param poly: [P, M, 2], the first num[p] vertices of each polygon are valid
+    :param num: [P, ]
+    :param edge_start: [P, 2]
+    :param edge_end: [P, 2]
+    :return: clipped polygons [P, 2M, 2] and their vertex number [P, ]
+    '''
+    P, M = poly.shape[0], poly.shape[1]
+    idx = np.arange(M)[None, :]
+    valid = idx < num[:, None]
+    next_idx = np.where(idx + 1 < num[:, None], idx + 1, 0)
+    poly_next = np.take_along_axis(poly, next_idx[..., None], axis=1)
+
+    edge = (edge_end - edge_start)[:, None, :]
+
+    def side(points):
+        d = points - edge_start[:, None, :]
+        return edge[..., 0] * d[..., 1] - edge[..., 1] * d[..., 0]
+
+    side_cur, side_next = side(poly), side(poly_next)
+    inside_cur, inside_next = side_cur >= 0, side_next >= 0
+
+    denom = side_cur - side_next
+    t = side_cur / np.where(denom == 0, 1, denom)
+    cross_point = poly + t[..., None] * (poly_next - poly)
+
+    # each vertex emits itself (if inside) and the crossing point of its outgoing edge (if any)
+    candidates = np.stack([poly, cross_point], axis=2).reshape([P, 2 * M, 2])
+    keep = np.stack([valid & inside_cur, valid & (inside_cur != inside_next)], axis=2).reshape([P, 2 * M])
+
+    order = np.argsort(~keep, axis=1, kind='stable')
+    clipped = np.take_along_axis(candidates, order[..., None], axis=1)
+    return clipped, keep.sum(axis=1)
+
+
+def convex_intersection_area(polys1, polys2):
+    '''
+    pairwise intersection area, polys2 must be convex.
+    :param polys1: [P, K1, 2], counter-clockwise
+    :param polys2: [P, K2, 2], counter-clockwise and convex
+    :return: [P, ]
+    '''
+    P = polys1.shape[0]
+    if P == 0:
+        return np.zeros([0], dtype=np.float64)
+    poly = np.array(polys1, dtype=np.float64)
+    num = np.full([P], poly.shape[1], dtype=np.int64)
+    for k in range(polys2.shape[1]):
+        poly, num = _clip_by_edge(poly, num, polys2[:, k], polys2[:, (k + 1) % polys2.shape[1]])
+        max_num = max(int(num.max()), 1)
+        poly = poly[:, :max_num]
+
+    idx = np.arange(poly.shape[1])[None, :]
+    next_idx = np.where(idx + 1 < num[:, None], idx + 1, 0)
+    poly_next = np.take_along_axis(poly, next_idx[..., None], axis=1)
+    cross = poly[..., 0] * poly_next[..., 1] - poly_next[..., 0] * poly[..., 1]
+    cross = np.where(idx < num[:, None], cross, 0)
+    return np.abs(0.5 * np.sum(cross, axis=1))
+
+
+def polygon_intersection_matrix(polys1, polys2):
+    '''
+    intersection area of every pair, only pairs whose bounding boxes overlap are clipped.
+    :param polys1: [N, 8] or [N, K, 2]
+    :param polys2: [M, 8] or [M, K, 2], convex
+    :return: intersection [N, M], area1 [N, ], area2 [M, ]
+    '''
+    polys1 = to_counter_clockwise(np.reshape(polys1, [len(polys1), -1, 2]))
+    polys2 = to_counter_clockwise(np.reshape(polys2, [len(polys2), -1, 2]))
+    area1, area2 = polygon_area(polys1), polygon_area(polys2)
+
+    inter = np.zeros([polys1.shape[0], polys2.shape[0]], dtype=np.float64)
+    if inter.size == 0:
+        return inter, area1, area2
+
+    min1, max1 = polys1.min(axis=1), polys1.max(axis=1)
+    min2, max2 = polys2.min(axis=1), polys2.max(axis=1)
+    candidate = np.all((np.minimum(max1[:, None], max2[None]) - np.maximum(min1[:, None], min2[None])) > 0, axis=2)
+    rows, cols = np.nonzero(candidate)
+    inter[rows, cols] = convex_intersection_area(polys1[rows], polys2[cols])
+
+    return inter, area1, area2
+
+
+def polygon_overlaps(polys1, polys2):
+    '''
+    :param polys1: [N, 8] or [N, K, 2]
+    :param polys2: [M, 8] or [M, K, 2], convex
+    :return: IoU matrix [N, M]
+    '''
+    inter, area1, area2 = polygon_intersection_matrix(polys1, polys2)
+    union = area1[:, None] + area2[None, :] - inter
+    return np.where(union > 0, inter / np.where(union > 0, union, 1), 0)
+
+
+if __name__ == '__main__':
+    import time
+    from shapely.geometry import Polygon
+
+    np.random.seed(0)
+    centers = np.random.uniform(0, 500, [300, 1, 2])
+    rect = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], np.float64)
+    theta = np.random.uniform(-np.pi, np.pi, [300, 1, 1])
+    size = np.random.uniform(5, 60, [300, 1, 2])
+    rot = np.concatenate([np.cos(theta), -np.sin(theta), np.sin(theta), np.cos(theta)], axis=2).reshape([-1, 2, 2])
+    polys = centers + np.matmul(rect[None] * size, np.transpose(rot, [0, 2, 1]))
+
+    start = time.time()
+    ious = polygon_overlaps(polys[:150], polys[150:])
+    print('vectorized: {:.3f}s'.format(time.time() - start))
+
+    start = time.time()
+    shapes1, shapes2 = [Polygon(p) for p in polys[:150]], [Polygon(p) for p in polys[150:]]
+    ref = np.array([[a.intersection(b).area / a.union(b).area for b in shapes2] for a in shapes1])
+    print('shapely: {:.3f}s'.format(time.time() - start))
+    print('max abs diff: {}'.format(np.abs(ious - ref).max()))
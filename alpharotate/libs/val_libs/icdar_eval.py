@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# Text localization evaluation (IoU protocol of ICDAR2015 / MSRA-TD500).
+# It follows thirdparty/icdar_msra_td500_devkit/script.py, but works on in-memory arrays,
+# computes the IoU matrix of a sample in one shot and evaluates samples in parallel.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import re
+import zipfile
+from multiprocessing import Pool
+
+import numpy as np
+
+from alpharotate.libs.utils.polygon_overlaps import polygon_intersection_matrix
+
+
+def sample_key(name):
+    '''
+    gt_img_1.txt, res_img_1.txt, img_1.jpg, /path/IMG_0059.JPG --> img_1 / img_0059
+    '''
+    name = os.path.splitext(os.path.basename(name))[0].lower()
+    return re.sub(r'^(gt_|res_)', '', name)
+
+
+def parse_lines(content, with_transcription, with_confidence=False):
+    '''
+    :param content: text of a gt / result file, one 8-points polygon per line
+    :return: polys [K, 8] int32, dont_care [K, ] bool, scores [K, ] float32
+    '''
+    polys, dont_care, scores = [], [], []
+    for line in content.splitlines():
+        line = line.strip()
+        if line == '':
+            continue
+        items = line.split(',', 8)
+        polys.append([int(float(v)) for v in items[:8]])
+        if with_transcription:
+            dont_care.append(len(items) > 8 and items[8] == '###')
+        else:
+            dont_care.append(False)
+        scores.append(float(items[8]) if with_confidence and len(items) > 8 else 1.0)
+    return np.reshape(np.array(polys, np.int32), [-1, 8]), np.array(dont_care, np.bool_), \
+        np.array(scores, np.float32)
+
+
+def load_samples(path, with_transcription, with_confidence=False):
+    '''
+    :param path: a zip file or a directory of *.txt
+    :return: dict, sample_key --> (polys, dont_care, scores)
+    '''
+    samples = {}
+    if os.path.isdir(path):
+        for name in os.listdir(path):
+            if name.endswith('.txt'):
+                with open(os.path.join(path, name), 'rb') as fr:
+                    content = fr.read().decode('utf-8-sig')
+                samples[sample_key(name)] = parse_lines(content, with_transcription, with_confidence)
+    else:
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith('.txt'):
+                    content = archive.read(name).decode('utf-8-sig')
+                    samples[sample_key(name)] = parse_lines(content, with_transcription, with_confidence)
+    return samples
+
+
+def compute_ap(confidences, matches, num_gt_care):
+    if len(confidences) == 0:
+        return 0
+    order = np.argsort(-np.array(confidences), kind='stable')
+    matches = np.array(matches, np.float64)[order]
+    correct = np.cumsum(matches)
+    ap = np.sum(matches * correct / np.arange(1, len(matches) + 1))
+    if num_gt_care > 0:
+        ap /= num_gt_care
+    return ap
+
+
+def evaluate_sample(args):
+    '''
+    :param args: gt_polys [G, 8], gt_dont_care [G, ], det_polys [D, 8], det_scores [D, ],
+                 iou_constraint, area_precision_constraint
+    :return: per sample statistic
+    '''
+    gt_polys, gt_dont_care, det_polys, det_scores, iou_constraint, area_precision_constraint = args
+
+    num_gt, num_det = gt_polys.shape[0], det_polys.shape[0]
+    det_dont_care = np.zeros([num_det], np.bool_)
+    det_matched = np.zeros([num_det], np.bool_)
+    iou = np.zeros([num_gt, num_det])
+
+    if num_gt > 0 and num_det > 0:
+        # detections are rectangles (convex), so they are used as the clipping polygons
+        inter, area_gt, area_det = polygon_intersection_matrix(gt_polys, det_polys)
+        union = area_gt[:, None] + area_det[None, :] - inter
+        iou = np.where(union > 0, inter / np.where(union > 0, union, 1), 0)
+
+        if gt_dont_care.any():
+            precision = inter[gt_dont_care] / np.where(area_det > 0, area_det, 1)[None, :]
+            precision[:, area_det == 0] = 0
+            det_dont_care = np.any(precision > area_precision_constraint, axis=0)
+
+        # greedy matching in (gt, det) order, the same as the official script
+        candidate = (iou > iou_constraint) & ~det_dont_care[None, :]
+        for gt_num in np.nonzero(~gt_dont_care & candidate.any(axis=1))[0]:
+            det_num = np.nonzero(candidate[gt_num] & ~det_matched)[0]
+            if det_num.shape[0] > 0:
+                det_matched[det_num[0]] = True
+
+    num_gt_care = int(num_gt - gt_dont_care.sum())
+    num_det_care = int(num_det - det_dont_care.sum())
+    matched = int(det_matched.sum())
+
+    if num_gt_care == 0:
+        recall = 1.
+        precision = 0. if num_det_care > 0 else 1.
+    else:
+        recall = matched / num_gt_care
+        precision = 0 if num_det_care == 0 else matched / num_det_care
+    hmean = 0 if (precision + recall) == 0 else 2.0 * precision * recall / (precision + recall)
+
+    return {'precision': precision, 'recall': recall, 'hmean': hmean,
+            'matched': matched, 'num_gt_care': num_gt_care, 'num_det_care': num_det_care,
+            'confidences': det_scores[~det_dont_care], 'matches': det_matched[~det_dont_care]}
+
+
+class ICDAREval(object):
+
+    def __init__(self, iou_constraint=0.5, area_precision_constraint=0.5, num_workers=8):
+        self.iou_constraint = iou_constraint
+        self.area_precision_constraint = area_precision_constraint
+        self.num_workers = num_workers
+
+    def evaluate(self, gt, det):
+        '''
+        :param gt: path of gt.zip / gt directory, or dict from load_samples
+        :param det: dict, image name or sample key --> [D, 8] boxes or ([D, 8] boxes, [D, ] scores),
+                    or a directory of res_*.txt
+        :return: {'method': {'precision', 'recall', 'hmean', 'AP'}, 'per_sample': {...}}
+        '''
+        if not isinstance(gt, dict):
+            gt = load_samples(gt, with_transcription=True)
+        if not isinstance(det, dict):
+            det = {k: (v[0], v[2]) for k, v in load_samples(det, with_transcription=False).items()}
+
+        det_samples = {}
+        for name, value in det.items():
+            boxes, scores = value if isinstance(value, tuple) else (value, np.ones([len(value)], np.float32))
+            # results are written with '%d' before the official evaluation, keep the same truncation
+            boxes = np.reshape(np.trunc(np.array(boxes, np.float64)), [-1, 8]).astype(np.int32)
+            det_samples[sample_key(name)] = (boxes, np.reshape(np.array(scores, np.float32), [-1]))
+
+        keys = sorted(gt.keys())
+        jobs = []
+        for key in keys:
+            gt_polys, gt_dont_care, _ = gt[key]
+            det_polys, det_scores = det_samples.get(key, (np.zeros([0, 8], np.int32), np.zeros([0], np.float32)))
+            jobs.append((gt_polys, gt_dont_care, det_polys, det_scores,
+                         self.iou_constraint, self.area_precision_constraint))
+
+        if self.num_workers > 1 and len(jobs) > 1:
+            pool = Pool(self.num_workers)
+            results = pool.map(evaluate_sample, jobs, chunksize=max(1, len(jobs) // (self.num_workers * 4)))
+            pool.close()
+            pool.join()
+        else:
+            results = [evaluate_sample(job) for job in jobs]
+
+        matched = sum([r['matched'] for r in results])
+        num_gt_care = sum([r['num_gt_care'] for r in results])
+        num_det_care = sum([r['num_det_care'] for r in results])
+        confidences = np.concatenate([r['confidences'] for r in results]) if results else []
+        matches = np.concatenate([r['matches'] for r in results]) if results else []
+
+        recall = 0 if num_gt_care == 0 else float(matched) / num_gt_care
+        precision = 0 if num_det_care == 0 else float(matched) / num_det_care
+        hmean = 0 if recall + precision == 0 else 2 * recall * precision / (recall + precision)
+
+        per_sample = {}
+        for key, r in zip(keys, results):
+            per_sample[key] = {'precision': r['precision'], 'recall': r['recall'], 'hmean': r['hmean']}
+
+        return {'method': {'precision': precision, 'recall': recall, 'hmean': hmean,
+                           'AP': float(compute_ap(confidences, matches, num_gt_care))},
+                'per_sample': per_sample}
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser('ICDAR / MSRA-TD500 evaluation')
+    parser.add_argument('--gt', '-g', type=str, help='gt.zip or gt directory')
+    parser.add_argument('--det', '-s', type=str, help='directory of res_*.txt')
+    parser.add_argument('--num_workers', default=8, type=int)
+    args = parser.parse_args()
+
+    start = time.time()
+    res = ICDAREval(num_workers=args.num_workers).evaluate(args.gt, args.det)
+    print(res['method'])
+    print('cost {:.2f}s'.format(time.time() - start))
@@ -295,6 +295,7 @@ class EVAL(object):
     # plt.savefig('./PR_R.png')
 
     print("mAP is : {}".format(np.mean(AP_list)))
+    return np.mean(AP_list)
 
   def voc_evaluate_detections(self, all_boxes, test_imgid_list, test_annotation_path):
     '''
@@ -303,10 +304,10 @@ class EVAL(object):
 
     The detections is a array. shape is [-1, 6]. [category, score, xmin, ymin, xmax, ymax]
     Note that: if none detections in this img. that the detetions is : []
-    :return:
+    :return: mAP
     '''
 
     self.write_voc_results_file(all_boxes, test_imgid_list=test_imgid_list,
                                 det_save_dir=os.path.join(self.cfgs.EVALUATE_R_DIR, self.cfgs.VERSION))
-    self.do_python_eval(test_imgid_list, test_annotation_path)
+    return self.do_python_eval(test_imgid_list, test_annotation_path)
 
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from alpharotate.libs.models.anchor_heads import generate_h_anchors
+from alpharotate.libs.utils.coordinate_convert import backward_convert
+from alpharotate.libs.utils.polygon_overlaps import convex_intersection_area, to_counter_clockwise
+
+
+def resize_quads(quads, img_h, img_w, shortside_len, max_length):
+    '''
+    the integer arithmetic of ImageAugmentation.short_side_resize
+
+    :param quads: [N, 8] int
+    '''
+    if img_h < img_w:
+        new_h, new_w = shortside_len, min(shortside_len * img_w // img_h, max_length)
+    else:
+        new_h, new_w = min(shortside_len * img_h // img_w, max_length), shortside_len
+    quads = np.array(quads, np.int64)
+    quads[:, 0::2] = quads[:, 0::2] * new_w // img_w
+    quads[:, 1::2] = quads[:, 1::2] * new_h // img_h
+    return quads
+
+
+def rect_polygons(w, h, theta, dx=0., dy=0.):
+    '''
+    :param theta: degree
+    :return: [N, 4, 2] counter-clockwise corners of the rectangles centered at (dx, dy)
+    '''
+    w, h, theta, dx, dy = np.broadcast_arrays(*[np.asarray(v, np.float64) for v in [w, h, theta, dx, dy]])
+    t = np.deg2rad(theta)
+    cos, sin = np.cos(t)[:, None], np.sin(t)[:, None]
+    px = np.stack([w, -w, -w, w], axis=1) / 2
+    py = np.stack([h, h, -h, -h], axis=1) / 2
+    return to_counter_clockwise(np.stack([px * cos - py * sin + dx[:, None], px * sin + py * cos + dy[:, None]],
+                                         axis=2))
+
+
+class GTIndex(object):
+    '''
+    Histogram of the gt shapes at the training scale, (log2 size, log2 ratio, angle) for the rotated boxes
+    (opencv definition, size = sqrt(w * h), ratio = h / w) and (log2 size, log2 ratio) for their horizontal
+    bounding rectangles. A few thousand cells summarize a dataset, whatever its number of gt.
+    '''
+
+    def __init__(self, size_bin=0.25, ratio_bin=0.25, angle_bin=7.5):
+        self.size_bin = size_bin
+        self.ratio_bin = ratio_bin
+        self.angle_bin = angle_bin
+        self.rbox_counts = Counter()
+        self.hbox_counts = Counter()
+        self.num_img = 0
+
+    def _bins(self, w, h):
+        w, h = np.maximum(w, 1.), np.maximum(h, 1.)
+        return (np.floor(0.5 * np.log2(w * h) / self.size_bin).astype(np.int64),
+                np.floor(np.log2(h / w) / self.ratio_bin).astype(np.int64))
+
+    def add(self, quads, img_h, img_w, shortside_len, max_length):
+        '''
+        :param quads: [N, 8] gt of one image, resized as in training
+        '''
+        self.num_img += 1
+        if len(quads) == 0:
+            return
+        quads = resize_quads(np.reshape(quads, [-1, 8]), img_h, img_w, shortside_len, max_length)
+        rboxes = np.reshape(np.array(backward_convert(quads, False), np.float64), [-1, 5])
+        size, ratio = self._bins(rboxes[:, 2], rboxes[:, 3])
+        angle = np.floor((rboxes[:, 4] + 90) / self.angle_bin).astype(np.int64)
+        self.rbox_counts.update(zip(size.tolist(), ratio.tolist(), angle.tolist()))
+
+        size, ratio = self._bins(np.max(quads[:, 0::2], axis=1) - np.min(quads[:, 0::2], axis=1),
+                                 np.max(quads[:, 1::2], axis=1) - np.min(quads[:, 1::2], axis=1))
+        self.hbox_counts.update(zip(size.tolist(), ratio.tolist()))
+
+    @property
+    def num_gt(self):
+        return sum(self.rbox_counts.values())
+
+    def cells(self, method):
+        '''
+        :param method: 'R' rotated boxes, 'H' horizontal ones
+        :return: shapes [G, 3] (w, h, theta) at the centers of the non-empty cells, weights [G, ]
+        '''
+        counts = self.rbox_counts if method == 'R' else self.hbox_counts
+        if len(counts) == 0:
+            raise ValueError('no gt in the index')
+        keys = np.array(sorted(counts.keys()), np.float64).reshape([len(counts), -1])
+        weights = np.array([counts[k] for k in sorted(counts.keys())], np.float64)
+        size = 2 ** ((keys[:, 0] + 0.5) * self.size_bin)
+        ratio = 2 ** ((keys[:, 1] + 0.5) * self.ratio_bin)
+        theta = (keys[:, 2] + 0.5) * self.angle_bin - 90 if method == 'R' else np.full_like(size, -90)
+        return np.stack([size / np.sqrt(ratio), size * np.sqrt(ratio), theta], axis=1), weights
+
+    def save(self, path):
+        rbox_keys = np.array(sorted(self.rbox_counts.keys()), np.int64).reshape([-1, 3])
+        hbox_keys = np.array(sorted(self.hbox_counts.keys()), np.int64).reshape([-1, 2])
+        np.savez(path, bins=np.array([self.size_bin, self.ratio_bin, self.angle_bin]), num_img=self.num_img,
+                 rbox_keys=rbox_keys, rbox_counts=np.array([self.rbox_counts[tuple(k)] for k in rbox_keys.tolist()]),
+                 hbox_keys=hbox_keys, hbox_counts=np.array([self.hbox_counts[tuple(k)] for k in hbox_keys.tolist()]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            index = cls(*f['bins'].tolist())
+            index.num_img = int(f['num_img'])
+            index.rbox_counts = Counter(dict(zip(map(tuple, f['rbox_keys'].tolist()), f['rbox_counts'].tolist())))
+            index.hbox_counts = Counter(dict(zip(map(tuple, f['hbox_keys'].tolist()), f['hbox_counts'].tolist())))
+        return index
+
+    def summary(self):
+        '''
+        marginal histograms of the rotated boxes
+        '''
+        keys = np.array(list(self.rbox_counts.keys()), np.float64).reshape([-1, 3])
+        counts = np.array(list(self.rbox_counts.values()), np.float64)
+        lines = ['%d images, %d gt, %d cells' % (self.num_img, self.num_gt, len(self.rbox_counts))]
+        for name, col, step, offset in [('size', 0, self.size_bin, 0), ('ratio', 1, self.ratio_bin, 0),
+                                        ('angle', 2, self.angle_bin, -90)]:
+            values, inverse = np.unique(keys[:, col], return_inverse=True)
+            hist = np.bincount(inverse, counts)
+            fmt = (lambda v: '%g' % (2 ** (v * step))) if name != 'angle' else (lambda v: '%g' % (v * step + offset))
+            lines.append('%-6s ' % name + ' '.join(['%s:%.1f%%' % (fmt(v), 100 * c / counts.sum())
+                                                   for v, c in zip(values, hist)]))
+        return '\n'.join(lines)
+
+
+def anchor_shapes(cfgs, scales, ratios, angles, method):
+    '''
+    the anchors of one location of every level, as made by GenerateAnchors
+
+    :return: [L, S, R, T, 3] (w, h, theta)
+    '''
+    shapes = []
+    for base_size, stride in zip(cfgs.BASE_ANCHOR_SIZE_LIST, cfgs.ANCHOR_STRIDE):
+        if method == 'H':
+            # ratio major, rounded on the base anchor of size 4
+            boxes = generate_h_anchors.generate_anchors(base_size=4.0, ratios=np.array(ratios, np.float64),
+                                                        scales=np.array(scales, np.float64) * stride)
+            boxes = np.transpose(np.reshape(boxes, [len(ratios), len(scales), 4]), [1, 0, 2])
+            w, h = boxes[..., 2] - boxes[..., 0] + 1, boxes[..., 3] - boxes[..., 1] + 1
+        else:
+            sqrt_ratios = np.sqrt(np.array(ratios, np.float64))
+            size = base_size * np.array(scales, np.float64)[:, None]
+            w, h = size / sqrt_ratios[None, :], size * sqrt_ratios[None, :]
+        w = np.repeat(w[:, :, None], len(angles), axis=2)
+        h = np.repeat(h[:, :, None], len(angles), axis=2)
+        theta = np.broadcast_to(np.array(angles, np.float64)[None, None, :], w.shape)
+        shapes.append(np.stack([w, h, theta], axis=-1))
+    return np.array(shapes)
+
+
+def center_offsets(num):
+    '''
+    :return: [num * num, 2] offsets of the gt center to its nearest anchor, in strides, on a grid of the cell
+    '''
+    f = (np.arange(num) + 0.5) / num - 0.5
+    dx, dy = np.meshgrid(f, f)
+    return np.stack([dx.ravel(), dy.ravel()], axis=1)
+
+
+def max_iou_table(gt_shapes, anchors, strides, method, num_offsets=2, min_iou=0.3, chunk_size=65536):
+    '''
+    IoU of every gt cell with every anchor shape (the best level), the gt center at several offsets of
+    its nearest anchor center. Pairs whose area ratio bounds the IoU under min_iou are not computed.
+
+    :param gt_shapes: [G, 3]
+    :param anchors: [L, S, R, T, 3]
+    :return: [G, O, S, R, T] float16
+    '''
+    num_level, anchor_dims = anchors.shape[0], anchors.shape[1:4]
+    offsets = center_offsets(num_offsets)
+    table = np.zeros([gt_shapes.shape[0], offsets.shape[0], int(np.prod(anchor_dims))], np.float16)
+    gt_area = gt_shapes[:, 0] * gt_shapes[:, 1]
+
+    for level in range(num_level):
+        shapes = np.reshape(anchors[level], [-1, 3])
+        anchor_area = shapes[:, 0] * shapes[:, 1]
+        offset = offsets * strides[level]
+        bound = np.minimum(gt_area[:, None], anchor_area[None, :]) / np.maximum(gt_area[:, None], anchor_area[None, :])
+        gi, ai = np.where(bound >= min_iou)
+        for o in range(offsets.shape[0]):
+            if method == 'H':
+                g, a, dx, dy = gt_shapes[gi], shapes[ai], offset[o, 0], offset[o, 1]
+                iw = np.maximum(np.minimum(g[:, 0] / 2, dx + a[:, 0] / 2) - np.maximum(-g[:, 0] / 2, dx - a[:, 0] / 2), 0)
+                ih = np.maximum(np.minimum(g[:, 1] / 2, dy + a[:, 1] / 2) - np.maximum(-g[:, 1] / 2, dy - a[:, 1] / 2), 0)
+                inter = iw * ih
+            else:
+                inter = np.zeros([gi.shape[0]])
+                for start in range(0, gi.shape[0], chunk_size):
+                    g, a = gt_shapes[gi[start:start + chunk_size]], shapes[ai[start:start + chunk_size]]
+                    inter[start:start + chunk_size] = convex_intersection_area(
+                        rect_polygons(g[:, 0], g[:, 1], g[:, 2]),
+                        rect_polygons(a[:, 0], a[:, 1], a[:, 2], offset[o, 0], offset[o, 1]))
+            iou = inter / np.maximum(gt_area[gi] + anchor_area[ai] - inter, 1e-6)
+            np.maximum.at(table[:, o], (gi, ai), iou.astype(np.float16))
+    return np.reshape(table, [gt_shapes.shape[0], offsets.shape[0]] + list(anchor_dims))
+
+
+class AnchorSearch(object):
+    '''
+    Anchor configurations (scales x ratios x angles of every level) with the smallest number of anchors per
+    location that keep the recall of the gt at the IoU thresholds, recall = weighted fraction of (gt, offset)
+    whose best anchor reaches the threshold. The IoU of all candidate shapes are computed once
+    (max_iou_table), a configuration is a sub-table.
+    '''
+
+    def __init__(self, cfgs, gt_index, method, scales, ratios, angles, num_offsets=2, min_iou=0.3):
+        self.method = method
+        self.scales, self.ratios, self.angles = list(scales), list(ratios), list(angles) if method == 'R' else [-90]
+        gt_shapes, self.weights = gt_index.cells(method)
+        anchors = anchor_shapes(cfgs, self.scales, self.ratios, self.angles, method)
+        self.table = max_iou_table(gt_shapes, anchors, cfgs.ANCHOR_STRIDE, method, num_offsets, min_iou)
+
+    def _index(self, values, candidates):
+        return [int(np.argmin(np.abs(np.array(candidates) - v))) for v in values]
+
+    def recall(self, scales, ratios, angles, iou_thresholds):
+        '''
+        :return: list of recall, one per threshold
+        '''
+        si, ri = self._index(scales, self.scales), self._index(ratios, self.ratios)
+        ti = self._index(angles, self.angles) if self.method == 'R' else [0]
+        best = np.max(self.table[:, :, si][:, :, :, ri][..., ti].reshape(self.table.shape[:2] + (-1,)), axis=2)
+        return [float(np.sum(np.mean(best >= thr, axis=1) * self.weights) / np.sum(self.weights))
+                for thr in iou_thresholds]
+
+    def search(self, scale_sets, ratio_sets, angle_sets, iou_thresholds):
+        '''
+        :return: list of (anchor number, recalls, scales, ratios, angles), fewest anchors first
+        '''
+        if self.method != 'R':
+            angle_sets = [[-90]]
+        results = []
+        for scales in scale_sets:
+            for ratios in ratio_sets:
+                for angles in angle_sets:
+                    num = len(scales) * len(ratios) * (len(angles) if self.method == 'R' else 1)
+                    results.append((num, self.recall(scales, ratios, angles, iou_thresholds), scales, ratios, angles))
+        return sorted(results, key=lambda r: (r[0], -r[1][0]))
+
+
+def candidate_sets(max_scales=4, ratios=(2., 3., 5., 7.), angle_nums=(1, 2, 3, 6, 12), angle_range=90):
+    '''
+    scales evenly dividing an octave (the levels are an octave apart), ratios symmetric around 1,
+    angles evenly spaced from -90
+
+    :return: scale sets, ratio sets, angle sets
+    '''
+    scale_sets = [[2 ** (k / n) for k in range(n)] for n in range(1, max_scales + 1)]
+    ratio_sets = [[1.]]
+    for num in range(1, len(ratios) + 1):
+        for subset in combinations(ratios, num):
+            ratio_sets.append([1.] + [v for r in subset for v in (1. / r, r)])
+    angle_sets = [[-90 + angle_range * k / n for k in range(n)] for n in angle_nums]
+    return scale_sets, ratio_sets, angle_sets
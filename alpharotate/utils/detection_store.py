@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+import hashlib
+import json
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from alpharotate.utils.tools import makedirs
+
+# record: header | image name (utf-8) | boxes float32 [num, box_dim] | scores float32 [num] | labels int32 [num]
+_HEADER = struct.Struct('<4sIII')
+_MAGIC = b'DETS'
+
+
+def per_class_lines(name, boxes, scores, labels, lines):
+    '''
+    append the detections of one image to lines (label --> list), each line is: image_name score box
+    '''
+    img_name = os.path.splitext(name)[0]
+    for box, score, label in zip(boxes, scores, labels):
+        lines[label].append('%s %.3f %s\n' % (img_name, score, ' '.join(['%.1f' % v for v in box])))
+    return lines
+
+
+class DetectionStore(object):
+    '''
+    Append-only binary file of per-image detections.
+    The index (image name --> record offset) is rebuilt from the record headers when the file is opened,
+    a record that was cut by an interrupted run is dropped, so the file can always be appended to and resumed.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.index = OrderedDict()
+        if os.path.dirname(path) != '':
+            makedirs(os.path.dirname(path))
+        self._fw = open(path, 'ab+')
+        self._build_index()
+
+    def _build_index(self):
+        self._fw.seek(0, os.SEEK_END)
+        file_size = self._fw.tell()
+        self._fw.seek(0)
+        offset = 0
+        while offset + _HEADER.size <= file_size:
+            magic, name_len, num, box_dim = _HEADER.unpack(self._fw.read(_HEADER.size))
+            record_size = _HEADER.size + name_len + num * (box_dim * 4 + 8)
+            if magic != _MAGIC or offset + record_size > file_size:
+                break
+            name = self._fw.read(name_len).decode('utf-8')
+            self.index[name] = (offset, num, box_dim)
+            offset += record_size
+            self._fw.seek(offset)
+        if offset != file_size:
+            self._fw.truncate(offset)
+        self._fw.seek(0, os.SEEK_END)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def names(self):
+        return list(self.index.keys())
+
+    def append(self, name, boxes, scores, labels):
+        '''
+        :param name: image name
+        :param boxes: [N, box_dim]
+        :param scores: [N, ]
+        :param labels: [N, ]
+        '''
+        scores = np.reshape(np.array(scores, np.float32), [-1])
+        num = scores.shape[0]
+        boxes = np.array(boxes, np.float32)
+        box_dim = boxes.shape[-1] if num > 0 else 0
+        name_bytes = name.encode('utf-8')
+
+        self._fw.seek(0, os.SEEK_END)
+        offset = self._fw.tell()
+        self._fw.write(b''.join([_HEADER.pack(_MAGIC, len(name_bytes), num, box_dim), name_bytes,
+                                 np.reshape(boxes, [-1]).tobytes(), scores.tobytes(),
+                                 np.reshape(np.array(labels, np.int32), [-1]).tobytes()]))
+        self._fw.flush()
+        self.index[name] = (offset, num, box_dim)
+
+    def read(self, name):
+        '''
+        :return: boxes [N, box_dim], scores [N, ], labels [N, ]
+        '''
+        offset, num, box_dim = self.index[name]
+        self._fw.seek(offset + _HEADER.size + len(name.encode('utf-8')))
+        boxes = np.frombuffer(self._fw.read(num * box_dim * 4), np.float32).reshape([num, box_dim])
+        scores = np.frombuffer(self._fw.read(num * 4), np.float32)
+        labels = np.frombuffer(self._fw.read(num * 4), np.int32)
+        self._fw.seek(0, os.SEEK_END)
+        return boxes, scores, labels
+
+    def items(self):
+        for name in self.names():
+            yield (name,) + self.read(name)
+
+    def close(self):
+        self._fw.close()
+
+    def _export_per_class(self, save_dir, label_name_map, file_pattern):
+        lines = dict([(label, []) for label in label_name_map.keys()])
+        for name, boxes, scores, labels in self.items():
+            per_class_lines(name, boxes, scores, labels, lines)
+        makedirs(save_dir)
+        for label, class_name in label_name_map.items():
+            if class_name == 'back_ground':
+                continue
+            with open(os.path.join(save_dir, file_pattern % class_name), 'w') as fw:
+                fw.writelines(lines[label])
+
+    def export_dota(self, save_dir, label_name_map):
+        '''
+        Task1_<class>.txt, each line is: image_name score x1 y1 x2 y2 x3 y3 x4 y4
+        '''
+        self._export_per_class(save_dir, label_name_map, 'Task1_%s.txt')
+
+    def export_voc(self, save_dir, label_name_map):
+        '''
+        det_<class>.txt, each line is: image_name score box
+        '''
+        self._export_per_class(save_dir, label_name_map, 'det_%s.txt')
+
+    def export_icdar(self, save_dir):
+        '''
+        res_<image_name>.txt, each line is: x1,y1,x2,y2,x3,y3,x4,y4
+        '''
+        makedirs(save_dir)
+        for name, boxes, scores, labels in self.items():
+            with open(os.path.join(save_dir, 'res_%s.txt' % os.path.splitext(name)[0]), 'w') as fw:
+                fw.writelines(['%s\n' % ','.join(['%d' % v for v in box]) for box in boxes])
+
+
+def checkpoint_fingerprint(ckpt_path):
+    '''
+    the index of a tf checkpoint holds the checksum of every tensor, so it identifies the weights,
+    other files (pretrained weights) are identified by their path, size and mtime
+    '''
+    if ckpt_path is None:
+        return 'none'
+    if os.path.exists(ckpt_path + '.index'):
+        with open(ckpt_path + '.index', 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    stat = os.stat(ckpt_path)
+    return hashlib.sha1(('%s %d %d' % (os.path.abspath(ckpt_path), stat.st_size, stat.st_mtime)).encode()).hexdigest()
+
+
+class RawDetectionCache(object):
+    '''
+    Detections of every image before the per-class nms of the test drivers (all windows, scales and flips),
+    one directory per checkpoint and test setting. The nms / score thresholds can then be swept over the cache
+    without the network (tools/sweep_nms.py).
+    The detections are the output of the network, so after its per-window score filter and nms, unless the
+    detector was built without them (test_dota_base.py --raw_cache_mode pre_nms), then a box is a quad and
+    the index of its window run ([N, 9]).
+    Every writer (gpu worker) appends to its own DetectionStore, a record is named image_name@mtime so that
+    a changed image is detected again.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        makedirs(self.path)
+
+    @classmethod
+    def create(cls, cache_dir, ckpt_path, settings, info=None):
+        '''
+        :param settings: dict of everything else the raw detections depend on (tiling, scales, score threshold
+                         and nms of the network ...), must be json serializable
+        :param info: dict kept in settings.json for the readers of the cache, not part of the key
+        '''
+        key = hashlib.sha1(json.dumps([checkpoint_fingerprint(ckpt_path), settings],
+                                      sort_keys=True).encode()).hexdigest()[:16]
+        cache = cls(os.path.join(cache_dir, key))
+        with open(os.path.join(cache.path, 'settings.json'), 'w') as f:
+            json.dump({'checkpoint': ckpt_path, 'settings': settings, 'info': info or {}}, f,
+                      indent=2, sort_keys=True)
+        return cache
+
+    def settings(self):
+        '''
+        :return: dict with the checkpoint, settings and info given to create
+        '''
+        with open(os.path.join(self.path, 'settings.json')) as f:
+            return json.load(f)
+
+    @staticmethod
+    def record_name(img_path):
+        return '%s@%d' % (os.path.basename(img_path), int(os.path.getmtime(img_path) * 1e6))
+
+    def stores(self):
+        '''
+        open all stores, only when no writer is running
+        '''
+        return [DetectionStore(os.path.join(self.path, f)) for f in sorted(os.listdir(self.path)) if f.endswith('.det')]
+
+    def lookup(self, img_paths):
+        '''
+        :return: dict, image path --> (boxes, scores, labels) for the cached images
+        '''
+        names = dict([(self.record_name(p), p) for p in img_paths])
+        cached = {}
+        for store in self.stores():
+            for name in store.names():
+                if name in names:
+                    cached[names[name]] = store.read(name)
+            store.close()
+        return cached
+
+    def items(self):
+        '''
+        :return: (image name, boxes, scores, labels) of the latest record of every image
+        '''
+        latest = OrderedDict()
+        for store in self.stores():
+            for name, boxes, scores, labels in store.items():
+                img_name, mtime = name.rsplit('@', 1)
+                if img_name not in latest or int(mtime) >= latest[img_name][0]:
+                    latest[img_name] = (int(mtime), boxes, scores, labels)
+            store.close()
+        return [(img_name,) + dets[1:] for img_name, dets in latest.items()]
+
+    def writer(self, writer_id):
+        return DetectionStore(os.path.join(self.path, '%s.det' % writer_id))
+
+
+if __name__ == '__main__':
+    import argparse
+    import importlib
+
+    from alpharotate.libs.label_name_dict.label_dict import LabelMap
+
+    parser = argparse.ArgumentParser('Export a detection store')
+    parser.add_argument('--store', type=str)
+    parser.add_argument('--save_dir', type=str)
+    parser.add_argument('--format', default='dota', choices=['dota', 'icdar', 'voc'], type=str)
+    parser.add_argument('--cfgs', default='configs.cfgs', type=str, help='config module, for the label map')
+    args = parser.parse_args()
+
+    store = DetectionStore(args.store)
+    if args.format == 'icdar':
+        store.export_icdar(args.save_dir)
+    else:
+        label_name_map = LabelMap(importlib.import_module(args.cfgs)).label2name()
+        getattr(store, 'export_' + args.format)(args.save_dir, label_name_map)
+    store.close()
@@ -11,6 +11,8 @@ from __future__ import print_function
 import tensorflow as tf
 import numpy as np
 
+from alpharotate.utils import gaussian_kernels
+
 
 def box2gaussian(boxes1, boxes2):
 
@@ -73,10 +75,8 @@ def wasserstein_distance_item2(sigma1, sigma2):
     :return: the second term of wasserstein distance
     """
 
-    wasserstein_diss_item2 = tf.linalg.matmul(sigma1, sigma1) + tf.linalg.matmul(sigma2, sigma2) - 2 * tf.linalg.sqrtm(
-        tf.linalg.matmul(tf.linalg.matmul(sigma1, tf.linalg.matmul(sigma2, sigma2)), sigma1))
-    wasserstein_diss_item2 = tf.linalg.trace(wasserstein_diss_item2)
-    return wasserstein_diss_item2
+    return gaussian_kernels.wasserstein_distance((0., 0.), gaussian_kernels.matrix2entries(sigma1),
+                                                 (0., 0.), gaussian_kernels.matrix2entries(sigma2))
 
 
 def gaussian_wasserstein_distance(boxes1, boxes2):
@@ -89,12 +89,9 @@ def gaussian_wasserstein_distance(boxes1, boxes2):
     :return: wasserstein distance,  :math:`\mathbf D_{w}`
     """
 
-    x1, y1, x2, y2, sigma1, sigma2 = box2gaussian(boxes1, boxes2)
-
-    wasserstein_dis_item1 = (x1 - x2) ** 2 + (y1 - y2) ** 2
-    wasserstein_dis_item2 = tf.reshape(wasserstein_distance_item2(sigma1, sigma2), [-1, 1])
-    wasserstein_distance = wasserstein_dis_item1 + wasserstein_dis_item2
-    return wasserstein_distance
+    mu1, sigma1 = gaussian_kernels.rbox2gaussian(boxes1)
+    mu2, sigma2 = gaussian_kernels.rbox2gaussian(boxes2)
+    return tf.reshape(gaussian_kernels.wasserstein_distance(mu1, sigma1, mu2, sigma2), [-1, 1])
 
 
 def kullback_leibler_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
@@ -111,15 +108,9 @@ def kullback_leibler_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
     :return:  kullback-leibler divergence, :math:`\mathbf D_{kl}`
     """
 
-    sigma1_square = tf.linalg.matmul(sigma1, sigma1)
-    sigma2_square = tf.linalg.matmul(sigma2, sigma2)
-    item1 = tf.linalg.trace(tf.linalg.matmul(tf.linalg.inv(sigma2_square), sigma1_square))
-    item2 = tf.linalg.matmul(tf.linalg.matmul(mu2 - mu1, tf.linalg.inv(sigma2_square)), mu2_T - mu1_T)
-    item3 = tf.log(tf.linalg.det(sigma2_square) / tf.linalg.det(sigma1_square))
-    item1 = tf.reshape(item1, [-1, ])
-    item2 = tf.reshape(item2, [-1, ])
-    item3 = tf.reshape(item3, [-1, ])
-    return (item1 + item2 + item3 - 2) / 2.
+    sigma1 = gaussian_kernels.square(gaussian_kernels.matrix2entries(sigma1))
+    sigma2 = gaussian_kernels.square(gaussian_kernels.matrix2entries(sigma2))
+    return gaussian_kernels.kl_divergence((mu1[:, 0, 0], mu1[:, 0, 1]), sigma1, (mu2[:, 0, 0], mu2[:, 0, 1]), sigma2)
 
 
 def gaussian_kullback_leibler_divergence(boxes1, boxes2):
@@ -132,16 +123,11 @@ def gaussian_kullback_leibler_divergence(boxes1, boxes2):
     :return: kullback-leibler divergence, :math:`\mathbf D_{kl}`
     """
 
-    x1, y1, x2, y2, sigma1, sigma2 = box2gaussian(boxes1, boxes2)
-
-    mu1 = tf.reshape(tf.concat([x1, y1], axis=-1), [-1, 1, 2])
-    mu2 = tf.reshape(tf.concat([x2, y2], axis=-1), [-1, 1, 2])
-
-    mu1_T = tf.reshape(tf.concat([x1, y1], axis=-1), [-1, 2, 1])
-    mu2_T = tf.reshape(tf.concat([x2, y2], axis=-1), [-1, 2, 1])
-
-    kl_divergence = tf.reshape(kullback_leibler_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
-    return kl_divergence
+    mu1, sigma1 = gaussian_kernels.rbox2gaussian(boxes1)
+    mu2, sigma2 = gaussian_kernels.rbox2gaussian(boxes2)
+    kl_divergence = gaussian_kernels.kl_divergence(mu1, gaussian_kernels.square(sigma1),
+                                                   mu2, gaussian_kernels.square(sigma2))
+    return tf.reshape(kl_divergence, [-1, 1])
 
 if __name__ == '__main__':
     # from alpharotate.libs.utils.coordinate_convert import forward_convert
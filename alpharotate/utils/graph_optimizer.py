@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+import time
+from collections import Counter
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.tools.graph_transforms import TransformGraph
+
+
+def optimize_transforms(input_shape=None):
+    '''
+    graph transforms for inference: drop what the outputs do not need, fold constants and BN into conv
+    (FusedBatchNorm of slim with is_training=False), remove identity / check nodes
+
+    :param input_shape: e.g. (800, 800, 3), fix the input placeholder so that shape ops can be folded
+    '''
+    strip = 'strip_unused_nodes(type=uint8)' if input_shape is None else \
+        'strip_unused_nodes(type=uint8, shape="%s")' % ','.join([str(s) for s in input_shape])
+    return [strip,
+            'remove_nodes(op=Identity, op=CheckNumerics, op=StopGradient)',
+            'fold_constants(ignore_errors=true)',
+            'fold_batch_norms',
+            'fold_old_batch_norms',
+            'strip_unused_nodes',
+            'sort_by_execution_order']
+
+
+def quantize_transforms():
+    '''
+    eight bit weights and activations, the ranges of the activations are computed at run time
+    (RequantizationRange) until they are frozen by calibration
+    '''
+    return ['add_default_attributes',
+            'fold_constants(ignore_errors=true)',
+            'fold_batch_norms',
+            'fold_old_batch_norms',
+            'quantize_weights',
+            'quantize_nodes',
+            'strip_unused_nodes',
+            'sort_by_execution_order']
+
+
+def load_graph_def(pb_path):
+    with tf.gfile.GFile(pb_path, 'rb') as f:
+        graph_def = tf.GraphDef()
+        graph_def.ParseFromString(f.read())
+    return graph_def
+
+
+def save_graph_def(graph_def, pb_path):
+    with tf.gfile.GFile(pb_path, 'wb') as f:
+        f.write(graph_def.SerializeToString())
+
+
+def optimize_graph_def(graph_def, input_names, output_names, input_shape=None, transforms=None):
+    if transforms is None:
+        transforms = optimize_transforms(input_shape)
+    return TransformGraph(graph_def, input_names, output_names, transforms)
+
+
+def calibrate_requantization_ranges(graph_def, feed_dicts, log_path, cpu_only=True):
+    '''
+    run the calibration images through a graph quantized with dynamic ranges and log the min / max of
+    every RequantizationRange in the format read by freeze_requantization_ranges
+
+    :param feed_dicts: iterable of feed dicts, one per calibration image
+    :return: number of calibration images
+    '''
+    names = [node.name for node in graph_def.node if node.op == 'RequantizationRange']
+    config = tf.ConfigProto(device_count={'GPU': 0}) if cpu_only else tf.ConfigProto()
+    num = 0
+    with tf.Graph().as_default() as graph:
+        tf.import_graph_def(graph_def, name='')
+        fetches = [(graph.get_tensor_by_name(name + ':0'), graph.get_tensor_by_name(name + ':1')) for name in names]
+        with tf.Session(graph=graph, config=config) as sess, open(log_path, 'w') as f:
+            for feed_dict in feed_dicts:
+                for name, (min_val, max_val) in zip(names, sess.run(fetches, feed_dict=feed_dict)):
+                    f.write(';%s__print__;__requant_min_max:[%.9g][%.9g]\n' % (name, min_val, max_val))
+                num += 1
+    return num
+
+
+def quantize_graph_def(graph_def, input_names, output_names, feed_dicts, log_path):
+    '''
+    post-training int8 quantization, the activation ranges are calibrated on the given images
+
+    :param feed_dicts: iterable of feed dicts of representative images
+    :param log_path: where the calibrated ranges are written
+    '''
+    dynamic_graph_def = TransformGraph(graph_def, input_names, output_names, quantize_transforms())
+    num = calibrate_requantization_ranges(dynamic_graph_def, feed_dicts, log_path)
+    if num == 0:
+        raise ValueError('no calibration images')
+    return TransformGraph(dynamic_graph_def, input_names, output_names,
+                          ['freeze_requantization_ranges(min_max_log_file="%s")' % log_path,
+                           'strip_unused_nodes',
+                           'sort_by_execution_order'])
+
+
+def count_ops(graph_def):
+    return Counter([node.op for node in graph_def.node])
+
+
+def run_graph_def(graph_def, feed_dict, output_names, runs=0, warmup=3, cpu_only=True):
+    '''
+    :param feed_dict: tensor name --> array
+    :param runs: > 0 to also measure the latency
+    :return: outputs, mean latency (ms) or None
+    '''
+    config = tf.ConfigProto(device_count={'GPU': 0}) if cpu_only else tf.ConfigProto()
+    with tf.Graph().as_default() as graph:
+        tf.import_graph_def(graph_def, name='')
+        fetches = [graph.get_tensor_by_name(name + ':0') for name in output_names]
+        with tf.Session(graph=graph, config=config) as sess:
+            outputs = sess.run(fetches, feed_dict=feed_dict)
+            if runs <= 0:
+                return outputs, None
+            for _ in range(warmup):
+                sess.run(fetches, feed_dict=feed_dict)
+            start = time.time()
+            for _ in range(runs):
+                sess.run(fetches, feed_dict=feed_dict)
+            return outputs, (time.time() - start) / runs * 1000
+
+
+def compare_outputs(ref_outputs, outputs, output_names):
+    '''
+    :return: dict, output name --> max abs diff
+    '''
+    diffs = {}
+    for name, ref, out in zip(output_names, ref_outputs, outputs):
+        if ref.shape != out.shape:
+            diffs[name] = np.inf
+        else:
+            diffs[name] = float(np.max(np.abs(ref.astype(np.float64) - out.astype(np.float64)))) if ref.size else 0.
+    return diffs
+
+
+def report(graph_defs, feed_dict, output_names, ref_outputs=None, runs=20):
+    '''
+    print op count, CPU latency and the max output difference of several graphs
+
+    :param graph_defs: list of (name, graph_def)
+    '''
+    print('%-24s %8s %12s %14s' % ('graph', 'ops', 'cpu(ms)', 'max abs diff'))
+    for name, graph_def in graph_defs:
+        outputs, latency = run_graph_def(graph_def, feed_dict, output_names, runs=runs)
+        if ref_outputs is None:
+            ref_outputs = outputs
+        diff = max(compare_outputs(ref_outputs, outputs, output_names).values())
+        print('%-24s %8d %12.2f %14.3e' % (name, len(graph_def.node), latency, diff))
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+
+import numpy as np
+
+# 1, 2, 5 ms ... 100 s
+LATENCY_BOUNDS_MS = [m * 10 ** e for e in range(0, 5) for m in (1, 2, 5)] + [100000]
+
+
+class ShapeBatcher(object):
+    '''
+    Pending tiles grouped by input shape, a batch only holds tiles of one shape (from any number of requests).
+    A batch is taken when a worker is free: the group of the oldest tile, up to max_batch tiles.
+    Under load the tiles accumulate while the workers are busy and the batches grow,
+    a single request on an idle pool is dispatched at once.
+    The tiles of a batch are not stacked, the worker runs them one by one: batching saves the
+    inter-process messages and the queueing, not forward passes.
+    '''
+
+    def __init__(self, max_batch=8):
+        self.max_batch = max_batch
+        self.groups = OrderedDict()
+        self.cond = threading.Condition()
+        self.closed = False
+
+    def __len__(self):
+        with self.cond:
+            return sum([len(group) for group in self.groups.values()])
+
+    def put(self, shape, task):
+        with self.cond:
+            self.groups.setdefault(shape, deque()).append((time.time(), task))
+            self.cond.notify()
+
+    def get(self):
+        '''
+        :return: list of (enqueue time, task) of the same shape, None once closed and empty
+        '''
+        with self.cond:
+            while len(self.groups) == 0 and not self.closed:
+                self.cond.wait()
+            if len(self.groups) == 0:
+                return None
+            shape = min(self.groups, key=lambda k: self.groups[k][0][0])
+            group = self.groups[shape]
+            batch = [group.popleft() for _ in range(min(self.max_batch, len(group)))]
+            if len(group) == 0:
+                del self.groups[shape]
+            return batch
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class LatencyHistogram(object):
+    '''
+    counts of the latencies in fixed buckets (upper bounds in ms), quantiles are the bucket bounds
+    '''
+
+    def __init__(self, bounds=LATENCY_BOUNDS_MS):
+        self.bounds = np.array(bounds, np.float64)
+        self.counts = np.zeros([len(bounds) + 1], np.int64)
+        self.total = 0.
+        self.max = 0.
+
+    @property
+    def num(self):
+        return int(self.counts.sum())
+
+    def add(self, ms):
+        self.counts[np.searchsorted(self.bounds, ms)] += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q):
+        if self.num == 0:
+            return 0.
+        index = int(np.searchsorted(np.cumsum(self.counts), q * self.num))
+        return min(float(self.bounds[index]), self.max) if index < len(self.bounds) else self.max
+
+    def to_dict(self):
+        return {'count': self.num, 'mean_ms': self.total / max(self.num, 1), 'max_ms': self.max,
+                'p50_ms': self.quantile(0.5), 'p95_ms': self.quantile(0.95), 'p99_ms': self.quantile(0.99),
+                'buckets': [[float(b), int(c)] for b, c in zip(self.bounds, np.cumsum(self.counts))]}
+
+
+class ServingMetrics(object):
+    '''
+    thread-safe counters and latency histograms of the inference service,
+    rates are given over the uptime and over the last `window` seconds
+    '''
+
+    def __init__(self, window=60.):
+        self.window = window
+        self.start = time.time()
+        self.lock = threading.Lock()
+        self.counters = Counter()
+        self.histograms = OrderedDict()
+        self.recent = deque()
+
+    def count(self, name, num=1):
+        with self.lock:
+            self.counters[name] += num
+            if name == 'images':
+                self.recent.append((time.time(), num))
+
+    def observe(self, name, ms):
+        with self.lock:
+            self.histograms.setdefault(name, LatencyHistogram()).add(ms)
+
+    def snapshot(self):
+        with self.lock:
+            now = time.time()
+            while len(self.recent) > 0 and self.recent[0][0] < now - self.window:
+                self.recent.popleft()
+            uptime = now - self.start
+            return {'uptime_s': uptime,
+                    'counters': dict(self.counters),
+                    'per_second': dict([(k, v / uptime) for k, v in self.counters.items()]),
+                    'images_per_second_%ds' % self.window: sum([n for _, n in self.recent]) /
+                                                            min(self.window, max(uptime, 1e-6)),
+                    'latency': OrderedDict([(k, h.to_dict()) for k, h in self.histograms.items()])}
+
+    def prometheus(self, prefix='alpharotate'):
+        '''
+        the text exposition format of prometheus
+        '''
+        lines = []
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                lines += ['# TYPE %s_%s_total counter' % (prefix, name), '%s_%s_total %d' % (prefix, name, value)]
+            for name, hist in self.histograms.items():
+                metric = '%s_%s_ms' % (prefix, name)
+                lines.append('# TYPE %s histogram' % metric)
+                for bound, num in zip(hist.bounds, np.cumsum(hist.counts)):
+                    lines.append('%s_bucket{le="%g"} %d' % (metric, bound, num))
+                lines += ['%s_bucket{le="+Inf"} %d' % (metric, hist.num),
+                          '%s_sum %f' % (metric, hist.total), '%s_count %d' % (metric, hist.num)]
+        return '\n'.join(lines) + '\n'
@@ -13,8 +13,8 @@ import sys
 import tensorflow as tf
 
 sys.path.append('../..')
-# from utils.gaussian_wasserstein_distance import get_element1, get_element4
 from alpharotate.libs.utils.coordinate_convert import *
+from alpharotate.utils import gaussian_kernels
 # from alpharotate.libs.utils.rbbox_overlaps import rbbx_overlaps
 # from alpharotate.libs.utils.iou_cpu import get_iou_matrix
 
@@ -221,8 +221,6 @@ def gaussian_wasserstein_distance_(boxes1, boxes2):
 
 
 def gaussian_wasserstein_distance(boxes1, boxes2):
-    from alpharotate.utils import get_element1, get_element4
-
     boxes1 = coordinate_present_convert(boxes1, -1)
     boxes1[:, 4] += 90
     boxes1[:, 4] *= (-np.pi / 180)
@@ -231,101 +229,35 @@ def gaussian_wasserstein_distance(boxes1, boxes2):
     boxes2[:, 4] += 90
     boxes2[:, 4] *= (-np.pi / 180)
 
-    element1 = get_element1(boxes1[:, 2], boxes1[:, 3], boxes1[:, 4], boxes2[:, 2], boxes2[:, 3], boxes2[:, 4])
-    element4 = get_element4(boxes1[:, 2], boxes1[:, 3], boxes1[:, 4], boxes2[:, 2], boxes2[:, 3], boxes2[:, 4])
-    dis = (boxes1[:, 0] - boxes2[:, 0])**2 + (boxes1[:, 1] - boxes2[:, 1])**2 + (element1 + element4)
+    mu1, sigma1 = gaussian_kernels.rbox2gaussian(boxes1, backend=np)
+    mu2, sigma2 = gaussian_kernels.rbox2gaussian(boxes2, backend=np)
+    dis = gaussian_kernels.wasserstein_distance(mu1, sigma1, mu2, sigma2, backend=np)
     return dis
 
 
 def wasserstein_diss_sigma(sigma1, sigma2):
-    wasserstein_diss_item2 = tf.linalg.matmul(sigma1, sigma1) + tf.linalg.matmul(sigma2, sigma2) - 2 * tf.linalg.sqrtm(
-        tf.linalg.matmul(tf.linalg.matmul(sigma1, tf.linalg.matmul(sigma2, sigma2)), sigma1))
-    wasserstein_diss_item2 = tf.linalg.trace(wasserstein_diss_item2)
+    wasserstein_diss_item2 = gaussian_kernels.wasserstein_distance(
+        (0., 0.), gaussian_kernels.matrix2entries(sigma1), (0., 0.), gaussian_kernels.matrix2entries(sigma2))
     return wasserstein_diss_item2
 
 
 def gwd(boxes1, boxes2):
-    x1, y1, w1, h1, theta1 = tf.unstack(boxes1, axis=1)
-    x2, y2, w2, h2, theta2 = tf.unstack(boxes2, axis=1)
-    x1 = tf.reshape(x1, [-1, 1])
-    y1 = tf.reshape(y1, [-1, 1])
-    h1 = tf.reshape(h1, [-1, 1])
-    w1 = tf.reshape(w1, [-1, 1])
-    theta1 = tf.reshape(theta1, [-1, 1])
-    x2 = tf.reshape(x2, [-1, 1])
-    y2 = tf.reshape(y2, [-1, 1])
-    h2 = tf.reshape(h2, [-1, 1])
-    w2 = tf.reshape(w2, [-1, 1])
-    theta2 = tf.reshape(theta2, [-1, 1])
-    theta1 *= (np.pi / 180)
-    theta2 *= (np.pi / 180)
-
-    sigma1_1 = w1 / 2 * tf.cos(theta1) ** 2 + h1 / 2 * tf.sin(theta1) ** 2
-    sigma1_2 = w1 / 2 * tf.sin(theta1) * tf.cos(theta1) - h1 / 2 * tf.sin(theta1) * tf.cos(theta1)
-    sigma1_3 = w1 / 2 * tf.sin(theta1) * tf.cos(theta1) - h1 / 2 * tf.sin(theta1) * tf.cos(theta1)
-    sigma1_4 = w1 / 2 * tf.sin(theta1) ** 2 + h1 / 2 * tf.cos(theta1) ** 2
-    sigma1 = tf.reshape(tf.concat([sigma1_1, sigma1_2, sigma1_3, sigma1_4], axis=-1), [-1, 2, 2])
-
-    sigma2_1 = w2 / 2 * tf.cos(theta2) ** 2 + h2 / 2 * tf.sin(theta2) ** 2
-    sigma2_2 = w2 / 2 * tf.sin(theta2) * tf.cos(theta2) - h2 / 2 * tf.sin(theta2) * tf.cos(theta2)
-    sigma2_3 = w2 / 2 * tf.sin(theta2) * tf.cos(theta2) - h2 / 2 * tf.sin(theta2) * tf.cos(theta2)
-    sigma2_4 = w2 / 2 * tf.sin(theta2) ** 2 + h2 / 2 * tf.cos(theta2) ** 2
-    sigma2 = tf.reshape(tf.concat([sigma2_1, sigma2_2, sigma2_3, sigma2_4], axis=-1), [-1, 2, 2])
-
-    wasserstein_diss_item1 = (x1 - x2) ** 2 + (y1 - y2) ** 2
-    wasserstein_diss_item2 = tf.reshape(wasserstein_diss_sigma(sigma1, sigma2), [-1, 1])
-    wasserstein_diss = wasserstein_diss_item1 + wasserstein_diss_item2
-    return sigma1, sigma2, wasserstein_diss
-
-
-def KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2):
-    sigma1_square = tf.linalg.matmul(sigma1, sigma1)
-    sigma2_square = tf.linalg.matmul(sigma2, sigma2)
-    item1 = tf.linalg.trace(tf.linalg.matmul(tf.linalg.inv(sigma2_square), sigma1_square))
-    item2 = tf.linalg.matmul(tf.linalg.matmul(mu2 - mu1, tf.linalg.inv(sigma2_square)), mu2_T - mu1_T)
-    item3 = tf.log(tf.linalg.det(sigma2_square) / tf.linalg.det(sigma1_square))
-    item1 = tf.reshape(item1, [-1, ])
-    item2 = tf.reshape(item2, [-1, ])
-    item3 = tf.reshape(item3, [-1, ])
-    return (item1 + item2 + item3 - 2) / 2.
+    mu1, sigma1 = gaussian_kernels.rbox2gaussian(boxes1, degrees=True)
+    mu2, sigma2 = gaussian_kernels.rbox2gaussian(boxes2, degrees=True)
+    wasserstein_diss = tf.reshape(gaussian_kernels.wasserstein_distance(mu1, sigma1, mu2, sigma2), [-1, 1])
+    return gaussian_kernels.entries2matrix(sigma1), gaussian_kernels.entries2matrix(sigma2), wasserstein_diss
+
+
+def KL_divergence(mu1, sigma1, mu2, sigma2):
+    return gaussian_kernels.kl_divergence(mu1, gaussian_kernels.square(sigma1),
+                                          mu2, gaussian_kernels.square(sigma2))
 
 
 def kl(boxes1, boxes2):
-    x1, y1, w1, h1, theta1 = tf.unstack(boxes1, axis=1)
-    x2, y2, w2, h2, theta2 = tf.unstack(boxes2, axis=1)
-    x1 = tf.reshape(x1, [-1, 1])
-    y1 = tf.reshape(y1, [-1, 1])
-    h1 = tf.reshape(h1, [-1, 1])
-    w1 = tf.reshape(w1, [-1, 1])
-    theta1 = tf.reshape(theta1, [-1, 1])
-    x2 = tf.reshape(x2, [-1, 1])
-    y2 = tf.reshape(y2, [-1, 1])
-    h2 = tf.reshape(h2, [-1, 1])
-    w2 = tf.reshape(w2, [-1, 1])
-    theta2 = tf.reshape(theta2, [-1, 1])
-    theta1 *= (np.pi / 180)
-    theta2 *= (np.pi / 180)
-
-    sigma1_1 = w1 / 2 * tf.cos(theta1) ** 2 + h1 / 2 * tf.sin(theta1) ** 2
-    sigma1_2 = w1 / 2 * tf.sin(theta1) * tf.cos(theta1) - h1 / 2 * tf.sin(theta1) * tf.cos(theta1)
-    sigma1_3 = w1 / 2 * tf.sin(theta1) * tf.cos(theta1) - h1 / 2 * tf.sin(theta1) * tf.cos(theta1)
-    sigma1_4 = w1 / 2 * tf.sin(theta1) ** 2 + h1 / 2 * tf.cos(theta1) ** 2
-    sigma1 = tf.reshape(tf.concat([sigma1_1, sigma1_2, sigma1_3, sigma1_4], axis=-1), [-1, 2, 2])
-
-    sigma2_1 = w2 / 2 * tf.cos(theta2) ** 2 + h2 / 2 * tf.sin(theta2) ** 2
-    sigma2_2 = w2 / 2 * tf.sin(theta2) * tf.cos(theta2) - h2 / 2 * tf.sin(theta2) * tf.cos(theta2)
-    sigma2_3 = w2 / 2 * tf.sin(theta2) * tf.cos(theta2) - h2 / 2 * tf.sin(theta2) * tf.cos(theta2)
-    sigma2_4 = w2 / 2 * tf.sin(theta2) ** 2 + h2 / 2 * tf.cos(theta2) ** 2
-    sigma2 = tf.reshape(tf.concat([sigma2_1, sigma2_2, sigma2_3, sigma2_4], axis=-1), [-1, 2, 2])
-
-    mu1 = tf.reshape(tf.concat([x1, y1], axis=-1), [-1, 1, 2])
-    mu2 = tf.reshape(tf.concat([x2, y2], axis=-1), [-1, 1, 2])
-
-    mu1_T = tf.reshape(tf.concat([x1, y1], axis=-1), [-1, 2, 1])
-    mu2_T = tf.reshape(tf.concat([x2, y2], axis=-1), [-1, 2, 1])
-
-    KL_distance = tf.reshape(KL_divergence(mu1, mu2, mu1_T, mu2_T, sigma1, sigma2), [-1, 1])
-    return sigma1, sigma2, KL_distance
+    mu1, sigma1 = gaussian_kernels.rbox2gaussian(boxes1, degrees=True)
+    mu2, sigma2 = gaussian_kernels.rbox2gaussian(boxes2, degrees=True)
+    KL_distance = tf.reshape(KL_divergence(mu1, sigma1, mu2, sigma2), [-1, 1])
+    return gaussian_kernels.entries2matrix(sigma1), gaussian_kernels.entries2matrix(sigma2), KL_distance
 
 
 def sigma(a, w, h):
@@ -337,8 +269,6 @@ def sigma(a, w, h):
 
 
 if __name__ == '__main__':
-    from alpharotate.utils import get_element1, get_element4
-
     boxes1 = np.array([[50, 50, 10, 70, -30],
                        [50, 50, 100, 700, -30]], np.float32)
 
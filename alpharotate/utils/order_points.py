@@ -90,6 +90,38 @@ def cos_dist(a, b):
 ############  another method##############
 
 def sort_corners(quads):
+    '''
+    vectorized sort_corners_py, the same ordering
+
+    :param quads: [N, 8]
+    :return: [N, 8]
+    '''
+    quads = np.asarray(quads)
+    corners = np.reshape(quads, [-1, 4, 2])
+    centers = np.mean(corners, axis=1, keepdims=True)
+    corners = corners - centers
+    cosine = corners[..., 0] / np.sqrt(corners[..., 0] ** 2 + corners[..., 1] ** 2)
+    cosine = np.minimum(np.maximum(cosine, -1.0), 1.0)
+    thetas = np.arccos(cosine) / np.pi * 180.0
+    thetas = np.where(corners[..., 1] > 0, 360.0 - thetas, thetas)
+    corners = corners + centers
+    corners = np.take_along_axis(corners, np.argsort(thetas, axis=1)[:, ::-1, None], axis=1)
+
+    x, y = corners[..., 0], corners[..., 1]
+    dx1, dy1 = x[:, 2] - x[:, 0], y[:, 2] - y[:, 0]
+    dx2, dy2 = x[:, 3] - x[:, 1], y[:, 3] - y[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope_1 = np.where(dx1 != 0, dy1 / np.where(dx1 != 0, dx1, 1), np.iinfo(np.int32).max)
+        slope_2 = np.where(dx2 != 0, dy2 / np.where(dx2 != 0, dx2, 1), np.iinfo(np.int32).max)
+    first_idx = np.where(slope_1 > slope_2,
+                         np.where(x[:, 0] < x[:, 2], 0, np.where((x[:, 0] == x[:, 2]) & (y[:, 0] < y[:, 2]), 0, 2)),
+                         np.where(x[:, 1] < x[:, 3], 1, np.where((x[:, 1] == x[:, 3]) & (y[:, 1] < y[:, 3]), 1, 3)))
+    idx = (first_idx[:, None] + np.arange(4)[None, :]) % 4
+    return np.reshape(np.take_along_axis(corners, idx[..., None], axis=1), [-1, 8]).astype(np.float32)
+
+
+def sort_corners_py(quads):
+    # reference loop of sort_corners
     sorted_quads = np.zeros(quads.shape, dtype=np.float32)
     for i, corners in enumerate(quads):
         corners = corners.reshape(4, 2)
@@ -128,8 +160,73 @@ def sort_corners(quads):
     return sorted_quads
 
 
-# counterclockwise, write by WenQian
+# the other three corners of each first corner, and the remaining two of each (first corner, diagonal) pair
+_OTHERS = np.array([[j for j in range(4) if j != i] for i in range(4)])
+_REMAINS = np.array([[[k for k in range(4) if k not in (i, j)] if i != j else [0, 0] for j in range(4)]
+                     for i in range(4)])
+
+
+def _side(x1, y1, x_, y_, x, y):
+    '''
+    side of (x, y) to the line (x1, y1) --> (x_, y_), the same expression as re_order_py
+    '''
+    vertical = x1 == x_
+    with np.errstate(divide='ignore', invalid='ignore'):
+        val = (y - y1) - (y_ - y1) / np.where(vertical, 1, x_ - x1) * (x - x1)
+    return np.where(vertical, x - x1, val), vertical
+
+
 def re_order(bboxes, with_label=False):
+    '''
+    vectorized re_order_py, counterclockwise from the left-most (then top-most) corner, its diagonal is the third.
+    Degenerate boxes without a diagonal are returned as they are.
+
+    :param bboxes: [N, 8] or [N, 9] with label
+    :return: [N, 8] or [N, 9], float32
+    '''
+    bboxes = np.asarray(bboxes)
+    if bboxes.shape[0] == 0:
+        return np.array([], np.float32)
+    # the loop computes with the scalars of the input, float32 stays float32
+    dtype = np.float32 if bboxes.dtype == np.float32 else np.float64
+    boxes = np.array(bboxes, dtype)
+    pts = np.reshape(boxes[:, :8], [-1, 4, 2])
+    x, y = pts[..., 0], pts[..., 1]
+    rows = np.arange(boxes.shape[0])
+
+    # left-most, then top-most, then first corner
+    first = np.lexsort((np.broadcast_to(np.arange(4), x.shape), y, x), axis=-1)[:, 0]
+    x1, y1 = x[rows, first], y[rows, first]
+
+    # the first candidate (in index order) that splits the two other corners is the diagonal
+    diagonal = np.full([boxes.shape[0]], -1)
+    for p in range(3):
+        j = _OTHERS[first, p]
+        k = _REMAINS[first, j]
+        val_a, _ = _side(x1, y1, x[rows, j], y[rows, j], x[rows, k[:, 0]], y[rows, k[:, 0]])
+        val_b, _ = _side(x1, y1, x[rows, j], y[rows, j], x[rows, k[:, 1]], y[rows, k[:, 1]])
+        diagonal = np.where((diagonal < 0) & (val_a * val_b < 0), j, diagonal)
+
+    found = diagonal >= 0
+    diagonal = np.where(found, diagonal, _OTHERS[first, 0])
+    k = _REMAINS[first, diagonal]
+    x3, y3 = x[rows, diagonal], y[rows, diagonal]
+    val_a, vertical = _side(x1, y1, x3, y3, x[rows, k[:, 0]], y[rows, k[:, 0]])
+    # for a vertical diagonal the loop tests x1 - x instead of x - x1
+    second_a = np.where(vertical, -val_a, val_a) >= 0
+    second = np.where(second_a, k[:, 0], k[:, 1])
+    fourth = np.where(second_a, k[:, 1], k[:, 0])
+
+    targets = np.stack([x1, y1, x[rows, second], y[rows, second], x3, y3, x[rows, fourth], y[rows, fourth]], axis=1)
+    if with_label:
+        targets = np.concatenate([targets, boxes[:, -1:]], axis=1)
+    targets = np.where(found[:, None], targets, boxes[:, :targets.shape[1]])
+    return np.array(targets, np.float32)
+
+
+# counterclockwise, write by WenQian
+# reference loop of re_order
+def re_order_py(bboxes, with_label=False):
     n=len(bboxes)
     targets=[]
     for i in range(n):
@@ -214,16 +311,33 @@ def re_order(bboxes, with_label=False):
 # npts = order_points_quadrangle(pts)
 
 if __name__ == '__main__':
-    pts = np.array([
-        [242.7452, 314.5097, 242.7452, 133.4903, 333.2548, 133.4903, 333.2548, 314.5097],
-        [333.2548, 133.4903, 333.2548, 314.5097, 242.7452, 314.5097, 242.7452, 133.4903],
-        [60, 0, 80, 20, 20, 80, 0, 60],
-        [40, 0, 40, 40, 0, 40, 0, 0]
-    ])
-    npts = sort_corners(pts)
-    print(pts)
-    # print(npts)
-    print(re_order([[242.7452, 314.5097, 242.7452, 133.4903, 333.2548, 133.4903, 333.2548, 314.5097],
-                    [333.2548, 133.4903, 333.2548, 314.5097, 242.7452, 314.5097, 242.7452, 133.4903],
-                    [60, 0, 80, 20, 20, 80, 0, 60],
-                    [40, 0, 40, 40, 0, 40, 0, 0]]))
+    # parity with the reference loops and speed
+    import time
+
+    np.random.seed(0)
+    num = 20000
+    # rotated rectangles, random convex quads, integer and axis-aligned boxes, corners in any order
+    centers = np.random.uniform(0, 1000, [num, 1, 2])
+    theta = np.random.uniform(-np.pi, np.pi, [num, 1])
+    rect = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], np.float64)[None] * np.random.uniform(2, 100, [num, 1, 2])
+    rot = np.stack([np.cos(theta), -np.sin(theta), np.sin(theta), np.cos(theta)], axis=2).reshape([-1, 2, 2])
+    rects = centers + np.matmul(rect, np.transpose(rot, [0, 2, 1]))
+    quads = rects + np.random.uniform(-1, 1, rects.shape)
+    aligned = np.round(centers + rect)
+    tests = {'float32 rect': rects.astype(np.float32), 'float64 quad': quads, 'int32 aligned': aligned.astype(np.int32)}
+
+    for name, polys in tests.items():
+        polys = np.take_along_axis(polys, np.argsort(np.random.rand(num, 4), axis=1)[..., None], axis=1)
+        boxes = np.reshape(polys, [num, 8])
+        labeled = np.concatenate([boxes, np.random.randint(1, 10, [num, 1]).astype(boxes.dtype)], axis=1)
+        for func, func_py, inputs, kwargs in [(sort_corners, sort_corners_py, boxes, {}),
+                                              (re_order, re_order_py, boxes, {}),
+                                              (re_order, re_order_py, labeled, {'with_label': True})]:
+            start = time.time()
+            res_py = func_py(inputs, **kwargs)
+            cost_py = time.time() - start
+            start = time.time()
+            res = func(inputs, **kwargs)
+            cost = time.time() - start
+            print('{:14s} {:12s} identical: {}, loop {:.3f}s, vectorized {:.4f}s'.format(
+                name, func.__name__, np.array_equal(res, res_py), cost_py, cost))
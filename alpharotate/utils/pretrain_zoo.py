@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, absolute_import
 
+import os
+
 
 class PretrainModelZoo(object):
     def __init__(self):
@@ -21,7 +23,10 @@ class PretrainModelZoo(object):
     def pretrain_weight_path(self, net_name, root_path):
         if net_name in self.pth_zoo:
             weight_name = net_name
-            weight_path = root_path + '/dataloader/pretrained_weights/' + weight_name + '.npy'
+            weight_path = root_path + '/dataloader/pretrained_weights/' + weight_name
+            # the memory-mapped tensors of resnet_pytorch.save_weight_dir if they were converted
+            if not os.path.isdir(weight_path):
+                weight_path += '.npy'
         elif net_name in self.tf_zoo or net_name in self.mxnet_zoo:
             if net_name.startswith("MobilenetV2"):
                 weight_name = "mobilenet/mobilenet_v2_1.0_224"
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+import threading
+from multiprocessing import Queue, RawArray
+
+import numpy as np
+
+
+class SharedResultRing(object):
+    '''
+    Fixed-layout detection records in shared memory, used to return results from the test workers.
+    Only slot indices go through the queues, the arrays are copied straight into the shared buffer,
+    so nothing is pickled unless a result has more than max_dets boxes (it then takes the overflow queue).
+
+    slot layout: num int32 | name_len int32 | name uint8 [max_name_len] |
+                 boxes float32 [max_dets, box_dim] | scores float32 [max_dets] | labels int32 [max_dets]
+
+    The ring must be created before the worker processes are forked.
+    '''
+
+    def __init__(self, num_slots=64, max_dets=5000, box_dim=8, max_name_len=512):
+        self.num_slots = num_slots
+        self.max_dets = max_dets
+        self.box_dim = box_dim
+        self.max_name_len = max_name_len
+
+        self._offsets = np.cumsum([0, 8, max_name_len, max_dets * box_dim * 4, max_dets * 4, max_dets * 4])
+        self.slot_size = int(self._offsets[-1])
+        self._buffer = RawArray('b', self.slot_size * num_slots)
+        self._view = None
+
+        self._free = Queue()
+        self._full = Queue()
+        self._overflow = Queue()
+        for i in range(num_slots):
+            self._free.put(i)
+
+    def _slot(self, index):
+        if self._view is None:
+            self._view = np.frombuffer(self._buffer, dtype=np.uint8).reshape([self.num_slots, self.slot_size])
+        slot = self._view[index]
+        o = self._offsets
+        header = slot[o[0]:o[1]].view(np.int32)
+        name = slot[o[1]:o[2]]
+        boxes = slot[o[2]:o[3]].view(np.float32).reshape([self.max_dets, self.box_dim])
+        scores = slot[o[3]:o[4]].view(np.float32)
+        labels = slot[o[4]:o[5]].view(np.int32)
+        return header, name, boxes, scores, labels
+
+    def put(self, result_dict):
+        '''
+        :param result_dict: {'boxes': [N, box_dim], 'scores': [N, ], 'labels': [N, ], 'image_id': str}
+        '''
+        index = self._free.get()
+        header, name, boxes, scores, labels = self._slot(index)
+        num = len(result_dict['scores'])
+        name_bytes = result_dict['image_id'].encode('utf-8')
+        if num > self.max_dets or len(name_bytes) > self.max_name_len:
+            header[0] = -1
+            self._overflow.put(result_dict)
+        else:
+            header[0], header[1] = num, len(name_bytes)
+            name[:len(name_bytes)] = np.frombuffer(name_bytes, np.uint8)
+            if num > 0:
+                boxes[:num] = np.reshape(result_dict['boxes'], [num, self.box_dim])
+                scores[:num] = result_dict['scores']
+                labels[:num] = result_dict['labels']
+        self._full.put(index)
+
+    put_nowait = put
+
+    def get(self):
+        index = self._full.get()
+        header, name, boxes, scores, labels = self._slot(index)
+        num, name_len = int(header[0]), int(header[1])
+        if num < 0:
+            result_dict = self._overflow.get()
+        else:
+            result_dict = {'boxes': boxes[:num].copy(), 'scores': scores[:num].copy(),
+                           'labels': labels[:num].copy(), 'image_id': name[:name_len].tobytes().decode('utf-8')}
+        self._free.put(index)
+        return result_dict
+
+    def drain(self, handler, total, num_threads=4):
+        '''
+        get `total` results with several threads and call handler(result_dict) on each of them,
+        handler must be thread safe.
+        '''
+        counter = [0]
+        lock = threading.Lock()
+
+        def consume():
+            while True:
+                with lock:
+                    if counter[0] >= total:
+                        return
+                    counter[0] += 1
+                handler(self.get())
+
+        threads = [threading.Thread(target=consume) for _ in range(max(1, num_threads))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
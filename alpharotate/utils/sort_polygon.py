@@ -1,10 +1,12 @@
+import hashlib
 import math
+import os
 import random
 import numpy as np
 import matplotlib.pyplot as plt
 import alphashape
 
-from alpharotate.libs.utils.mask_sample import points_sampling
+from alpharotate.libs.utils.mask_sample import points_sampling, points_sampling_batch, pad_polygons
 
 
 def carttopolar(x, y, x0=0, y0=0):
@@ -48,7 +50,19 @@ def sort_aniclkwise(xy_list,x0=None,y0=None):
 
 
 def sort_aniclkwise_batch(polys):
-    return np.array([sort_aniclkwise(poly.tolist()) for poly in polys], np.float32)
+    '''
+    vectorized sort_aniclkwise around the mean of each polygon, the same (stable) ordering
+
+    :param polys: [N, K, 2]
+    :return: [N, K, 2]
+    '''
+    polys = np.array(polys, np.float64)
+    x1 = polys[..., 0] - np.mean(polys[..., 0], axis=1, keepdims=True)
+    y1 = polys[..., 1] - np.mean(polys[..., 1], axis=1, keepdims=True)
+    t = np.arctan2(y1, x1) * 180 / math.pi
+    t = np.where(y1 < 0, t + 360, t)
+    order = np.argsort(t, axis=1, kind='stable')
+    return np.array(np.take_along_axis(polys, order[..., None], axis=1), np.float32)
 
 
 def draw(pts):
@@ -61,23 +75,75 @@ def draw(pts):
     plt.plot(xs, ys)
 
 
-def concave_hull(points, point_num, alpha=0.95):
+def concave_hull_points(points, alpha=0.95):
+    '''
+    :return: [K, 2] points of the concave hull, not resampled
+    '''
     points = np.array(points)
     alpha *= alphashape.optimizealpha(points)
     hull = alphashape.alphashape(points, alpha)
     hull_pts = hull.exterior.coords.xy
     hull_pts = np.array(hull_pts)
     hull_pts = np.concatenate([np.reshape(hull_pts[0][:-1], [-1, 1]), np.reshape(hull_pts[1][:-1], [-1, 1])], axis=1)
-    hull_pts = np.reshape(hull_pts, [-1, 2])
+    return np.reshape(hull_pts, [-1, 2])
+
+
+def concave_hull(points, point_num, alpha=0.95):
+    hull_pts = concave_hull_points(points, alpha)
     hull_pts = points_sampling(hull_pts, point_num)
     return hull_pts
 
 
-def concave_hull_batch(polys, point_num, alpha):
-    return np.array([concave_hull(poly, point_num, alpha) for poly in polys], np.float32)
+class HullCache(object):
+    '''
+    Concave hulls keyed by the polygon and alpha, optimizealpha is a search over alpha shapes and
+    dominates the conversion of a dataset, so every hull is computed once and kept in a npz file.
+    The hulls are stored before resampling, changing the number of points does not invalidate them.
+    '''
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hulls = {}
+        self.dirty = False
+        if path is not None and os.path.exists(path):
+            with np.load(path) as f:
+                self.hulls = {k: f[k] for k in f.files}
+
+    @staticmethod
+    def key(points, alpha):
+        points = np.ascontiguousarray(points, np.float64)
+        return hashlib.sha1(points.tobytes() + str(alpha).encode()).hexdigest()
+
+    def get(self, points, alpha):
+        k = self.key(points, alpha)
+        if k not in self.hulls:
+            self.hulls[k] = concave_hull_points(points, alpha)
+            self.dirty = True
+        return self.hulls[k]
+
+    def save(self):
+        if self.path is not None and self.dirty:
+            np.savez(self.path, **self.hulls)
+            self.dirty = False
+
+
+def concave_hull_batch(polys, point_num, alpha, cache=None):
+    '''
+    :param cache: HullCache, None to compute all hulls
+    :return: [N, point_num, 2]
+    '''
+    if len(polys) == 0:
+        return np.zeros([0, point_num, 2], np.float32)
+    hulls = [cache.get(poly, alpha) if cache is not None else concave_hull_points(poly, alpha) for poly in polys]
+    padded, pnums = pad_polygons(hulls)
+    return np.array(points_sampling_batch(padded, pnums, point_num), np.float32)
 
 
 if __name__ == '__main__':
+    polys = np.random.uniform(0, 500, [1000, 12, 2]).astype(np.float32)
+    print('sort_aniclkwise_batch identical to the loop:',
+          np.array_equal(sort_aniclkwise_batch(polys), np.array([sort_aniclkwise(p.tolist()) for p in polys])))
+
     pts = [[1, 1], [0, 2], [2, 1], [2, 2], [2, 0], [0, 1], [1, 0], [0, 0]]
     points = np.array([(17, 158), (15, 135), (38, 183), (43, 19), (93, 88), (96, 140), (149, 163), (128, 248), (216, 265),
               (248, 210), (223, 167), (256, 151), (331, 214), (340, 187), (316, 53), (298, 35), (182, 0), (121, 42)])
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+import os
+import time
+from collections import deque, defaultdict
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.python.client import timeline
+from tensorflow.python.ops import script_ops
+
+from alpharotate.utils.tools import makedirs
+
+DATA_WAIT_OPS = ('QueueDequeueV2', 'QueueDequeueManyV2', 'QueueDequeueUpToV2', 'IteratorGetNext')
+PY_FUNC_OPS = ('PyFunc', 'PyFuncStateless', 'EagerPyFunc')
+
+
+def py_func_names(graph):
+    '''
+    node name of every tf.py_func --> name of the python function behind it,
+    e.g. 'sample_anchors_minibatch/PyFunc' --> 'anchor_target_layer'
+    '''
+    names = {}
+    funcs = getattr(getattr(script_ops, '_py_funcs', None), '_funcs', {})
+    for op in graph.get_operations():
+        if op.type not in PY_FUNC_OPS:
+            continue
+        func = None
+        try:
+            func = funcs.get(op.get_attr('token').decode('utf-8'))
+        except (ValueError, AttributeError):
+            pass
+        names[op.name] = getattr(func, '__name__', op.name)
+    return names
+
+
+class StepProfiler(object):
+    '''
+    Opt-in per-step timeline of the training step: time waiting for the input queue,
+    each tf.py_func, forward and backward compute (and GPU kernels when the device tracer is available).
+    Keeps a rolling window of steps for a summary table and dumps chrome traces (chrome://tracing).
+    '''
+
+    def __init__(self, graph, save_dir, window=100, trace_inte=1000):
+        self.save_dir = save_dir
+        self.trace_inte = trace_inte
+        self.steps = deque(maxlen=window)
+        self.py_func_names = py_func_names(graph)
+        self.run_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
+        makedirs(save_dir)
+
+    def category(self, node_name, op_type):
+        if op_type in DATA_WAIT_OPS:
+            return 'data_wait'
+        if op_type in PY_FUNC_OPS:
+            return 'py_func/' + self.py_func_names.get(node_name, node_name)
+        if node_name.startswith('gradients') or '/gradients' in node_name:
+            return 'backward'
+        return 'forward'
+
+    def record(self, step_stats, wall_time):
+        step = defaultdict(float)
+        step['wall'] = wall_time * 1000.
+        for dev_stats in step_stats.dev_stats:
+            is_stream = '/stream:' in dev_stats.device or '/memcpy' in dev_stats.device
+            if is_stream and not dev_stats.device.endswith('/stream:all'):
+                continue
+            for node_stats in dev_stats.node_stats:
+                duration = node_stats.all_end_rel_micros / 1000.
+                if is_stream:
+                    step['gpu_kernels'] += duration
+                    continue
+                label = node_stats.timeline_label
+                op_type = label.split(' = ')[1].split('(')[0] if ' = ' in label else node_stats.node_name
+                step[self.category(node_stats.node_name, op_type)] += duration
+        self.steps.append(step)
+
+    def run(self, sess, fetches, step):
+        run_metadata = tf.RunMetadata()
+        start = time.time()
+        outputs = sess.run(fetches, options=self.run_options, run_metadata=run_metadata)
+        self.record(run_metadata.step_stats, time.time() - start)
+
+        if step % self.trace_inte == 0:
+            trace = timeline.Timeline(run_metadata.step_stats).generate_chrome_trace_format()
+            with open(os.path.join(self.save_dir, 'timeline_step_%d.json' % step), 'w') as fw:
+                fw.write(trace)
+        return outputs
+
+    def summary(self):
+        '''
+        op times are summed per category, ops run in parallel, so a category can exceed the wall time
+        '''
+        if len(self.steps) == 0:
+            return ''
+        keys = sorted(set([k for s in self.steps for k in s.keys()]),
+                      key=lambda k: (k != 'wall', -np.mean([s.get(k, 0.) for s in self.steps])))
+        wall = np.mean([s['wall'] for s in self.steps])
+        lines = ['%-48s %10s %10s %8s' % ('profile of last %d steps' % len(self.steps), 'mean(ms)', 'max(ms)', '%wall')]
+        for k in keys:
+            values = [s.get(k, 0.) for s in self.steps]
+            lines.append('%-48s %10.2f %10.2f %8.1f' % (k, np.mean(values), np.max(values),
+                                                        100. * np.mean(values) / max(wall, 1e-6)))
+        return '\n'.join(lines)
+
+
+class InferenceStageProfiler(StepProfiler):
+    '''
+    Op times of an inference run split into backbone + head, box decoding and nms
+    (the postprocess scopes of the detectors and the nms_rotate scope).
+    '''
+
+    STAGES = ('backbone_head', 'decode', 'nms')
+
+    def category(self, node_name, op_type):
+        name = node_name.lower()
+        if 'nms' in name or 'non_max_suppression' in name or op_type.startswith('NonMaxSuppression'):
+            return 'nms'
+        if 'postprocess' in name:
+            return 'decode'
+        return 'backbone_head'
+
+    def stage_fractions(self):
+        '''
+        :return: dict, stage --> fraction of the op time of the stages, ops run in parallel so only the
+                 shares are meaningful, scale them by a measured latency
+        '''
+        times = np.array([np.mean([s.get(k, 0.) for s in self.steps]) if len(self.steps) else 0.
+                          for k in self.STAGES])
+        return dict(zip(self.STAGES, (times / max(times.sum(), 1e-6)).tolist()))
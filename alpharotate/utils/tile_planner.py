@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+Window = namedtuple('Window', ['h_len', 'w_len', 'h_overlap', 'w_overlap'])
+
+
+def sliding_windows(img_h, img_w, window):
+    '''
+    top-left corners of the windows, the last row / column is aligned to the image border
+    '''
+    hs = [img_h - window.h_len if img_h - hh - 1 < window.h_len else hh
+          for hh in range(0, img_h, window.h_len - window.h_overlap)]
+    ws = [img_w - window.w_len if img_w - ww - 1 < window.w_len else ww
+          for ww in range(0, img_w, window.w_len - window.w_overlap)]
+    # the last ones can be repeated when the image is not much larger than the window
+    hs, ws = sorted(set(hs), key=hs.index), sorted(set(ws), key=ws.index)
+    return [(hh, ww) for hh in hs for ww in ws]
+
+
+class TilePlanner(object):
+    '''
+    Sliding windows of a large image without the windows that have no content (zero padding, uniform no-data
+    border of a scene). A window is scored by the std of its gray values on a downsampled copy of the image,
+    with integral images every window costs O(1). min_std <= 0 keeps all windows.
+    Windows can also be restricted to regions of interest (coarse-to-fine inference).
+    '''
+
+    def __init__(self, min_std=1., downsample=8):
+        self.min_std = min_std
+        self.downsample = downsample
+        self.num_tiles = 0
+        self.num_skipped = 0
+
+    def tile_std(self, img, window, tiles):
+        '''
+        :param img: [H, W, 3]
+        :param tiles: list of (hh, ww)
+        :return: [len(tiles), ] std of the gray values of each window
+        '''
+        img_h, img_w = img.shape[0], img.shape[1]
+        small_h, small_w = max(img_h // self.downsample, 1), max(img_w // self.downsample, 1)
+        small = cv2.resize(img, (small_w, small_h), interpolation=cv2.INTER_AREA)
+        gray = np.mean(np.reshape(np.array(small, np.float32), [small_h, small_w, -1]), axis=2)
+        sums, sq_sums = cv2.integral2(gray, sdepth=cv2.CV_64F)
+
+        tiles = np.reshape(np.array(tiles, np.int64), [-1, 2])
+        y0 = np.minimum(tiles[:, 0] * small_h // img_h, small_h - 1)
+        x0 = np.minimum(tiles[:, 1] * small_w // img_w, small_w - 1)
+        y1 = np.maximum((tiles[:, 0] + window.h_len) * small_h // img_h, y0 + 1)
+        x1 = np.maximum((tiles[:, 1] + window.w_len) * small_w // img_w, x0 + 1)
+
+        def box_sum(s):
+            return s[y1, x1] - s[y0, x1] - s[y1, x0] + s[y0, x0]
+
+        num = (y1 - y0) * (x1 - x0)
+        mean = box_sum(sums) / num
+        return np.sqrt(np.maximum(box_sum(sq_sums) / num - mean ** 2, 0))
+
+    def plan(self, img, window, regions=None):
+        '''
+        :param img: [H, W, 3], at least as large as the window
+        :param window: Window
+        :param regions: [R, 4] (x_min, y_min, x_max, y_max), only the windows overlapping one of them are kept,
+                        e.g. around the detections of a coarse pass, None for the whole image
+        :return: list of (hh, ww) to run the detector on
+        '''
+        tiles = sliding_windows(img.shape[0], img.shape[1], window)
+        self.num_tiles += len(tiles)
+        keep = np.ones([len(tiles)], np.bool_)
+        if regions is not None:
+            keep &= self.overlap_regions(window, tiles, regions)
+        if self.min_std > 0 and keep.any():
+            keep &= self.tile_std(img, window, tiles) >= self.min_std
+        self.num_skipped += int(len(tiles) - keep.sum())
+        return [t for t, k in zip(tiles, keep) if k]
+
+    @staticmethod
+    def overlap_regions(window, tiles, regions):
+        '''
+        :return: [len(tiles), ] bool, whether a window overlaps one of the regions
+        '''
+        tiles = np.reshape(np.array(tiles, np.float32), [-1, 1, 2])
+        regions = np.reshape(np.array(regions, np.float32), [1, -1, 4])
+        overlap = (tiles[..., 1] < regions[..., 2]) & (tiles[..., 1] + window.w_len > regions[..., 0]) & \
+                  (tiles[..., 0] < regions[..., 3]) & (tiles[..., 0] + window.h_len > regions[..., 1])
+        return np.any(overlap, axis=1)
+
+    def report(self):
+        return 'skipped %d / %d tiles (%.1f%%)' % (
+            self.num_skipped, self.num_tiles, 100. * self.num_skipped / max(self.num_tiles, 1))
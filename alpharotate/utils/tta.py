@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, absolute_import
+
+import time
+from collections import namedtuple, OrderedDict
+
+import cv2
+import numpy as np
+
+from alpharotate.libs.utils import nms_rotate
+from alpharotate.libs.utils.rotate_polygon_nms import rotate_gpu_nms
+from alpharotate.libs.utils.coordinate_convert import backward_convert, rbox2quad
+from alpharotate.libs.utils.polygon_overlaps import polygon_intersection_matrix
+from alpharotate.utils.tile_planner import Window, sliding_windows
+
+TTAView = namedtuple('TTAView', ['window', 'short_side', 'flip'])  # flip: None, 'h' or 'v'
+
+
+def build_views(windows, short_sides, flips=(None,)):
+    '''
+    every combination of window, short side and flip, in this order of priority
+    '''
+    return [TTAView(w, s, f) for w in windows for s in short_sides for f in flips]
+
+
+def rotate_nms(rboxes, scores, iou_threshold, cpu_nms=False):
+    '''
+    :return: kept indices
+    '''
+    if cpu_nms:
+        try:
+            return nms_rotate.nms_rotate_cpu(boxes=np.array(rboxes), scores=np.array(scores),
+                                             iou_threshold=iou_threshold, max_output_size=5000)
+        except:
+            pass
+    tmp = np.concatenate([np.reshape(rboxes, [-1, 5]), np.reshape(scores, [-1, 1])], axis=1)
+    # Note: the IoU of two same rectangles is 0
+    jitter = np.zeros_like(tmp)
+    jitter[:, 0] += np.random.rand(tmp.shape[0], ) / 1000
+    return rotate_gpu_nms(np.array(tmp, np.float32) + np.array(jitter, np.float32), float(iou_threshold), 0)
+
+
+def weighted_box_fusion(quads, rboxes, scores, keep, iou_threshold, num_views=1, chunk_size=1024):
+    '''
+    rotated weighted box fusion in one pass over the nms result, every box joins the best kept box
+    it overlaps (IoU > iou_threshold), and each cluster is the score weighted mean of its (x, y, w, h, theta).
+    theta of a member is aligned to the one of the kept box first ((w, h, theta) == (h, w, theta + 90)).
+
+    :param quads: [N, 8]
+    :param rboxes: [N, 5], opencv definition
+    :param scores: [N, ]
+    :param keep: indices kept by the nms
+    :param num_views: number of TTA views, a cluster found by fewer views gets a lower score
+    :return: fused quads [K, 8], scores [K, ]
+    '''
+    keep = np.array(keep, np.int64)
+    keep = keep[np.argsort(-scores[keep], kind='stable')]
+    num = quads.shape[0]
+
+    assign = np.full([num], -1, np.int64)
+    for start in range(0, num, chunk_size):
+        inter, area1, area2 = polygon_intersection_matrix(quads[start:start + chunk_size], quads[keep])
+        union = area1[:, None] + area2[None, :] - inter
+        match = inter > iou_threshold * np.maximum(union, 1e-6)
+        # the first match is the kept box with the highest score
+        assign[start:start + chunk_size] = np.where(match.any(axis=1), np.argmax(match, axis=1), -1)
+    assign[keep] = np.arange(keep.shape[0])
+
+    valid = assign >= 0
+    assign, members, weights = assign[valid], rboxes[valid], scores[valid]
+    leaders = rboxes[keep][assign]
+
+    # align theta of the members to their kept box
+    d1 = (members[:, 4] - leaders[:, 4] + 90) % 180 - 90
+    d2 = (members[:, 4] + 90 - leaders[:, 4] + 90) % 180 - 90
+    swap = np.abs(d2) < np.abs(d1)
+    w = np.where(swap, members[:, 3], members[:, 2])
+    h = np.where(swap, members[:, 2], members[:, 3])
+    d = np.where(swap, d2, d1)
+
+    num_keep = keep.shape[0]
+    weight_sum = np.bincount(assign, weights, num_keep)
+    count = np.bincount(assign, minlength=num_keep)
+    fused = np.stack([np.bincount(assign, weights * v, num_keep) / weight_sum
+                      for v in [members[:, 0], members[:, 1], w, h, d]], axis=1)
+    fused[:, 4] += rboxes[keep][:, 4]
+    fused_scores = weight_sum / count * np.minimum(count, num_views) / num_views
+    return rbox2quad(fused), fused_scores
+
+
+def fuse_detections(quads, scores, labels, iou_thresholds, method='nms', num_views=1, cpu_nms=False):
+    '''
+    per class fusion of all detections of an image
+
+    :param quads: [N, 8]
+    :param iou_thresholds: dict, label --> iou threshold
+    :param method: 'nms' or 'wbf'
+    :return: quads [K, 8], scores [K, ], labels [K, ]
+    '''
+    res_quads, res_scores, res_labels = [], [], []
+    for label in np.unique(labels):
+        index = np.where(labels == label)[0]
+        tmp_quads, tmp_scores = quads[index], scores[index]
+        tmp_rboxes = np.reshape(np.array(backward_convert(tmp_quads, False), np.float32), [-1, 5])
+        inx = rotate_nms(tmp_rboxes, tmp_scores, iou_thresholds[label], cpu_nms)
+        if method == 'wbf':
+            tmp_quads, tmp_scores = weighted_box_fusion(tmp_quads, tmp_rboxes, tmp_scores, inx,
+                                                        iou_thresholds[label], num_views)
+        elif method == 'nms':
+            tmp_quads, tmp_scores = tmp_quads[inx], tmp_scores[inx]
+        else:
+            raise ValueError('unknown fusion method: {}'.format(method))
+        res_quads.append(tmp_quads)
+        res_scores.append(tmp_scores)
+        res_labels.append(np.full([len(tmp_scores)], label, labels.dtype))
+    if len(res_scores) == 0:
+        return np.zeros([0, 8], np.float32), np.zeros([0], np.float32), np.zeros([0], np.int32)
+    return np.concatenate(res_quads), np.concatenate(res_scores), np.concatenate(res_labels)
+
+
+def window_nms(quads, scores, labels, windows, iou_threshold, score_threshold, max_per_class, cpu_nms=False):
+    '''
+    the score filter and per-class nms the detector runs on every window, applied offline to detections
+    of a detector built without them (test_dota_base.py --raw_cache_mode pre_nms)
+
+    :param quads: [N, 8]
+    :param windows: [N, ], index of the network run (window, scale, flip) that gave each detection
+    :param iou_threshold: None skips the nms (cfgs.NMS = False)
+    :param max_per_class: max_output_size of the in-graph nms
+    :return: quads [K, 8], scores [K, ], labels [K, ]
+    '''
+    keep = scores > score_threshold
+    quads, scores, labels, windows = quads[keep], scores[keep], labels[keep], windows[keep]
+    if iou_threshold is None:
+        return quads, scores, labels
+
+    res_quads, res_scores, res_labels = [], [], []
+    for window in np.unique(windows):
+        index = np.where(windows == window)[0]
+        for label in np.unique(labels[index]):
+            tmp_index = index[labels[index] == label]
+            tmp_rboxes = np.reshape(np.array(backward_convert(quads[tmp_index], False), np.float32), [-1, 5])
+            inx = np.array(rotate_nms(tmp_rboxes, scores[tmp_index], iou_threshold, cpu_nms), np.int64)
+            # kept in descending score order, as the in-graph nms
+            inx = inx[np.argsort(-scores[tmp_index][inx], kind='stable')][:max_per_class]
+            res_quads.append(quads[tmp_index][inx])
+            res_scores.append(scores[tmp_index][inx])
+            res_labels.append(labels[tmp_index][inx])
+    if len(res_scores) == 0:
+        return np.zeros([0, 8], np.float32), np.zeros([0], np.float32), np.zeros([0], np.int32)
+    return np.concatenate(res_quads), np.concatenate(res_scores), np.concatenate(res_labels)
+
+
+class TTAEngine(object):
+    '''
+    Test time augmentation over the sliding windows of a large image.
+    Views sharing window and short side are a group, a tile of the group is resized once and flipped
+    with numpy views for the other views of the group. Detections are mapped back to the image vectorized.
+    Every view is still its own sess.run (N views are N forward passes), the views are not batched.
+    The groups are run in order and once `time_budget` seconds are spent on an image the rest is skipped,
+    so the first views should be the most important ones.
+    '''
+
+    def __init__(self, views, detect_fn, max_length, time_budget=None, planner=None):
+        '''
+        :param views: list of TTAView
+        :param detect_fn: RGB image [h, w, 3] --> boxes [N, 5], scores [N, ], labels [N, ]
+        :param max_length: IMG_MAX_LENGTH
+        :param time_budget: seconds per image, None for no limit
+        :param planner: TilePlanner to skip the windows without content, None for all windows
+        '''
+        self.detect_fn = detect_fn
+        self.max_length = max_length
+        self.time_budget = time_budget
+        self.planner = planner
+        self.groups = OrderedDict()
+        for view in views:
+            self.groups.setdefault((view.window, view.short_side), []).append(view.flip)
+
+    def resize_shape(self, window, short_side):
+        if window.h_len < window.w_len:
+            return short_side, min(int(short_side * float(window.w_len) / window.h_len), self.max_length)
+        return min(int(short_side * float(window.h_len) / window.w_len), self.max_length), short_side
+
+    def invert(self, boxes, flip, src_shape, resized_shape, offset):
+        quads = rbox2quad(boxes)
+        quads[:, 0::2] *= src_shape[1] / resized_shape[1]
+        quads[:, 1::2] *= src_shape[0] / resized_shape[0]
+        if flip == 'h':
+            quads[:, 0::2] = src_shape[1] - quads[:, 0::2]
+        elif flip == 'v':
+            quads[:, 1::2] = src_shape[0] - quads[:, 1::2]
+        quads[:, 0::2] += offset[1]
+        quads[:, 1::2] += offset[0]
+        return quads
+
+    def run(self, img):
+        '''
+        :param img: BGR image [H, W, 3]
+        :return: quads [N, 8], scores [N, ], labels [N, ], number of views that were run
+        '''
+        start = time.time()
+        quads, scores, labels = [], [], []
+        num_views = 0
+        for (window, short_side), flips in self.groups.items():
+            if num_views > 0 and self.time_budget is not None and time.time() - start > self.time_budget:
+                break
+            pad_h, pad_w = max(window.h_len - img.shape[0], 0), max(window.w_len - img.shape[1], 0)
+            pad_img = np.pad(img, [[0, pad_h], [0, pad_w], [0, 0]], 'constant') if pad_h + pad_w > 0 else img
+            new_h, new_w = self.resize_shape(window, short_side)
+
+            if self.planner is not None:
+                tiles = self.planner.plan(pad_img, window)
+            else:
+                tiles = sliding_windows(pad_img.shape[0], pad_img.shape[1], window)
+            for hh_, ww_ in tiles:
+                src_img = pad_img[hh_:(hh_ + window.h_len), ww_:(ww_ + window.w_len), :]
+                # BGR --> RGB
+                img_resize = cv2.resize(src_img, (new_w, new_h))[:, :, ::-1]
+                for flip in flips:
+                    view_img = {None: img_resize, 'h': img_resize[:, ::-1], 'v': img_resize[::-1]}[flip]
+                    boxes, view_scores, view_labels = self.detect_fn(view_img)
+                    if len(boxes) == 0:
+                        continue
+                    quads.append(self.invert(boxes, flip, src_img.shape, img_resize.shape, (hh_, ww_)))
+                    scores.append(np.reshape(view_scores, [-1]))
+                    labels.append(np.reshape(view_labels, [-1]))
+            num_views += len(flips)
+
+        if len(quads) == 0:
+            return np.zeros([0, 8], np.float32), np.zeros([0], np.float32), np.zeros([0], np.int32), num_views
+        return np.concatenate(quads), np.concatenate(scores), np.concatenate(labels), num_views
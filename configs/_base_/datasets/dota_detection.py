@@ -11,6 +11,9 @@ IMG_MAX_LENGTH = 800
 
 # data augmentation
 IMG_ROTATE = False
+IMG_ROTATE_PROB = 0.6
+IMG_ROTATE_ANGLES = list(range(-90, 91, 15))  # SKU110K-R: [-45, -30, -15, 15, 30, 45] with IMG_ROTATE_PROB = 6 / 7
+IMG_ROTATE_FIT_OUTPUT = True  # expand the canvas to hold the whole rotated image
 RGB2GRAY = False
 VERTICAL_FLIP = False
 HORIZONTAL_FLIP = True
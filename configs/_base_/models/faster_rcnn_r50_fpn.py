@@ -14,6 +14,9 @@ RESTORE_FROM_RPN = False
 IS_FILTER_OUTSIDE_BOXES = False
 FREEZE_BLOCKS = [True, True, False, False, False]  # for gluoncv backbone
 FIXED_BLOCKS = 0  # allow 0~3
+# grouped convs of the pytorch resnext: 'split', 'native' (tf >= 1.14, gpu) or 'depthwise'
+# ('depthwise' is one op instead of one per group but needs more memory, benchmark it with resnet_pytorch.py)
+GROUP_CONV = 'split'
 
 # neck
 FPN_MODE = 'fpn'
@@ -67,7 +70,6 @@ RPN_TOP_K_NMS_TEST = 6000
 RPN_MAXIMUM_PROPOSAL_TEST = 1000
 
 # roi sample
-CUDA8 = False  # assign level
 FAST_RCNN_IOU_POSITIVE_THRESHOLD = 0.5
 FAST_RCNN_IOU_NEGATIVE_THRESHOLD = 0.0   # 0.0 < IOU < 0.5 is negative
 FAST_RCNN_MINIBATCH_SIZE = 512
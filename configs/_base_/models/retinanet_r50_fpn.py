@@ -13,6 +13,9 @@ SUMMARY_PATH = os.path.join(ROOT_PATH, 'output/summary')
 NET_NAME = 'resnet50_v1d'
 RESTORE_FROM_RPN = False
 FIXED_BLOCKS = 1  # allow 0~3
+# grouped convs of the pytorch resnext: 'split', 'native' (tf >= 1.14, gpu) or 'depthwise'
+# ('depthwise' is one op instead of one per group but needs more memory, benchmark it with resnet_pytorch.py)
+GROUP_CONV = 'split'
 FREEZE_BLOCKS = [True, False, False, False, False]  # for gluoncv backbone
 
 # neck
@@ -47,10 +50,14 @@ REG_WEIGHT = 1.0
 # sample
 IOU_POSITIVE_THRESHOLD = 0.5
 IOU_NEGATIVE_THRESHOLD = 0.4
+SAMPLE_OVERLAP_METRIC = 'iou'  # 'iou', or the gaussian similarity 'gwd' / 'kld' (no polygon clipping, runs on cpu)
+SAMPLE_SPARSE_OVERLAPS = False  # rotated iou only for the anchor-gt pairs that can pass the thresholds (cpu, no [N, M] matrix)
 
 # post-processing
 NMS = True
 NMS_IOU_THRESHOLD = 0.3
+NMS_OVERLAP_METRIC = 'iou'  # 'iou', 'gwd' or 'kld', the thresholds above apply to the chosen metric
+ROTATE_NMS_USE_GPU = True  # False runs the rotated nms of the iou metric on CPU (py_func)
 MAXIMUM_DETECTIONS = 100
 FILTERED_SCORE = 0.05
 VIS_SCORE = 0.4
@@ -8,6 +8,9 @@ GPU_GROUP = "0,1,2,3"
 SHOW_TRAIN_INFO_INTE = 20
 SMRY_ITER = 1000
 ADD_BOX_IN_TENSORBOARD = True
+PROFILE_TRAIN = False  # trace every step: data wait, each py_func, forward/backward compute
+PROFILE_WINDOW = 100  # steps in the rolling summary, printed every SHOW_TRAIN_INFO_INTE
+PROFILE_TRACE_INTE = 1000  # dump a chrome trace every n steps
 
 # learning policy
 BATCH_SIZE = 1
@@ -21,6 +21,8 @@ tf.app.flags.DEFINE_string('save_name', 'train', 'save name')
 tf.app.flags.DEFINE_string('save_dir', '../../tfrecord/', 'save name')
 tf.app.flags.DEFINE_string('img_format', '.jpg', 'format of image')
 tf.app.flags.DEFINE_string('dataset', 'SKU110K-R', 'dataset')
+tf.app.flags.DEFINE_boolean('offline_rotated', False, 'keep the rotate_aug_* images of rotate_augment.py, '
+                                                      'otherwise use IMG_ROTATE (IMG_ROTATE_ANGLES) when training')
 FLAGS = tf.app.flags.FLAGS
 
 
@@ -79,6 +81,8 @@ def convert_pascal_to_tfrecord():
         # print(image_id-1)  # 57533
         if image_id > len(images):
             continue
+        if not FLAGS.offline_rotated and images[image_id - 1]['file_name'].startswith('rotate_aug_'):
+            continue
         if images[image_id - 1]['file_name'] in all_gt_label.keys():
             # all_gt_label[images[image_id - 1]['file_name']]['gtboxes'].append(annotation['segmentation'])
             all_gt_label[images[image_id - 1]['file_name']]['gtboxes'].append(coordinate_convert_r(annotation['rbbox']))
@@ -1,4 +1,8 @@
 # -*- coding:utf-8 -*-
+# Offline rotation of SKU110K (7x images and tfrecord size), only needed to rebuild the original SKU110K-R.
+# The same augmentation runs in the reader with
+#     IMG_ROTATE = True, IMG_ROTATE_ANGLES = [-45, -30, -15, 15, 30, 45], IMG_ROTATE_PROB = 6 / 7
+# see dataloader/dataset/reader_throughput.py for the comparison.
 import os
 import sys
 
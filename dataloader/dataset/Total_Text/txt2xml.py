@@ -11,7 +11,7 @@ import sys
 sys.path.append('../../..')
 
 
-from alpharotate.libs.utils.mask_sample import points_sampling
+from alpharotate.libs.utils.mask_sample import mask_sampling
 
 
 def make_xml(filename, path, box_list, labels, w, h, d):
@@ -91,32 +91,51 @@ def make_xml(filename, path, box_list, labels, w, h, d):
     fp.close()
 
 
-def load_annoataion(txt_path):
-    boxes, labels = [], []
+def load_annoataion(txt_path, point_num=12, alpha=None, hull_cache=None):
+    '''
+    the polygons are resampled to point_num points here, once, so that the xml / tfrecord
+    already holds the targets of the arbitrary-shape detectors
+
+    :param alpha: concave hull of every polygon before resampling, None to resample the polygon as it is
+    :param hull_cache: HullCache
+    '''
+    polys, labels = [], []
     fr = codecs.open(txt_path, 'r', 'utf-8')
     lines = fr.readlines()
 
     for line in lines:
         b = line.split(',')[:-1]
         line = np.array(list(map(int, b)))
+        polys.append(line.reshape([-1, 2]))
+        labels.append('text')
 
-        line = points_sampling(line.reshape([-1, 2]), 12)
+    if len(polys) == 0:
+        return np.zeros([0, point_num * 2], np.float32), np.array(labels)
 
-        boxes.append(line.reshape([-1, ]))
-        labels.append('text')
+    if alpha is not None:
+        from alpharotate.utils.sort_polygon import concave_hull_batch
+        boxes = concave_hull_batch(polys, point_num, alpha, hull_cache)
+    else:
+        boxes = mask_sampling(polys, point_num)
 
-    return np.array(boxes), np.array(labels)
+    return np.reshape(boxes, [len(polys), point_num * 2]), np.array(labels)
 
 
 if __name__ == "__main__":
     txt_path = '/mnt/nas/home/yangxue/dataset/Total_Text/labels/train_gts'
     xml_path = '/mnt/nas/home/yangxue/dataset/Total_Text/xmls/train'
     img_path = '/mnt/nas/home/yangxue/dataset/Total_Text/Images/Train'
+    point_num = 12
+    alpha = None  # e.g. 0.95 for the concave hulls
+    hull_cache = None
+    if alpha is not None:
+        from alpharotate.utils.sort_polygon import HullCache
+        hull_cache = HullCache(os.path.join(xml_path, 'hulls.npz'))
     print(os.path.exists(txt_path))
     imgs = os.listdir(img_path)
     for count, i in enumerate(imgs):
         t = os.path.join(txt_path, i+'.txt')
-        boxes, labels = load_annoataion(t)
+        boxes, labels = load_annoataion(t, point_num, alpha, hull_cache)
         x = i.split('.')[0] + '.xml'
 
         img = cv2.imread(os.path.join(img_path, i))
@@ -134,3 +153,6 @@ if __name__ == "__main__":
 
         if count % 1000 == 0:
             print(count)
+
+    if hull_cache is not None:
+        hull_cache.save()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Statistics of the gt of the training tfrecords and the anchor configurations with the fewest anchors per
+# location that keep the gt recall of the current ANCHOR_SCALES / ANCHOR_RATIOS / ANCHOR_ANGLES.
+# The tfrecords are scanned once into a histogram index (--index), later runs only load it.
+#
+#   python anchor_statistics.py --dataset DOTA --index ../../dataloader/tfrecord/DOTA_gt_index.npz
+#   python anchor_statistics.py --index ../../dataloader/tfrecord/DOTA_gt_index.npz --tolerance 0.01
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.append('../../')
+
+from alpharotate.utils.anchor_optimizer import GTIndex, AnchorSearch, candidate_sets
+from dataloader.dataset.read_tfrecord import tfrecord_pattern
+
+
+def scan_tfrecords(cfgs, dataset_name, index):
+    '''
+    add the gt of every example to the index, at every training short side
+    '''
+    files = glob.glob(tfrecord_pattern(dataset_name, is_training=True))
+    if len(files) == 0:
+        raise ValueError('no tfrecord matches {}'.format(tfrecord_pattern(dataset_name, is_training=True)))
+    shortside_lens = cfgs.IMG_SHORT_SIDE_LEN if isinstance(cfgs.IMG_SHORT_SIDE_LEN, list) \
+        else [cfgs.IMG_SHORT_SIDE_LEN]
+    example = tf.train.Example()
+    for f in files:
+        for record in tf.python_io.tf_record_iterator(f):
+            example.ParseFromString(record)
+            feature = example.features.feature
+            img_h = feature['img_height'].int64_list.value[0]
+            img_w = feature['img_width'].int64_list.value[0]
+            gtboxes_and_label = np.reshape(np.frombuffer(feature['gtboxes_and_label'].bytes_list.value[0],
+                                                         np.int32), [-1, 9])
+            for shortside_len in shortside_lens:
+                index.add(gtboxes_and_label[:, :8], img_h, img_w, shortside_len, cfgs.IMG_MAX_LENGTH)
+    return index
+
+
+def format_values(values):
+    return '[' + ', '.join(['%.4g' % v for v in values]) + ']'
+
+
+if __name__ == '__main__':
+    from configs import cfgs
+
+    parser = argparse.ArgumentParser('GT statistics and anchor configuration search')
+    parser.add_argument('--dataset', default=cfgs.DATASET_NAME, type=str)
+    parser.add_argument('--index', default='', type=str, help='npz of the gt index, built if it does not exist')
+    parser.add_argument('--method', default=cfgs.METHOD, type=str, help="'H' or 'R' anchors")
+    parser.add_argument('--num_offsets', default=2, type=int,
+                        help='gt centers on a num x num grid of the anchor cell')
+    parser.add_argument('--tolerance', default=0.005, type=float, help='recall that may be lost')
+    parser.add_argument('--min_recall', default=None, type=float,
+                        help='recall at IOU_POSITIVE_THRESHOLD to keep instead of the one of cfgs')
+    parser.add_argument('--top', default=10, type=int)
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.index and os.path.exists(args.index):
+        index = GTIndex.load(args.index)
+    else:
+        index = scan_tfrecords(cfgs, args.dataset, GTIndex())
+        if args.index:
+            index.save(args.index)
+    print(index.summary())
+    print('index: %.1fs' % (time.time() - start))
+
+    scale_sets, ratio_sets, angle_sets = candidate_sets()
+    current = (list(cfgs.ANCHOR_SCALES), list(cfgs.ANCHOR_RATIOS), list(cfgs.ANCHOR_ANGLES))
+    scale_sets.append(current[0])
+    ratio_sets.append(current[1])
+    angle_sets.append(current[2])
+    iou_thresholds = [cfgs.IOU_POSITIVE_THRESHOLD, cfgs.IOU_NEGATIVE_THRESHOLD]
+
+    start = time.time()
+    search = AnchorSearch(cfgs, index, args.method,
+                          sorted(set(sum(scale_sets, []))), sorted(set(sum(ratio_sets, []))),
+                          sorted(set(sum(angle_sets, []))), args.num_offsets,
+                          min(cfgs.IOU_POSITIVE_THRESHOLD, cfgs.IOU_NEGATIVE_THRESHOLD))
+    baseline = search.recall(*(current + (iou_thresholds, )))
+    results = search.search(scale_sets, ratio_sets, angle_sets, iou_thresholds)
+    print('search: %.1fs, %d configurations' % (time.time() - start, len(results)))
+
+    target = args.min_recall if args.min_recall is not None else baseline[0] - args.tolerance
+    kept = [r for r in results if r[1][0] >= target]
+    num_current = len(current[0]) * len(current[1]) * (len(current[2]) if args.method == 'R' else 1)
+
+    print('%8s %10s %10s  %s' % ('anchors', 'recall@%g' % iou_thresholds[0], 'recall@%g' % iou_thresholds[1],
+                                 'scales / ratios / angles'))
+    print('%8d %10.4f %10.4f  cfgs' % (num_current, baseline[0], baseline[1]))
+    for num, recall, scales, ratios, angles in kept[:args.top]:
+        print('%8d %10.4f %10.4f  %s / %s / %s' % (num, recall[0], recall[1], format_values(scales),
+                                                    format_values(ratios), format_values(angles)))
+
+    if len(kept) == 0:
+        print('no configuration reaches a recall of %.4f' % target)
+    else:
+        num, recall, scales, ratios, angles = kept[0]
+        print('\n# %d anchors per location instead of %d, recall %.4f (cfgs %.4f)'
+              % (num, num_current, recall[0], baseline[0]))
+        print('ANCHOR_SCALES = %s' % format_values(scales))
+        print('ANCHOR_RATIOS = %s' % format_values(ratios))
+        if args.method == 'R':
+            print('ANCHOR_ANGLES = %s' % format_values(angles))
@@ -8,7 +8,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import cv2
 import numpy as np
 import tensorflow as tf
 
@@ -147,93 +146,124 @@ class ImageAugmentation(object):
 
         return img_tensor, gtboxes_and_label
 
+    def contain_labels(self, gtboxes_and_label, label_names):
+        '''
+        :param gtboxes_and_label: [-1, 9]
+        :param label_names: class names
+        :return: tf.bool, whether the image has an object of these classes
+        '''
+        if len(label_names) == 0:
+            return tf.constant(False)
+        labels = tf.constant([self.name2label[name] for name in label_names], dtype=tf.int32)
+        return tf.reduce_any(tf.equal(tf.expand_dims(gtboxes_and_label[:, -1], axis=1),
+                                      tf.expand_dims(labels, axis=0)))
+
     def random_rgb2gray(self, img_tensor, gtboxes_and_label):
         '''
         :param img_tensor: tf.float32
         :return:
         '''
-        def rgb2gray(img, gtboxes_and_label):
-
-            label = gtboxes_and_label[:, -1]
-
-            if self.cfgs.DATASET_NAME.startswith('DOTA'):
-                if self.name2label['swimming-pool'] in label:
-                    # do not change color, because swimming-pool need color
-                    return img
-
-            coin = np.random.rand()
-            if coin < 0.3:
-                img = np.asarray(img, dtype=np.float32)
-                r, g, b = img[:, :, 0], img[:, :, 1], img[:, :, 2]
-                gray = r * 0.299 + g * 0.587 + b * 0.114
-                img = np.stack([gray, gray, gray], axis=2)
-                return img
-            else:
-                return img
-
-        h, w, c = tf.shape(img_tensor)[0], tf.shape(img_tensor)[1], tf.shape(img_tensor)[2]
-        img_tensor = tf.py_func(rgb2gray,
-                                inp=[img_tensor, gtboxes_and_label],
-                                Tout=tf.float32)
-        img_tensor = tf.reshape(img_tensor, shape=[h, w, c])
+        def rgb2gray():
+            gray = tf.reduce_sum(img_tensor * tf.constant([0.299, 0.587, 0.114]), axis=2, keepdims=True)
+            return tf.tile(gray, [1, 1, 3])
 
-        return img_tensor
+        if self.cfgs.DATASET_NAME.startswith('DOTA'):
+            # do not change color, because swimming-pool need color
+            skip = self.contain_labels(gtboxes_and_label, ['swimming-pool'])
+        else:
+            skip = tf.constant(False)
+
+        coin = tf.random_uniform(shape=[], minval=0, maxval=1)
+        img_tensor = tf.cond(tf.logical_and(tf.less(coin, 0.3), tf.logical_not(skip)),
+                             true_fn=rgb2gray,
+                             false_fn=lambda: img_tensor)
 
-    def rotate_img_np(self, img, gtboxes_and_label, r_theta):
+        return img_tensor
 
-        if self.cfgs.DATASET_NAME.startswith('DOTA') and (self.name2label['airport'] in gtboxes_and_label[:, -1] or self.name2label['storage-tank'] in gtboxes_and_label[:, -1] or self.name2label['roundabout'] in gtboxes_and_label[:, -1]):
-            return img, gtboxes_and_label
-        elif self.cfgs.DATASET_NAME.startswith('DIOR') and (self.name2label['chimney'] in gtboxes_and_label[:, -1] or self.name2label['windmill'] in gtboxes_and_label[:, -1] or self.name2label['storagetank'] in gtboxes_and_label[:, -1] or self.name2label['golffield'] in gtboxes_and_label[:, -1]):
-            return img, gtboxes_and_label
+    def rotate_img_around_center(self, img_tensor, gtboxes_and_label, r_theta, fit_output=True):
+        '''
+        rotate around the image center by r_theta degrees (counterclockwise), i.e. cv2.getRotationMatrix2D +
+        cv2.warpAffine, but with native TF ops
+
+        :param img_tensor: [h, w, c], tf.float32
+        :param gtboxes_and_label: [-1, 9], tf.int32
+        :param r_theta: degrees
+        :param fit_output: expand the canvas to hold the whole rotated image, otherwise keep [h, w] and drop the
+                           objects whose center is rotated out of the image
+        :return:
+        '''
+        h, w = tf.shape(img_tensor)[0], tf.shape(img_tensor)[1]
+        cx, cy = tf.cast(w // 2, tf.float64), tf.cast(h // 2, tf.float64)
+        angle = tf.cast(r_theta, tf.float64) * np.pi / 180.
+        cos, sin = tf.cos(angle), tf.sin(angle)
+
+        # M = [[cos, sin, tx], [-sin, cos, ty]]
+        tx = (1 - cos) * cx - sin * cy
+        ty = sin * cx + (1 - cos) * cy
+        if fit_output:
+            new_w = tf.cast(tf.cast(h, tf.float64) * tf.abs(sin) + tf.cast(w, tf.float64) * tf.abs(cos), tf.int32)
+            new_h = tf.cast(tf.cast(h, tf.float64) * tf.abs(cos) + tf.cast(w, tf.float64) * tf.abs(sin), tf.int32)
+            # move to the center of the new canvas
+            tx += tf.cast(new_w, tf.float64) / 2 - cx
+            ty += tf.cast(new_h, tf.float64) / 2 - cy
         else:
-            h, w, c = img.shape
-            center = (w // 2, h // 2)
-
-            M = cv2.getRotationMatrix2D(center, r_theta, 1.0)
-            cos, sin = np.abs(M[0, 0]), np.abs(M[0, 1])
-            nW, nH = int(h*sin + w*cos), int(h*cos + w*sin)  # new W and new H
-            M[0, 2] += (nW/2) - center[0]
-            M[1, 2] += (nH/2) - center[1]
-            rotated_img = cv2.warpAffine(img, M, (nW, nH))
-
-            new_points_list = []
-            obj_num = len(gtboxes_and_label)
-            for st in range(0, 7, 2):
-                points = gtboxes_and_label[:, st:st+2]
-                expand_points = np.concatenate((points, np.ones(shape=(obj_num, 1))), axis=1)
-                new_points = np.dot(M, expand_points.T)
-                new_points = new_points.T
-                new_points_list.append(new_points)
-            gtboxes = np.concatenate(new_points_list, axis=1)
-            gtboxes_and_label = np.concatenate((gtboxes, gtboxes_and_label[:, -1].reshape(-1, 1)), axis=1)
-            gtboxes_and_label = np.asarray(gtboxes_and_label, dtype=np.int32)
-
-            return rotated_img, gtboxes_and_label
+            new_w, new_h = w, h
+
+        # the projective transform maps output points to input points, so it is the inverse of M
+        zero = tf.zeros_like(cos)
+        transform = tf.stack([cos, -sin, sin * ty - cos * tx,
+                              sin, cos, -sin * tx - cos * ty,
+                              zero, zero])
+        rotated_img = tf.contrib.image.transform(img_tensor, tf.cast(transform, tf.float32),
+                                                 interpolation='BILINEAR',
+                                                 output_shape=tf.stack([new_h, new_w]))
+
+        points = tf.reshape(tf.cast(gtboxes_and_label[:, :-1], tf.float64), [-1, 4, 2])
+        x, y = points[:, :, 0], points[:, :, 1]
+        new_points = tf.stack([cos * x + sin * y + tx, -sin * x + cos * y + ty], axis=2)
+        rotated_gtboxes_and_label = tf.concat([tf.cast(tf.reshape(new_points, [-1, 8]), tf.int32),
+                                               gtboxes_and_label[:, -1:]], axis=1)
+
+        if fit_output:
+            return rotated_img, rotated_gtboxes_and_label
+
+        center = tf.reduce_mean(new_points, axis=1)
+        keep = tf.logical_and(tf.logical_and(center[:, 0] >= 0, center[:, 0] < tf.cast(w, tf.float64)),
+                              tf.logical_and(center[:, 1] >= 0, center[:, 1] < tf.cast(h, tf.float64)))
+        # an image without any object left is not rotated
+        return tf.cond(tf.reduce_any(keep),
+                       true_fn=lambda: (rotated_img, tf.boolean_mask(rotated_gtboxes_and_label, keep)),
+                       false_fn=lambda: (img_tensor, gtboxes_and_label))
 
     def rotate_img(self, img_tensor, gtboxes_and_label):
 
-        # thetas = tf.constant([-30, -60, -90, 30, 60, 90])
-        thetas = tf.range(-90, 90+16, delta=15)
-        # -90, -75, -60, -45, -30, -15,   0,  15,  30,  45,  60,  75,  90
+        # default: -90, -75, -60, -45, -30, -15,   0,  15,  30,  45,  60,  75,  90
+        thetas = tf.constant(self.cfgs.IMG_ROTATE_ANGLES, dtype=tf.float32)
+        theta = thetas[tf.random_uniform(shape=[], minval=0, maxval=tf.shape(thetas)[0], dtype=tf.int32)]
 
-        theta = tf.random_shuffle(thetas)[0]
+        if self.cfgs.DATASET_NAME.startswith('DOTA'):
+            skip = self.contain_labels(gtboxes_and_label, ['airport', 'storage-tank', 'roundabout'])
+        elif self.cfgs.DATASET_NAME.startswith('DIOR'):
+            skip = self.contain_labels(gtboxes_and_label, ['chimney', 'windmill', 'storagetank', 'golffield'])
+        else:
+            skip = tf.constant(False)
 
-        img_tensor, gtboxes_and_label = tf.py_func(self.rotate_img_np,
-                                                   inp=[img_tensor, gtboxes_and_label, theta],
-                                                   Tout=[tf.float32, tf.int32])
+        img_tensor, gtboxes_and_label = tf.cond(skip,
+                                                true_fn=lambda: (img_tensor, gtboxes_and_label),
+                                                false_fn=lambda: self.rotate_img_around_center(
+                                                    img_tensor, gtboxes_and_label, theta,
+                                                    fit_output=self.cfgs.IMG_ROTATE_FIT_OUTPUT))
 
-        h, w, c = tf.shape(img_tensor)[0], tf.shape(img_tensor)[1], tf.shape(img_tensor)[2]
-        img_tensor = tf.reshape(img_tensor, [h, w, c])
+        img_tensor.set_shape([None, None, 3])
         gtboxes_and_label = tf.reshape(gtboxes_and_label, [-1, 9])
 
         return img_tensor, gtboxes_and_label
 
     def random_rotate_img(self, img_tensor, gtboxes_and_label):
 
-        img_tensor, gtboxes_and_label = tf.cond(tf.less(tf.random_uniform(shape=[], minval=0, maxval=1), 0.6),
+        img_tensor, gtboxes_and_label = tf.cond(tf.less(tf.random_uniform(shape=[], minval=0, maxval=1),
+                                                        self.cfgs.IMG_ROTATE_PROB),
                                                 lambda: self.rotate_img(img_tensor, gtboxes_and_label),
                                                 lambda: (img_tensor, gtboxes_and_label))
 
         return img_tensor, gtboxes_and_label
-
-
@@ -19,6 +19,15 @@ from dataloader.dataset.image_augmentation import ImageAugmentation
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
 
 
+def tfrecord_pattern(dataset_name, is_training=True):
+    '''
+    :return: glob pattern of the tfrecords of the split, every MLT tfrecord is used for training
+    '''
+    if is_training:
+        return os.path.join('../../dataloader/tfrecord', dataset_name + ('_train*' if 'MLT' not in dataset_name else '_*'))
+    return os.path.join('../../dataloader/tfrecord', dataset_name + '_test*')
+
+
 class ReadTFRecord(object):
 
     def __init__(self, cfgs):
@@ -111,10 +120,7 @@ class ReadTFRecord(object):
         if dataset_name not in valid_dataset:
             raise ValueError('dataSet name must be in {}'.format(valid_dataset))
 
-        if is_training:
-            pattern = os.path.join('../../dataloader/tfrecord', dataset_name + ('_train*' if 'MLT' not in dataset_name else '_*'))
-        else:
-            pattern = os.path.join('../../dataloader/tfrecord', dataset_name + '_test*')
+        pattern = tfrecord_pattern(dataset_name, is_training)
 
         print('tfrecord path is -->', os.path.abspath(pattern))
 
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Throughput of the training reader: a pre-rotated dataset (e.g. SKU110K-R from rotate_augment.py)
+# read as it is, against the original images rotated on the fly (IMG_ROTATE).
+#
+#   python convert_data_to_tfrecord_SKU110K-R.py --dataset SKU110K-R --offline_rotated True
+#   python convert_data_to_tfrecord_SKU110K-R.py --dataset SKU110K --offline_rotated False
+#   python reader_throughput.py --offline_dataset SKU110K-R --online_dataset SKU110K
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import tensorflow as tf
+
+sys.path.append('../../')
+
+from dataloader.dataset.read_tfrecord import ReadTFRecord, tfrecord_pattern
+
+
+class OverrideCfgs(object):
+
+    def __init__(self, cfgs, **kwargs):
+        for k in dir(cfgs):
+            if k.isupper():
+                setattr(self, k, getattr(cfgs, k))
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+
+def tfrecord_size(dataset_name):
+    files = glob.glob(tfrecord_pattern(dataset_name, is_training=True))
+    return sum([os.path.getsize(f) for f in files])
+
+
+def measure(cfgs, dataset_name, num_batches, warmup):
+    graph = tf.Graph()
+    with graph.as_default():
+        reader = ReadTFRecord(cfgs)
+        outputs = reader.next_batch(dataset_name=dataset_name,
+                                    batch_size=cfgs.BATCH_SIZE,
+                                    shortside_len=cfgs.IMG_SHORT_SIDE_LEN,
+                                    is_training=True)
+        init_op = tf.group(tf.global_variables_initializer(), tf.local_variables_initializer())
+
+        with tf.Session() as sess:
+            sess.run(init_op)
+            coord = tf.train.Coordinator()
+            threads = tf.train.start_queue_runners(sess, coord)
+
+            for _ in range(warmup):
+                sess.run(outputs)
+            start = time.time()
+            for _ in range(num_batches):
+                sess.run(outputs)
+            cost = time.time() - start
+
+            coord.request_stop()
+            coord.join(threads)
+    return num_batches * cfgs.BATCH_SIZE / cost
+
+
+if __name__ == '__main__':
+    from configs import cfgs
+
+    parser = argparse.ArgumentParser('Reader throughput, offline vs online rotation')
+    parser.add_argument('--offline_dataset', default='SKU110K-R', type=str)
+    parser.add_argument('--online_dataset', default='SKU110K', type=str)
+    parser.add_argument('--angles', default='-45,-30,-15,15,30,45', type=str)
+    parser.add_argument('--num_batches', default=500, type=int)
+    parser.add_argument('--warmup', default=50, type=int)
+    args = parser.parse_args()
+
+    angles = [float(a) for a in args.angles.split(',')]
+    settings = [('offline ({})'.format(args.offline_dataset), args.offline_dataset,
+                 OverrideCfgs(cfgs, IMG_ROTATE=False)),
+                ('online ({})'.format(args.online_dataset), args.online_dataset,
+                 OverrideCfgs(cfgs, IMG_ROTATE=True, IMG_ROTATE_ANGLES=angles,
+                              IMG_ROTATE_PROB=len(angles) / (len(angles) + 1.)))]
+
+    print('%-32s %12s %16s' % ('reader', 'img/s', 'tfrecord(MB)'))
+    for name, dataset_name, setting in settings:
+        speed = measure(setting, dataset_name, args.num_batches, args.warmup)
+        print('%-32s %12.2f %16.1f' % (name, speed, tfrecord_size(dataset_name) / 1024. ** 2))
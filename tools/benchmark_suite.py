@@ -0,0 +1,366 @@
+# -*- coding:utf-8 -*-
+# Inference benchmark across detectors, backbones, input sizes and nms modes. Every setting is built from its cfgs
+# in a fresh process and run on the same seeded synthetic images (or the first images of --img_dir),
+# the results are appended as json lines so that the runs of two commits can be compared.
+#
+#   python benchmark_suite.py --detectors retinanet,r3det,csl,dcl,gwd,kl,r2cnn --sizes 600,800 --nms_modes cpu,gwd
+#   python benchmark_suite.py --detectors retinanet --backbones resnet50_v1d,resnet101_v1d --device gpu \
+#                             --nms_modes gpu --restore --img_dir /data/dataset/DOTA/val/images
+#   python benchmark_suite.py ... --output bench_new.jsonl --compare bench_old.jsonl
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+import cv2
+import numpy as np
+
+sys.path.append("../")
+
+# detector --> (default cfgs, package in alpharotate/libs/models/detectors, network class)
+DETECTORS = OrderedDict([
+    ('retinanet', ('configs.DOTA.retinanet.cfgs_res50_dota_v4', 'retinanet', 'DetectionNetworkRetinaNet')),
+    ('r3det', ('configs.DOTA.r3det.cfgs_res50_dota_r3det_v1', 'r3det', 'DetectionNetworkR3Det')),
+    ('csl', ('configs.DOTA.csl.cfgs_res50_dota_v45', 'csl', 'DetectionNetworkCSL')),
+    ('dcl', ('configs.DOTA.dcl.cfgs_res50_dota_dcl_v5', 'dcl', 'DetectionNetworkDCL')),
+    ('gwd', ('configs.DOTA.gwd.cfgs_res50_dota_v10', 'gwd', 'DetectionNetworkGWD')),
+    ('kl', ('configs.DOTA.kl.cfgs_res50_dota_kl_v5', 'kl', 'DetectionNetworkKL')),
+    ('r2cnn', ('configs.DOTA.r2cnn.cfgs_res50_dota_v1', 'r2cnn', 'DetectionNetworkR2CNN')),
+])
+# nms mode --> cfgs overrides of the in-graph rotated nms
+NMS_MODES = OrderedDict([
+    ('gpu', {'ROTATE_NMS_USE_GPU': True, 'NMS_OVERLAP_METRIC': 'iou'}),
+    ('cpu', {'ROTATE_NMS_USE_GPU': False, 'NMS_OVERLAP_METRIC': 'iou'}),
+    ('gwd', {'NMS_OVERLAP_METRIC': 'gwd'}),
+    ('kld', {'NMS_OVERLAP_METRIC': 'kld'}),
+])
+SETTING_KEYS = ['detector', 'cfgs', 'backbone', 'size', 'nms', 'device']
+STAGES = ['preprocess', 'backbone_head', 'decode', 'nms', 'post_merge']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser('Inference benchmark across detectors, backbones, input sizes and nms modes')
+    parser.add_argument('--detectors', default=','.join(DETECTORS.keys()), type=str)
+    parser.add_argument('--cfgs', default='', type=str,
+                        help='comma separated detector=cfgs module, e.g. r3det=configs.DOTA.r3det.cfgs_res50_dota_r3det_v2')
+    parser.add_argument('--backbones', default='', type=str, help='comma separated NET_NAME, empty for the one of cfgs')
+    parser.add_argument('--sizes', default='800', type=str, help='comma separated short sides')
+    parser.add_argument('--nms_modes', default='cpu', type=str, help='comma separated, of %s' % list(NMS_MODES.keys()))
+    parser.add_argument('--device', default='cpu', type=str, choices=['cpu', 'gpu'])
+    parser.add_argument('--threads', default=0, type=int, help='intra op threads, 0 for the default of tensorflow')
+    parser.add_argument('--img_dir', default='', type=str, help='fixed images instead of the synthetic ones')
+    parser.add_argument('--num_imgs', default=8, type=int)
+    parser.add_argument('--runs', default=20, type=int)
+    parser.add_argument('--warmup', default=3, type=int)
+    parser.add_argument('--trace_runs', default=3, type=int,
+                        help='traced runs that split the session time into backbone + head, decode and nms')
+    parser.add_argument('--seed', default=0, type=int)
+    parser.add_argument('--restore', default=False, action='store_true',
+                        help='restore the trained (or pretrained) weights, the weights are random otherwise and '
+                             'decode / nms only see the boxes that pass FILTERED_SCORE by chance')
+    parser.add_argument('--output', default='./benchmark/results.jsonl', type=str)
+    parser.add_argument('--compare', default='', type=str, help='results of another commit to compare with')
+    parser.add_argument('--tolerance', default=0.1, type=float, help='relative p50 change reported as a regression')
+    return parser.parse_args()
+
+
+def synthetic_images(num, size, seed):
+    '''
+    seeded noise with filled rotated rectangles, BGR [size, size, 3]
+    '''
+    rng = np.random.RandomState(seed)
+    imgs = []
+    for _ in range(num):
+        img = rng.randint(0, 64, [size, size, 3]).astype(np.uint8)
+        for _ in range(50):
+            rect = ((rng.uniform(0, size), rng.uniform(0, size)), (rng.uniform(8, size / 4), rng.uniform(8, size / 8)),
+                    rng.uniform(-90, 0))
+            cv2.fillPoly(img, [np.int32(cv2.boxPoints(rect))], [int(c) for c in rng.randint(64, 256, 3)])
+        imgs.append(img)
+    return imgs
+
+
+def fixed_images(img_dir, num):
+    names = sorted([n for n in os.listdir(img_dir) if n.endswith(('.jpg', '.png', '.jpeg', '.tif', '.tiff', '.bmp'))])
+    return [cv2.imread(os.path.join(img_dir, n)) for n in names[:num]]
+
+
+def load_cfgs(setting):
+    '''
+    the cfgs module of the setting with its size, backbone and nms mode, only in the process of the setting
+    '''
+    from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+
+    cfgs = importlib.import_module(setting['cfgs'])
+    short_side = cfgs.IMG_SHORT_SIDE_LEN[0] if isinstance(cfgs.IMG_SHORT_SIDE_LEN, list) else cfgs.IMG_SHORT_SIDE_LEN
+    cfgs.IMG_MAX_LENGTH = int(round(cfgs.IMG_MAX_LENGTH * setting['size'] / float(short_side)))
+    cfgs.IMG_SHORT_SIDE_LEN = setting['size']
+    if setting['backbone'] is not None:
+        cfgs.NET_NAME = setting['backbone']
+    # the scripts of the detectors run two levels below the root, this one only one
+    root_path = os.path.abspath('../')
+    cfgs.PRETRAINED_CKPT = PretrainModelZoo().pretrain_weight_path(cfgs.NET_NAME, root_path)
+    cfgs.TRAINED_CKPT = os.path.join(root_path, 'output/trained_weights')
+    for k, v in NMS_MODES[setting['nms']].items():
+        setattr(cfgs, k, v)
+    return cfgs
+
+
+def benchmark_setting(setting, options):
+    if setting['device'] == 'cpu':
+        os.environ["CUDA_VISIBLE_DEVICES"] = ''
+
+    import tensorflow as tf
+    from tensorflow.python.client import timeline
+
+    from alpharotate.libs.label_name_dict.label_dict import LabelMap
+    from alpharotate.libs.utils.coordinate_convert import forward_convert
+    from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+    from alpharotate.utils.step_profiler import InferenceStageProfiler
+    from alpharotate.utils.tta import fuse_detections
+    from tools.test_dota_base import DOTA_NMS_THRESHOLD
+
+    # the two-stage detectors only have the iou nms
+    if setting['nms'] in ('gwd', 'kld') and not hasattr(importlib.import_module(setting['cfgs']), 'NMS_OVERLAP_METRIC'):
+        return dict(setting, status='skipped: no NMS_OVERLAP_METRIC in cfgs')
+    cfgs = load_cfgs(setting)
+    result = dict(setting, backbone=cfgs.NET_NAME)
+
+    module = importlib.import_module('alpharotate.libs.models.detectors.%s.build_whole_network' %
+                                     DETECTORS[setting['detector']][1])
+    det_net = getattr(module, DETECTORS[setting['detector']][2])(cfgs=cfgs, is_training=False)
+
+    tf.set_random_seed(options['seed'])
+    img_plac = tf.placeholder(dtype=tf.uint8, shape=[None, None, 3])  # is RGB. not BGR
+    img_batch = tf.cast(img_plac, tf.float32)
+
+    pretrain_zoo = PretrainModelZoo()
+    if cfgs.NET_NAME in pretrain_zoo.pth_zoo or cfgs.NET_NAME in pretrain_zoo.mxnet_zoo:
+        img_batch = (img_batch / 255 - tf.constant(cfgs.PIXEL_MEAN_)) / tf.constant(cfgs.PIXEL_STD)
+    else:
+        img_batch = img_batch - tf.constant(cfgs.PIXEL_MEAN)
+
+    img_batch = tf.expand_dims(img_batch, axis=0)
+
+    detection_boxes, detection_scores, detection_category = det_net.build_whole_detection_network(
+        input_img_batch=img_batch)
+
+    init_op = tf.group(
+        tf.global_variables_initializer(),
+        tf.local_variables_initializer()
+    )
+
+    restorer, restore_ckpt = det_net.get_restorer() if options['restore'] else (None, None)
+
+    config = tf.ConfigProto(intra_op_parallelism_threads=options['threads'])
+    if setting['device'] == 'cpu':
+        config.device_count['GPU'] = 0
+    else:
+        config.gpu_options.allow_growth = True
+
+    label_name_map = LabelMap(cfgs).label2name()
+    iou_thresholds = dict([(label, DOTA_NMS_THRESHOLD.get(name, 0.3)) for label, name in label_name_map.items()])
+    cpu_nms = setting['device'] == 'cpu' or setting['nms'] != 'gpu'
+    if options['img_dir']:
+        images = fixed_images(options['img_dir'], options['num_imgs'])
+    else:
+        images = synthetic_images(options['num_imgs'], setting['size'], options['seed'])
+
+    def run_once(sess, index, run_options=None, run_metadata=None):
+        img = images[index % len(images)]
+        start = time.time()
+        raw_h, raw_w = img.shape[0], img.shape[1]
+        if raw_h < raw_w:
+            new_h, new_w = cfgs.IMG_SHORT_SIDE_LEN, min(int(cfgs.IMG_SHORT_SIDE_LEN * float(raw_w) / raw_h),
+                                                         cfgs.IMG_MAX_LENGTH)
+        else:
+            new_h, new_w = min(int(cfgs.IMG_SHORT_SIDE_LEN * float(raw_h) / raw_w),
+                               cfgs.IMG_MAX_LENGTH), cfgs.IMG_SHORT_SIDE_LEN
+        img_resize = cv2.resize(img, (new_w, new_h))[:, :, ::-1]
+        preprocessed = time.time()
+
+        boxes, scores, labels = sess.run([detection_boxes, detection_scores, detection_category],
+                                         feed_dict={img_plac: img_resize}, options=run_options,
+                                         run_metadata=run_metadata)
+        detected = time.time()
+
+        # the merge of the test drivers: back to the image and the per-class nms
+        quads = np.reshape(forward_convert(boxes, False), [-1, 8])
+        quads[:, 0::2] *= (raw_w / new_w)
+        quads[:, 1::2] *= (raw_h / new_h)
+        quads, scores, labels = fuse_detections(quads, np.reshape(scores, [-1]), np.reshape(labels, [-1]),
+                                                iou_thresholds, cpu_nms=cpu_nms)
+        end = time.time()
+        return (preprocessed - start) * 1000, (detected - preprocessed) * 1000, (end - detected) * 1000, len(scores)
+
+    with tf.Session(config=config) as sess:
+        sess.run(init_op)
+        if restorer is not None:
+            restorer.restore(sess, restore_ckpt)
+
+        for i in range(options['warmup']):
+            run_once(sess, i)
+        times = np.array([run_once(sess, i) for i in range(options['runs'])])
+
+        trace_dir = os.path.join(os.path.dirname(options['output']) or '.', 'traces',
+                                 '_'.join([str(result[k]) for k in SETTING_KEYS if k != 'cfgs']))
+        profiler = InferenceStageProfiler(sess.graph, trace_dir)
+        run_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
+        for i in range(options['trace_runs']):
+            run_metadata = tf.RunMetadata()
+            _, session_ms, _, _ = run_once(sess, i, run_options, run_metadata)
+            profiler.record(run_metadata.step_stats, session_ms / 1000.)
+            if i == 0:
+                with open(os.path.join(trace_dir, 'timeline.json'), 'w') as fw:
+                    fw.write(timeline.Timeline(run_metadata.step_stats).generate_chrome_trace_format())
+
+    latency = times[:, :3].sum(axis=1)
+    fractions = profiler.stage_fractions()
+    stages_ms = OrderedDict([('preprocess', float(np.mean(times[:, 0])))] +
+                            [(k, float(np.mean(times[:, 1]) * fractions[k])) for k in InferenceStageProfiler.STAGES] +
+                            [('post_merge', float(np.mean(times[:, 2])))])
+    return dict(result, status='ok', images=len(images), runs=options['runs'],
+                p50_ms=float(np.percentile(latency, 50)), p95_ms=float(np.percentile(latency, 95)),
+                mean_ms=float(np.mean(latency)), images_per_second=float(len(latency) / latency.sum() * 1000),
+                # kilobytes on linux
+                peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.,
+                stages_ms=stages_ms, detections_per_image=float(np.mean(times[:, 3])),
+                tensorflow=tf.__version__)
+
+
+def run_setting(setting, options, result_queue):
+    try:
+        result_queue.put(benchmark_setting(setting, options))
+    except Exception as e:
+        result_queue.put(dict(setting, status='error: %s: %s' % (type(e).__name__, e)))
+
+
+def run_in_process(setting, options):
+    '''
+    a fresh process per setting: its own graph and tensorflow runtime, and its own peak RSS
+    '''
+    ctx = multiprocessing.get_context('spawn')
+    result_queue = ctx.Queue()
+    proc = ctx.Process(target=run_setting, args=(setting, options, result_queue))
+    proc.start()
+    result = None
+    while result is None and (proc.is_alive() or not result_queue.empty()):
+        try:
+            result = result_queue.get(timeout=1.)
+        except Empty:
+            pass
+    proc.join()
+    if result is None:
+        result = dict(setting, status='crashed, exit code %s' % proc.exitcode)
+    return result
+
+
+def environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT).decode().strip()
+        dirty = len(subprocess.check_output(['git', 'status', '--porcelain', '-uno']).strip()) > 0
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {'commit': commit, 'dirty': dirty, 'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'host': platform.node(), 'processor': platform.processor(), 'cpu_count': multiprocessing.cpu_count(),
+            'python': platform.python_version(), 'numpy': np.__version__}
+
+
+def setting_key(result):
+    return tuple([result.get(k) for k in SETTING_KEYS])
+
+
+def load_results(path):
+    '''
+    :return: dict, setting --> the last successful result of the file
+    '''
+    results = OrderedDict()
+    with open(path) as f:
+        for line in f:
+            result = json.loads(line)
+            if result.get('status') == 'ok':
+                results[setting_key(result)] = result
+    return results
+
+
+def print_results(results):
+    print('%-10s %-16s %5s %4s %9s %9s %8s %8s  %s' % ('detector', 'backbone', 'size', 'nms', 'p50(ms)', 'p95(ms)',
+                                                       'img/s', 'rss(MB)', ' / '.join(STAGES) + ' (ms)'))
+    for r in results:
+        if r['status'] != 'ok':
+            print('%-10s %-16s %5d %4s  %s' % (r['detector'], r['backbone'] or 'cfgs', r['size'], r['nms'], r['status']))
+            continue
+        print('%-10s %-16s %5d %4s %9.1f %9.1f %8.2f %8.0f  %s' % (
+            r['detector'], r['backbone'], r['size'], r['nms'], r['p50_ms'], r['p95_ms'], r['images_per_second'],
+            r['peak_rss_mb'], ' / '.join(['%.1f' % r['stages_ms'][k] for k in STAGES])))
+
+
+def compare_results(results, baseline, tolerance):
+    '''
+    :return: number of settings whose p50 got slower by more than tolerance
+    '''
+    print('\n%-10s %-16s %5s %4s %12s %12s %8s' % ('detector', 'backbone', 'size', 'nms', 'base p50', 'p50', 'ratio'))
+    regressions = 0
+    for r in results:
+        base = baseline.get(setting_key(r))
+        if r['status'] != 'ok' or base is None:
+            continue
+        ratio = r['p50_ms'] / max(base['p50_ms'], 1e-6)
+        flag = 'REGRESSION' if ratio > 1 + tolerance else ('faster' if ratio < 1 - tolerance else '')
+        regressions += int(ratio > 1 + tolerance)
+        print('%-10s %-16s %5d %4s %12.1f %12.1f %8.3f  %s' % (r['detector'], r['backbone'], r['size'], r['nms'],
+                                                             base['p50_ms'], r['p50_ms'], ratio, flag))
+    return regressions
+
+
+if __name__ == '__main__':
+
+    args = parse_args()
+    cfgs_override = dict([item.split('=') for item in args.cfgs.split(',') if item])
+    options = dict([(k, getattr(args, k)) for k in ['threads', 'img_dir', 'num_imgs', 'runs', 'warmup',
+                                                    'trace_runs', 'seed', 'restore', 'output']])
+    env = environment()
+
+    settings = []
+    for detector in args.detectors.split(','):
+        for backbone in (args.backbones.split(',') if args.backbones else [None]):
+            for size in [int(s) for s in args.sizes.split(',')]:
+                for nms in args.nms_modes.split(','):
+                    settings.append({'detector': detector, 'cfgs': cfgs_override.get(detector, DETECTORS[detector][0]),
+                                     'backbone': backbone, 'size': size, 'nms': nms, 'device': args.device})
+
+    if os.path.dirname(args.output) != '' and not os.path.exists(os.path.dirname(args.output)):
+        os.makedirs(os.path.dirname(args.output))
+    results = []
+    for i, setting in enumerate(settings):
+        print('[%d/%d] %s' % (i + 1, len(settings), ' '.join(['%s=%s' % (k, setting[k]) for k in SETTING_KEYS])))
+        if setting['nms'] == 'gpu' and setting['device'] == 'cpu':
+            result = dict(setting, status='skipped: gpu nms on cpu')
+        else:
+            result = run_in_process(setting, options)
+        result = dict(result, options=options, env=env)
+        results.append(result)
+        with open(args.output, 'a') as fw:
+            fw.write(json.dumps(result) + '\n')
+
+    print_results(results)
+    if args.compare:
+        if compare_results(results, load_results(args.compare), args.tolerance) > 0:
+            sys.exit(1)
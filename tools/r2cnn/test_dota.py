@@ -17,7 +17,7 @@ from configs import cfgs
 class TestDOTAR2CNN(TestDOTA):
 
     def eval(self):
-        txt_name = '{}.txt'.format(self.cfgs.VERSION)
+        txt_name = '{}.det'.format(self.cfgs.VERSION)
         real_test_img_list = self.get_test_image()
 
         r2cnn = build_whole_network.DetectionNetworkR2CNN(cfgs=self.cfgs,
@@ -17,7 +17,7 @@ from configs import cfgs
 class TestDOTAR2CNNKL(TestDOTA):
 
     def eval(self):
-        txt_name = '{}.txt'.format(self.cfgs.VERSION)
+        txt_name = '{}.det'.format(self.cfgs.VERSION)
         real_test_img_list = self.get_test_image()
 
         r2cnn_kl = build_whole_network.DetectionNetworkR2CNNKL(cfgs=self.cfgs,
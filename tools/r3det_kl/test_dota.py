@@ -17,7 +17,7 @@ from configs import cfgs
 class TestDOTAR3DetKL(TestDOTA):
 
     def eval(self):
-        txt_name = '{}.txt'.format(self.cfgs.VERSION)
+        txt_name = '{}.det'.format(self.cfgs.VERSION)
         real_test_img_list = self.get_test_image()
 
         r3det_kl = build_whole_network.DetectionNetworkR3DetKL(cfgs=self.cfgs,
@@ -21,10 +21,13 @@ from alpharotate.libs.utils.draw_box_in_img import DrawBox
 from alpharotate.libs.utils.nms_rotate import nms_rotate_cpu
 from alpharotate.libs.models.anchor_heads.generate_anchors import GenerateAnchors
 from alpharotate.utils import tools
+from alpharotate.utils import graph_optimizer
 
 CKPT_PATH = '../../output/trained_weights/{}/HRSC2016_179999model.ckpt'.format(cfgs.VERSION)
 OUT_DIR = '../../output/Pbs'
 PB_NAME = 'RetinaNet.pb'
+# (h, w), fix the input size to bake the anchors into the graph ('DetAnchors'), None for any size
+INPUT_SIZE = None
 
 
 class ExportPb(object):
@@ -32,10 +35,44 @@ class ExportPb(object):
     def __init__(self, cfgs):
         self.cfgs = cfgs
 
-    def build_detection_graph(self):
+    def output_names(self, input_size=None):
+        return ['DetResults'] if input_size is None else ['DetResults', 'DetAnchors']
+
+    def make_anchors(self, new_h, new_w):
+        '''
+        :return: [N, 5] horizontal anchors (x, y, w, h, theta) of an image of [new_h, new_w]
+        '''
+        anchor = GenerateAnchors(self.cfgs, 'H')
+
+        h1, w1 = math.ceil(new_h / 2), math.ceil(new_w / 2)
+        h2, w2 = math.ceil(h1 / 2), math.ceil(w1 / 2)
+        h3, w3 = math.ceil(h2 / 2), math.ceil(w2 / 2)
+        h4, w4 = math.ceil(h3 / 2), math.ceil(w3 / 2)
+        h5, w5 = math.ceil(h4 / 2), math.ceil(w4 / 2)
+        h6, w6 = math.ceil(h5 / 2), math.ceil(w5 / 2)
+        h7, w7 = math.ceil(h6 / 2), math.ceil(w6 / 2)
+
+        h_dict = {'P3': h3, 'P4': h4, 'P5': h5, 'P6': h6, 'P7': h7}
+        w_dict = {'P3': w3, 'P4': w4, 'P5': w5, 'P6': w6, 'P7': w7}
+        anchors = anchor.generate_all_anchor_pb(h_dict, w_dict)
+        anchors = np.concatenate(anchors, axis=0)
+
+        x_c = (anchors[:, 2] + anchors[:, 0]) / 2
+        y_c = (anchors[:, 3] + anchors[:, 1]) / 2
+        h = anchors[:, 2] - anchors[:, 0] + 1
+        w = anchors[:, 3] - anchors[:, 1] + 1
+        theta = -90 * np.ones_like(x_c)
+        return np.transpose(np.stack([x_c, y_c, w, h, theta]))
+
+    def build_detection_graph(self, input_size=None):
+        '''
+        :param input_size: (h, w), the input placeholder gets a static shape and the anchors of this size
+                           are baked into the graph as the constant 'DetAnchors'
+        '''
         retinanet = build_whole_network_pb.DetectionNetworkRetinaNet(cfgs=self.cfgs, is_training=False)
 
-        img_plac = tf.placeholder(dtype=tf.uint8, shape=[None, None, 3], name='input_img')  # is RGB. not BGR
+        img_shape = [None, None, 3] if input_size is None else [input_size[0], input_size[1], 3]
+        img_plac = tf.placeholder(dtype=tf.uint8, shape=img_shape, name='input_img')  # is RGB. not BGR
         img_batch = tf.cast(img_plac, tf.float32)
 
         if self.cfgs.NET_NAME in ['resnet152_v1d', 'resnet101_v1d', 'resnet50_v1d',
@@ -51,31 +88,78 @@ class ExportPb(object):
         dets = tf.concat([tf.reshape(box_pred, [-1, 5]),
                           tf.reshape(cls_prob, [-1, self.cfgs.CLASS_NUM])], axis=1, name='DetResults')
 
+        if input_size is not None:
+            tf.constant(self.make_anchors(input_size[0], input_size[1]), dtype=tf.float32, name='DetAnchors')
+
         return dets
 
-    def export_frozenPB(self):
+    def validation_img(self, input_size=None, img_path=None):
+        '''
+        RGB image fed to the graphs to compare their outputs, a random one if no path is given
+        '''
+        if input_size is None:
+            input_size = (self.cfgs.IMG_SHORT_SIDE_LEN, self.cfgs.IMG_SHORT_SIDE_LEN)
+        if img_path is None:
+            return np.random.randint(0, 256, [input_size[0], input_size[1], 3]).astype(np.uint8)
+        return cv2.resize(cv2.imread(img_path), (input_size[1], input_size[0]))[:, :, ::-1]
+
+    def export_frozenPB(self, input_size=None, val_img=None):
+        '''
+        :param val_img: RGB image, if given the outputs of the checkpoint on it are returned
+        '''
 
         tf.reset_default_graph()
 
-        dets = self.build_detection_graph()
+        self.build_detection_graph(input_size)
+        output_names = self.output_names(input_size)
 
         saver = tf.train.Saver()
 
+        ref_outputs = None
         with tf.Session() as sess:
             print("we have restred the weights from =====>>\n", CKPT_PATH)
             saver.restore(sess, CKPT_PATH)
+            if val_img is not None:
+                ref_outputs = sess.run([name + ':0' for name in output_names], feed_dict={'input_img:0': val_img})
 
             tf.train.write_graph(sess.graph_def, OUT_DIR, PB_NAME)
             freeze_graph.freeze_graph(input_graph=os.path.join(OUT_DIR, PB_NAME),
                                       input_saver='',
                                       input_binary=False,
                                       input_checkpoint=CKPT_PATH,
-                                      output_node_names="DetResults",
+                                      output_node_names=','.join(output_names),
                                       restore_op_name="save/restore_all",
                                       filename_tensor_name='save/Const:0',
                                       output_graph=os.path.join(OUT_DIR, PB_NAME.replace('.pb', '_Frozen.pb')),
                                       clear_devices=False,
                                       initializer_nodes='')
+        return ref_outputs
+
+    def optimize_frozenPB(self, input_size=None, val_img_path=None, runs=20):
+        '''
+        export the frozen graph, apply the inference graph transforms (strip unused nodes, fold constants and BN)
+        and check the outputs and the CPU latency of both graphs against the checkpoint
+        '''
+        val_img = self.validation_img(input_size, val_img_path)
+        ref_outputs = self.export_frozenPB(input_size, val_img)
+        output_names = self.output_names(input_size)
+        input_shape = None if input_size is None else (input_size[0], input_size[1], 3)
+
+        frozen_graph_def = graph_optimizer.load_graph_def(os.path.join(OUT_DIR, PB_NAME.replace('.pb', '_Frozen.pb')))
+        optimized_graph_def = graph_optimizer.optimize_graph_def(frozen_graph_def, ['input_img'], output_names,
+                                                                 input_shape)
+        graph_optimizer.save_graph_def(optimized_graph_def,
+                                       os.path.join(OUT_DIR, PB_NAME.replace('.pb', '_Optimized.pb')))
+
+        frozen_ops, optimized_ops = graph_optimizer.count_ops(frozen_graph_def), \
+            graph_optimizer.count_ops(optimized_graph_def)
+        for op in ['PyFunc', 'FusedBatchNorm', 'Identity', 'Assert']:
+            print('%-16s %6d --> %6d' % (op, frozen_ops[op], optimized_ops[op]))
+
+        # the checkpoint is the reference of both graphs
+        graph_optimizer.report([('frozen', frozen_graph_def), ('optimized', optimized_graph_def)],
+                               {'input_img:0': val_img},
+                               output_names, ref_outputs=ref_outputs, runs=runs)
 
     def load_graph(self, frozen_graph_file):
 
@@ -226,7 +310,7 @@ class ExportPb(object):
 
             return_boxes_pred.append(tmp_boxes_pred)
             return_scores.append(tmp_scores)
-            return_labels.append(np.ones_like(scores) * (j + 1))
+            return_labels.append(np.ones_like(tmp_scores) * (j + 1))
 
         return_boxes_pred = np.concatenate(return_boxes_pred, axis=0)
         return_scores = np.concatenate(return_scores, axis=0)
@@ -241,8 +325,12 @@ class ExportPb(object):
 
         img = graph.get_tensor_by_name("input_img:0")
         dets = graph.get_tensor_by_name("DetResults:0")
+        # graphs exported with a fixed input size have the anchors baked in
+        baked_anchors = 'DetAnchors' in [op.name for op in graph.get_operations()]
+        fixed_size = img.get_shape().as_list()[:2] if baked_anchors else None
 
         with tf.Session(graph=graph) as sess:
+            anchors = sess.run(graph.get_tensor_by_name("DetAnchors:0")) if baked_anchors else None
             for img_path in os.listdir(test_dir):
                 print(img_path)
                 a_img = cv2.imread(os.path.join(test_dir, img_path))[:, :, ::-1]
@@ -250,7 +338,9 @@ class ExportPb(object):
                 raw_h, raw_w = a_img.shape[0], a_img.shape[1]
 
                 short_size, max_len = self.cfgs.IMG_SHORT_SIDE_LEN, cfgs.IMG_MAX_LENGTH
-                if raw_h < raw_w:
+                if fixed_size is not None:
+                    new_h, new_w = fixed_size
+                elif raw_h < raw_w:
                     new_h, new_w = short_size, min(int(short_size * float(raw_w) / raw_h), max_len)
                 else:
                     new_h, new_w = min(int(short_size * float(raw_h) / raw_w), max_len), short_size
@@ -258,27 +348,8 @@ class ExportPb(object):
                 dets_val = sess.run(dets, feed_dict={img: img_resize[:, :, ::-1]})
 
                 bbox_pred, cls_prob = dets_val[:, :5], dets_val[:, 5:(5+self.cfgs.CLASS_NUM)]
-                anchor = GenerateAnchors(self.cfgs, 'H')
-
-                h1, w1 = math.ceil(new_h / 2), math.ceil(new_w / 2)
-                h2, w2 = math.ceil(h1 / 2), math.ceil(w1 / 2)
-                h3, w3 = math.ceil(h2 / 2), math.ceil(w2 / 2)
-                h4, w4 = math.ceil(h3 / 2), math.ceil(w3 / 2)
-                h5, w5 = math.ceil(h4 / 2), math.ceil(w4 / 2)
-                h6, w6 = math.ceil(h5 / 2), math.ceil(w5 / 2)
-                h7, w7 = math.ceil(h6 / 2), math.ceil(w6 / 2)
-
-                h_dict = {'P3': h3, 'P4': h4, 'P5': h5, 'P6': h6, 'P7': h7}
-                w_dict = {'P3': w3, 'P4': w4, 'P5': w5, 'P6': w6, 'P7': w7}
-                anchors = anchor.generate_all_anchor_pb(h_dict, w_dict)
-                anchors = np.concatenate(anchors, axis=0)
-
-                x_c = (anchors[:, 2] + anchors[:, 0]) / 2
-                y_c = (anchors[:, 3] + anchors[:, 1]) / 2
-                h = anchors[:, 2] - anchors[:, 0] + 1
-                w = anchors[:, 3] - anchors[:, 1] + 1
-                theta = -90 * np.ones_like(x_c)
-                anchors = np.transpose(np.stack([x_c, y_c, w, h, theta]))
+                if not baked_anchors:
+                    anchors = self.make_anchors(new_h, new_w)
 
                 detected_boxes, detected_scores, detected_categories = self.postprocess_detctions(bbox_pred, cls_prob, anchors)
 
@@ -307,6 +378,6 @@ class ExportPb(object):
 if __name__ == '__main__':
     os.environ["CUDA_VISIBLE_DEVICES"] = '2'
     exporter = ExportPb(cfgs)
-    exporter.export_frozenPB()
-    exporter.test_pb('../../output/Pbs/RetinaNet_Frozen.pb',
+    exporter.optimize_frozenPB(INPUT_SIZE)
+    exporter.test_pb('../../output/Pbs/RetinaNet_Optimized.pb',
                      '/data/dataset/HRSC2016/HRSC2016/Test/AllImages')
@@ -0,0 +1,166 @@
+# -*- coding:utf-8 -*-
+# Post-training int8 quantization of the graph exported by exportPb.py, with an accuracy gate:
+#
+#   python exportPb.py
+#   python quantizePb.py --calib_dir /data/dataset/HRSC2016/HRSC2016/Train/AllImages \
+#                        --img_dir /data/dataset/HRSC2016/HRSC2016/Test/AllImages \
+#                        --test_annotation_path /data/dataset/HRSC2016/HRSC2016/Test/xmls
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import tensorflow as tf
+from tqdm import tqdm
+
+sys.path.append("../../")
+
+from configs import cfgs
+from alpharotate.libs.val_libs.voc_eval_r import EVAL
+from alpharotate.libs.utils.coordinate_convert import forward_convert, backward_convert
+from alpharotate.utils import graph_optimizer
+from tools.retinanet.exportPb import ExportPb, OUT_DIR, PB_NAME
+
+
+def parse_args():
+    parser = argparse.ArgumentParser('Post-training int8 quantization of the exported graph')
+    parser.add_argument('--pb', default=os.path.join(OUT_DIR, PB_NAME.replace('.pb', '_Optimized.pb')), type=str)
+    parser.add_argument('--calib_dir', help='representative images', type=str)
+    parser.add_argument('--num_calib', default=100, type=int)
+    parser.add_argument('--img_dir', help='test images', type=str)
+    parser.add_argument('--image_ext', default='.bmp', type=str)
+    parser.add_argument('--test_annotation_path', type=str)
+    parser.add_argument('--max_map_drop', help='accuracy gate, max mAP drop of the int8 graph',
+                        default=0.01, type=float)
+    return parser.parse_args()
+
+
+class QuantizePb(ExportPb):
+
+    def resize_shape(self, raw_h, raw_w, fixed_size=None):
+        if fixed_size is not None:
+            return fixed_size
+        short_size, max_len = self.cfgs.IMG_SHORT_SIDE_LEN, self.cfgs.IMG_MAX_LENGTH
+        if isinstance(short_size, list):
+            short_size = short_size[0]
+        if raw_h < raw_w:
+            return short_size, min(int(short_size * float(raw_w) / raw_h), max_len)
+        return min(int(short_size * float(raw_h) / raw_w), max_len), short_size
+
+    @staticmethod
+    def fixed_size(graph_def):
+        '''
+        input size of the graphs exported with baked anchors, None otherwise
+        '''
+        if 'DetAnchors' not in [node.name for node in graph_def.node]:
+            return None
+        for node in graph_def.node:
+            if node.name == 'input_img' and node.attr['shape'].shape.dim:
+                dims = [d.size for d in node.attr['shape'].shape.dim]
+                return (dims[0], dims[1]) if dims[0] > 0 and dims[1] > 0 else None
+        return None
+
+    def calibration_feeds(self, calib_dir, num_calib, fixed_size=None):
+        img_names = sorted(os.listdir(calib_dir))
+        step = max(len(img_names) // num_calib, 1)
+        for img_name in img_names[::step][:num_calib]:
+            raw_img = cv2.imread(os.path.join(calib_dir, img_name))
+            if raw_img is None:
+                continue
+            new_h, new_w = self.resize_shape(raw_img.shape[0], raw_img.shape[1], fixed_size)
+            yield {'input_img:0': cv2.resize(raw_img, (new_w, new_h))[:, :, ::-1]}
+
+    def quantize(self, pb_path, calib_dir, num_calib):
+        graph_def = graph_optimizer.load_graph_def(pb_path)
+        fixed_size = self.fixed_size(graph_def)
+        output_names = self.output_names(fixed_size)
+        quantized_graph_def = graph_optimizer.quantize_graph_def(
+            graph_def, ['input_img'], output_names,
+            self.calibration_feeds(calib_dir, num_calib, fixed_size),
+            log_path=pb_path.replace('.pb', '_ranges.log'))
+        graph_optimizer.save_graph_def(quantized_graph_def, pb_path.replace('.pb', '_Quantized.pb'))
+        return graph_def, quantized_graph_def
+
+    def detect(self, graph_def, img_dir, image_ext):
+        '''
+        :return: detections of all images in the format of EVAL ([category, score, x, y, w, h, theta] in the
+                 raw image), image ids, mean CPU latency of the graph (ms)
+        '''
+        fixed_size = self.fixed_size(graph_def)
+        all_boxes_r, img_ids, cost = [], [], 0.
+
+        with tf.Graph().as_default() as graph:
+            tf.import_graph_def(graph_def, name='')
+            img = graph.get_tensor_by_name('input_img:0')
+            dets = graph.get_tensor_by_name('DetResults:0')
+            with tf.Session(graph=graph, config=tf.ConfigProto(device_count={'GPU': 0})) as sess:
+                anchors = sess.run(graph.get_tensor_by_name('DetAnchors:0')) if fixed_size is not None else None
+                for img_name in tqdm(sorted(os.listdir(img_dir))):
+                    raw_img = cv2.imread(os.path.join(img_dir, img_name))
+                    raw_h, raw_w = raw_img.shape[0], raw_img.shape[1]
+                    new_h, new_w = self.resize_shape(raw_h, raw_w, fixed_size)
+                    img_resize = cv2.resize(raw_img, (new_w, new_h))
+
+                    start = time.time()
+                    dets_val = sess.run(dets, feed_dict={img: img_resize[:, :, ::-1]})
+                    cost += time.time() - start
+
+                    if fixed_size is None:
+                        anchors = self.make_anchors(new_h, new_w)
+                    boxes, scores, labels = self.postprocess_detctions(dets_val[:, :5],
+                                                                       dets_val[:, 5:(5 + self.cfgs.CLASS_NUM)],
+                                                                       anchors)
+                    img_ids.append(img_name.split(image_ext)[0])
+                    if boxes.shape[0] == 0:
+                        all_boxes_r.append(np.array([]))
+                        continue
+
+                    boxes = forward_convert(boxes, False)
+                    boxes[:, 0::2] *= (raw_w / new_w)
+                    boxes[:, 1::2] *= (raw_h / new_h)
+                    boxes = backward_convert(boxes, False)
+                    all_boxes_r.append(np.hstack([labels.reshape(-1, 1), scores.reshape(-1, 1), boxes]))
+
+        return all_boxes_r, img_ids, cost / max(len(img_ids), 1) * 1000
+
+    def evaluate(self, graph_defs, img_dir, image_ext, test_annotation_path):
+        '''
+        :param graph_defs: list of (name, graph_def)
+        :return: list of (name, mAP, latency (ms), size (MB))
+        '''
+        results = []
+        for name, graph_def in graph_defs:
+            all_boxes_r, img_ids, latency = self.detect(graph_def, img_dir, image_ext)
+            evaler = EVAL(self.cfgs)
+            mAP = evaler.voc_evaluate_detections(all_boxes=all_boxes_r,
+                                                 test_imgid_list=img_ids,
+                                                 test_annotation_path=test_annotation_path)
+            results.append((name, mAP, latency, graph_def.ByteSize() / 1024. ** 2))
+        return results
+
+
+if __name__ == '__main__':
+    os.environ["CUDA_VISIBLE_DEVICES"] = ''
+    args = parse_args()
+
+    quantizer = QuantizePb(cfgs)
+    float_graph_def, int8_graph_def = quantizer.quantize(args.pb, args.calib_dir, args.num_calib)
+    results = quantizer.evaluate([('float32', float_graph_def), ('int8', int8_graph_def)],
+                                 args.img_dir, args.image_ext, args.test_annotation_path)
+
+    print('%-10s %8s %10s %12s %10s' % ('graph', 'mAP', 'delta', 'cpu(ms)', 'size(MB)'))
+    for name, mAP, latency, size in results:
+        print('%-10s %8.4f %+10.4f %12.2f %10.1f' % (name, mAP, mAP - results[0][1], latency, size))
+
+    map_drop = results[0][1] - results[1][1]
+    if map_drop > args.max_map_drop:
+        print('int8 graph rejected: mAP drop %.4f > %.4f' % (map_drop, args.max_map_drop))
+        sys.exit(1)
+    print('int8 graph accepted: mAP drop %.4f <= %.4f' % (map_drop, args.max_map_drop))
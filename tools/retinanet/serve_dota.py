@@ -0,0 +1,22 @@
+# -*- coding:utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+
+sys.path.append("../../")
+
+from alpharotate.libs.models.detectors.retinanet import build_whole_network
+from tools.serve_dota_base import ServeDOTA
+from configs import cfgs
+
+
+if __name__ == '__main__':
+
+    # before the detector is built, ServeDOTA moves its nms to CPU
+    server = ServeDOTA(cfgs)
+    retinanet = build_whole_network.DetectionNetworkRetinaNet(cfgs=server.cfgs,
+                                                              is_training=False)
+    server.serve(det_net=retinanet)
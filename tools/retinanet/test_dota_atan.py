@@ -17,7 +17,7 @@ from configs import cfgs
 class TestDOTARetinaNet(TestDOTA):
 
     def eval(self):
-        txt_name = '{}.txt'.format(self.cfgs.VERSION)
+        txt_name = '{}.det'.format(self.cfgs.VERSION)
         real_test_img_list = self.get_test_image()
 
         retinanet = build_whole_network_atan.DetectionNetworkRetinaNet(cfgs=self.cfgs,
@@ -17,7 +17,7 @@ from configs import cfgs
 class TestDOTARSDet(TestDOTA):
 
     def eval(self):
-        txt_name = '{}.txt'.format(self.cfgs.VERSION)
+        txt_name = '{}.det'.format(self.cfgs.VERSION)
         real_test_img_list = self.get_test_image()
 
         rsdet = build_whole_network_5p.DetectionNetworkRSDet(cfgs=self.cfgs,
@@ -0,0 +1,556 @@
+# -*- coding:utf-8 -*-
+# Local inference service on CPU: the model stays loaded in N warm sessions (one per core group), the windows of
+# concurrent requests are batched by input size, tiling / nms / output format are the ones of test_dota_base.py.
+# A batch is one message to a worker, which still runs its windows one by one (the graph takes a single image),
+# so batching saves the inter-process messages and queueing, not forward passes.
+#
+#   python serve_dota.py --num_workers 4 --port 8500                                   (in tools/<detector>)
+#   curl --data-binary @P0006.png 'http://127.0.0.1:8500/detect?name=P0006.png'
+#   curl -X POST 'http://127.0.0.1:8500/detect?path=/data/dataset/DOTA/test/images/P0006.png&format=dota'
+#   curl 'http://127.0.0.1:8500/metrics'                        (json, ?format=prometheus for the text format)
+#
+#   python serve_dota.py --unix_socket /tmp/alpharotate.sock
+#   curl --unix-socket /tmp/alpharotate.sock --data-binary @P0006.png 'http://localhost/detect'
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import namedtuple, defaultdict
+from multiprocessing import Process, Queue, cpu_count
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn, UnixStreamServer
+    from urllib.parse import urlparse, parse_qs
+    import queue
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn, UnixStreamServer
+    from urlparse import urlparse, parse_qs
+    import Queue as queue
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+from alpharotate.libs.label_name_dict.label_dict import LabelMap
+from alpharotate.libs.utils.coordinate_convert import forward_convert
+from alpharotate.utils.detection_store import per_class_lines
+from alpharotate.utils.inference_pool import ShapeBatcher, ServingMetrics
+from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+from alpharotate.utils.tile_planner import TilePlanner, Window
+from tools.test_dota_base import TestDOTA
+
+# one resized window of a request, run with every flip by a worker
+TileTask = namedtuple('TileTask', ['request_id', 'img', 'src_shape', 'offset'])
+TileResult = namedtuple('TileResult', ['request_id', 'boxes', 'scores', 'labels', 'infer_ms', 'error'])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser('Start the inference service.')
+
+    parser.add_argument('--host', dest='host', default='127.0.0.1', type=str)
+    parser.add_argument('--port', dest='port', default=8500, type=int)
+    parser.add_argument('--unix_socket', dest='unix_socket',
+                        help='listen on this unix socket instead of host:port',
+                        default='', type=str)
+    parser.add_argument('--num_workers', dest='num_workers',
+                        help='warm sessions, each one pinned to its own group of cores',
+                        default=2, type=int)
+    parser.add_argument('--threads_per_worker', dest='threads_per_worker',
+                        help='cores of a group, 0 splits the cores of the machine between the workers',
+                        default=0, type=int)
+    parser.add_argument('--max_batch', dest='max_batch',
+                        help='windows of the same input size given to a worker at once (run one by one)',
+                        default=8, type=int)
+    parser.add_argument('--request_timeout', dest='request_timeout',
+                        help='seconds',
+                        default=600, type=float)
+    parser.add_argument('--startup_timeout', dest='startup_timeout',
+                        help='seconds a worker may take to build, restore and warm up',
+                        default=600, type=float)
+    parser.add_argument('--multi_scale', '-ms', default=False,
+                        action='store_true')
+    parser.add_argument('--flip_img', '-f', default=False,
+                        action='store_true')
+    parser.add_argument('--tile_min_std', dest='tile_min_std',
+                        help='skip the windows whose gray std is lower (no content), 0 keeps all windows',
+                        default=0, type=float)
+    parser.add_argument('--h_len', dest='h_len',
+                        help='image height',
+                        default=600, type=int)
+    parser.add_argument('--w_len', dest='w_len',
+                        help='image width',
+                        default=600, type=int)
+    parser.add_argument('--h_overlap', dest='h_overlap',
+                        help='height overlap',
+                        default=150, type=int)
+    parser.add_argument('--w_overlap', dest='w_overlap',
+                        help='width overlap',
+                        default=150, type=int)
+    # the nms of TestDOTA, always on CPU here
+    parser.set_defaults(cpu_nms=True)
+    args = parser.parse_args()
+    return args
+
+
+class PendingRequest(object):
+
+    def __init__(self, num_tiles):
+        self.num_tiles = num_tiles
+        self.results = []
+        self.error = None
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        if num_tiles == 0:
+            self.done.set()
+
+    def add(self, result):
+        with self.lock:
+            self.results.append(result)
+            if len(self.results) == self.num_tiles:
+                self.done.set()
+
+    def fail(self, error):
+        with self.lock:
+            if self.error is None:
+                self.error = error
+            self.done.set()
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class ServeHandler(BaseHTTPRequestHandler):
+    '''
+    POST /detect   body: encoded image (or ?path= of an image on the server), ?name=, ?format=json|dota
+    GET  /metrics  counters and latency histograms, ?format=prometheus
+    GET  /health
+    '''
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, code, body, content_type='application/json'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/metrics':
+            if query.get('format', ['json'])[0] == 'prometheus':
+                self.reply(200, service.metrics.prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+            else:
+                self.reply(200, service.metrics.snapshot())
+        elif url.path == '/health':
+            self.reply(200, service.health())
+        else:
+            self.reply(404, {'error': 'unknown path %s' % url.path})
+
+    def do_POST(self):
+        service = self.server.service
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path != '/detect':
+            self.reply(404, {'error': 'unknown path %s' % url.path})
+            return
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if 'path' in query:
+            name = os.path.basename(query['path'][0])
+            img = cv2.imread(query['path'][0])
+        else:
+            name = query.get('name', ['image'])[0]
+            img = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR) if len(body) > 0 else None
+        if img is None:
+            service.metrics.count('bad_requests')
+            self.reply(400, {'error': 'no image could be decoded'})
+            return
+        try:
+            boxes, scores, labels, info = service.detect(img)
+        except RuntimeError as e:
+            service.metrics.count('failed_requests')
+            self.reply(504 if 'timeout' in str(e) else 500, {'error': str(e)})
+            return
+        self.reply(200, service.format_result(name, boxes, scores, labels, info, query.get('format', ['json'])[0]))
+
+
+class ServeDOTA(TestDOTA):
+    '''
+    The DOTA test as a long-lived service. Worker processes are forked once, build the graph, restore the
+    checkpoint and warm up on a window; the http threads tile the requests, the windows of all requests are
+    batched by input size and given to the free workers, and each request gets the per-class nms of TestDOTA.
+    A worker runs the windows of a batch one after the other in its session, a batch only saves messages
+    between the processes and time in the queues.
+    A worker that dies is not restarted (forking the graph after the threads started is not safe): the requests
+    of its batch fail, the others go on with the remaining workers and /health reports it.
+    '''
+
+    def __init__(self, cfgs):
+        # the in-graph rotated nms as well, set before the detector is built
+        cfgs.ROTATE_NMS_USE_GPU = False
+        self.cfgs = cfgs
+        self.args = parse_args()
+        label_map = LabelMap(cfgs)
+        self.name_label_map, self.label_name_map = label_map.name2label(), label_map.label2name()
+        self.window = Window(self.args.h_len, self.args.w_len, self.args.h_overlap, self.args.w_overlap)
+        self.flips = [None, 'h', 'v'] if self.args.flip_img else [None]
+        self.metrics = ServingMetrics()
+        self.batcher = ShapeBatcher(self.args.max_batch)
+        self.idle_workers = queue.Queue()
+        self.in_flight = {}
+        self.dead_workers = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.procs = []
+
+    def short_sides(self):
+        img_short_side_len_list = self.cfgs.IMG_SHORT_SIDE_LEN if isinstance(self.cfgs.IMG_SHORT_SIDE_LEN, list) else [
+            self.cfgs.IMG_SHORT_SIDE_LEN]
+        return [img_short_side_len_list[0]] if not self.args.multi_scale else img_short_side_len_list
+
+    def resize_shape(self, short_size):
+        max_len = self.cfgs.IMG_MAX_LENGTH
+        if self.args.h_len < self.args.w_len:
+            return short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
+        return min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
+
+    def core_groups(self):
+        num_cores = cpu_count()
+        threads = self.args.threads_per_worker or max(num_cores // self.args.num_workers, 1)
+        return [[c % num_cores for c in range(i * threads, (i + 1) * threads)] for i in range(self.args.num_workers)]
+
+    def run_tile(self, sess, img_plac, fetches, task):
+        '''
+        :return: quads [N, 8] in the coordinates of the request image, scores, labels
+        '''
+        src_h, src_w = task.src_shape
+        resized_h, resized_w = task.img.shape[0], task.img.shape[1]
+        hh_, ww_ = task.offset
+        boxes, scores, labels = [], [], []
+        for flip in self.flips:
+            view = {None: task.img, 'h': task.img[:, ::-1], 'v': task.img[::-1]}[flip]
+            det_boxes_r_, det_scores_r_, det_category_r_ = sess.run(fetches, feed_dict={img_plac: view})
+            if len(det_boxes_r_) == 0:
+                continue
+            det_boxes_r_ = forward_convert(det_boxes_r_, False)
+            det_boxes_r_[:, 0::2] *= (src_w / resized_w)
+            det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+            if flip == 'h':
+                det_boxes_r_[:, 0::2] = src_w - det_boxes_r_[:, 0::2]
+            elif flip == 'v':
+                det_boxes_r_[:, 1::2] = src_h - det_boxes_r_[:, 1::2]
+            det_boxes_r_[:, 0::2] += ww_
+            det_boxes_r_[:, 1::2] += hh_
+            boxes.append(det_boxes_r_)
+            scores.append(det_scores_r_)
+            labels.append(det_category_r_)
+        if len(boxes) == 0:
+            return np.zeros([0, 8], np.float32), np.zeros([0], np.float32), np.zeros([0], np.int32)
+        return np.concatenate(boxes), np.concatenate(scores), np.concatenate(labels)
+
+    def serve_worker(self, worker_id, cores, det_net, task_queue, result_queue, ready_queue):
+        os.environ["CUDA_VISIBLE_DEVICES"] = ''
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cores)
+
+        img_plac = tf.placeholder(dtype=tf.uint8, shape=[None, None, 3])  # is RGB. not BGR
+        img_batch = tf.cast(img_plac, tf.float32)
+
+        pretrain_zoo = PretrainModelZoo()
+        if self.cfgs.NET_NAME in pretrain_zoo.pth_zoo or self.cfgs.NET_NAME in pretrain_zoo.mxnet_zoo:
+            img_batch = (img_batch / 255 - tf.constant(self.cfgs.PIXEL_MEAN_)) / tf.constant(self.cfgs.PIXEL_STD)
+        else:
+            img_batch = img_batch - tf.constant(self.cfgs.PIXEL_MEAN)
+
+        img_batch = tf.expand_dims(img_batch, axis=0)
+
+        fetches = det_net.build_whole_detection_network(input_img_batch=img_batch)
+
+        init_op = tf.group(
+            tf.global_variables_initializer(),
+            tf.local_variables_initializer()
+        )
+
+        restorer, restore_ckpt = det_net.get_restorer()
+
+        config = tf.ConfigProto(device_count={'GPU': 0},
+                                intra_op_parallelism_threads=len(cores),
+                                inter_op_parallelism_threads=min(len(cores), 2))
+
+        with tf.Session(config=config) as sess:
+            sess.run(init_op)
+            if not restorer is None:
+                restorer.restore(sess, restore_ckpt)
+
+            # the first run of every input size allocates and plans its kernels
+            for short_size in self.short_sides():
+                new_h, new_w = self.resize_shape(short_size)
+                sess.run(fetches, feed_dict={img_plac: np.zeros([new_h, new_w, 3], np.uint8)})
+            ready_queue.put(worker_id)
+
+            while True:
+                batch = task_queue.get()
+                if batch is None:
+                    break
+                results = []
+                for task in batch:
+                    start = time.time()
+                    try:
+                        boxes, scores, labels = self.run_tile(sess, img_plac, fetches, task)
+                        error = None
+                    except Exception as e:
+                        boxes, scores, labels = None, None, None
+                        error = '%s: %s' % (type(e).__name__, e)
+                    results.append(TileResult(task.request_id, boxes, scores, labels,
+                                              (time.time() - start) * 1000, error))
+                result_queue.put((worker_id, results))
+
+    def dispatch(self, task_queues):
+        '''
+        every worker has its own task queue, so that the batch a dead worker held is known
+        '''
+        while True:
+            worker_id = self.idle_workers.get()
+            if worker_id is None:
+                break
+            with self.lock:
+                if worker_id in self.dead_workers:
+                    continue
+            batch = self.batcher.get()
+            if batch is None:
+                break
+            now = time.time()
+            for enqueued, _ in batch:
+                self.metrics.observe('queue_wait', (now - enqueued) * 1000)
+            self.metrics.count('batches')
+            self.metrics.count('tiles', len(batch))
+            tasks = [task for _, task in batch]
+            with self.lock:
+                dead = worker_id in self.dead_workers
+                if not dead:
+                    self.in_flight[worker_id] = tasks
+            if dead:
+                # died while the batch was being taken, fail it as its batch
+                self.fail_requests(tasks, 'worker %d died' % worker_id)
+                continue
+            task_queues[worker_id].put(tasks)
+
+    def fail_requests(self, tasks, error):
+        with self.lock:
+            requests = [self.pending.get(request_id) for request_id in set([t.request_id for t in tasks])]
+        for request in requests:
+            if request is not None:
+                request.fail(error)
+
+    def check_workers(self):
+        '''
+        mark the workers that exited, fail the requests of the batches they held
+        '''
+        for worker_id, proc in enumerate(self.procs):
+            if proc.is_alive() or worker_id in self.dead_workers:
+                continue
+            with self.lock:
+                self.dead_workers[worker_id] = proc.exitcode
+                tasks = self.in_flight.pop(worker_id, [])
+            self.metrics.count('worker_deaths')
+            print('worker %d exited with code %s' % (worker_id, proc.exitcode))
+            self.fail_requests(tasks, 'worker %d died (exit code %s)' % (worker_id, proc.exitcode))
+        if len(self.dead_workers) == len(self.procs):
+            with self.lock:
+                requests = list(self.pending.values())
+            for request in requests:
+                request.fail('no live worker')
+
+    def collect(self, result_queue):
+        while True:
+            try:
+                message = result_queue.get(timeout=1.)
+            except queue.Empty:
+                self.check_workers()
+                continue
+            if message is None:
+                break
+            worker_id, results = message
+            with self.lock:
+                self.in_flight.pop(worker_id, None)
+                alive = worker_id not in self.dead_workers
+            if alive:
+                self.idle_workers.put(worker_id)
+            for result in results:
+                self.metrics.observe('tile_inference', result.infer_ms)
+                with self.lock:
+                    request = self.pending.get(result.request_id)
+                if request is not None:
+                    request.add(result)
+            self.check_workers()
+
+    def submit(self, img):
+        '''
+        tile a BGR image and queue its windows
+        '''
+        img_h, img_w = img.shape[0], img.shape[1]
+        pad_h, pad_w = max(self.args.h_len - img_h, 0), max(self.args.w_len - img_w, 0)
+        if pad_h + pad_w > 0:
+            img = np.pad(img, [[0, pad_h], [0, pad_w], [0, 0]], 'constant')
+
+        planner = TilePlanner(min_std=self.args.tile_min_std)
+        tiles = planner.plan(img, self.window)
+        short_sides = self.short_sides()
+
+        with self.lock:
+            request_id = self.next_id
+            self.next_id += 1
+            request = PendingRequest(len(tiles) * len(short_sides))
+            self.pending[request_id] = request
+
+        for hh_, ww_ in tiles:
+            src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
+            for short_size in short_sides:
+                new_h, new_w = self.resize_shape(short_size)
+                # BGR --> RGB
+                img_resize = np.ascontiguousarray(cv2.resize(src_img, (new_w, new_h))[:, :, ::-1])
+                self.batcher.put((new_h, new_w), TileTask(request_id, img_resize, src_img.shape[:2], (hh_, ww_)))
+        self.metrics.count('skipped_tiles', planner.num_skipped)
+        return request_id, request
+
+    def detect(self, img):
+        '''
+        :param img: BGR image [H, W, 3]
+        :return: quads [K, 8], scores [K, ], labels [K, ], info dict
+        '''
+        start = time.time()
+        if len(self.dead_workers) == len(self.procs):
+            raise RuntimeError('no live worker')
+        request_id, request = self.submit(img)
+        finished = request.done.wait(self.args.request_timeout)
+        with self.lock:
+            del self.pending[request_id]
+        if not finished:
+            raise RuntimeError('timeout after %.0fs' % self.args.request_timeout)
+        if request.error is not None:
+            raise RuntimeError(request.error)
+        errors = [r.error for r in request.results if r.error is not None]
+        if len(errors) > 0:
+            raise RuntimeError(errors[0])
+
+        results = [r for r in request.results if len(r.scores) > 0]
+        nms_start = time.time()
+        if len(results) > 0:
+            boxes, scores, labels = self.nms(np.concatenate([r.boxes for r in results]),
+                                             np.concatenate([r.scores for r in results]),
+                                             np.concatenate([r.labels for r in results]))
+        else:
+            boxes, scores, labels = np.zeros([0, 8], np.float32), np.zeros([0], np.float32), np.zeros([0], np.int32)
+        end = time.time()
+
+        self.metrics.observe('nms', (end - nms_start) * 1000)
+        self.metrics.observe('request', (end - start) * 1000)
+        self.metrics.count('images')
+        self.metrics.count('detections', len(scores))
+        return boxes, scores, labels, {'tiles': request.num_tiles, 'latency_ms': (end - start) * 1000}
+
+    def format_result(self, name, boxes, scores, labels, info, output_format='json'):
+        '''
+        :param output_format: 'json' a list of detections, 'dota' the lines of this image in every Task1_<class>.txt
+        '''
+        if output_format == 'dota':
+            lines = per_class_lines(name, boxes, scores, labels, defaultdict(list))
+            files = dict([('Task1_%s.txt' % self.label_name_map[label], lines[label]) for label in sorted(lines)])
+            return dict(info, image=name, files=files)
+        detections = [{'class': self.label_name_map[int(label)], 'score': float(score), 'quad': box.tolist()}
+                      for box, score, label in zip(boxes, scores, labels)]
+        return dict(info, image=name, detections=detections)
+
+    def health(self):
+        with self.lock:
+            dead = dict([(str(k), v) for k, v in self.dead_workers.items()])
+        return {'workers': len(self.procs), 'alive': sum([p.is_alive() for p in self.procs]),
+                'dead': dead, 'pending_tiles': len(self.batcher), 'pending_requests': len(self.pending)}
+
+    def wait_ready(self, ready_queue):
+        '''
+        wait for the warm-up of every worker, stop all of them as soon as one exits or the startup times out
+        '''
+        deadline = time.time() + self.args.startup_timeout
+        num_ready = 0
+        while num_ready < len(self.procs):
+            try:
+                print('worker %d is warm' % ready_queue.get(timeout=1.))
+                num_ready += 1
+                continue
+            except queue.Empty:
+                pass
+            exited = [(i, p.exitcode) for i, p in enumerate(self.procs) if not p.is_alive()]
+            if len(exited) > 0 or time.time() > deadline:
+                for p in self.procs:
+                    if p.is_alive():
+                        p.terminate()
+                    p.join()
+                if len(exited) > 0:
+                    raise RuntimeError('worker %d exited with code %s during startup' % exited[0])
+                raise RuntimeError('the workers were not warm after %.0fs' % self.args.startup_timeout)
+
+    def serve(self, det_net):
+        result_queue, ready_queue = Queue(), Queue()
+        task_queues = [Queue() for _ in range(self.args.num_workers)]
+        for worker_id, cores in enumerate(self.core_groups()):
+            proc = Process(target=self.serve_worker,
+                           args=(worker_id, cores, det_net, task_queues[worker_id], result_queue, ready_queue))
+            proc.start()
+            print('worker %d: cores %s' % (worker_id, cores))
+            self.procs.append(proc)
+        self.wait_ready(ready_queue)
+        for worker_id in range(len(self.procs)):
+            self.idle_workers.put(worker_id)
+
+        threads = [threading.Thread(target=self.dispatch, args=(task_queues, )),
+                   threading.Thread(target=self.collect, args=(result_queue, ))]
+        for t in threads:
+            t.daemon = True
+            t.start()
+
+        if self.args.unix_socket:
+            if os.path.exists(self.args.unix_socket):
+                os.remove(self.args.unix_socket)
+            httpd = ThreadingUnixHTTPServer(self.args.unix_socket, ServeHandler)
+            print('serving on %s' % self.args.unix_socket)
+        else:
+            httpd = ThreadingHTTPServer((self.args.host, self.args.port), ServeHandler)
+            print('serving on http://%s:%d' % (self.args.host, self.args.port))
+        httpd.service = self
+
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            self.batcher.close()
+            self.idle_workers.put(None)
+            for worker_id, p in enumerate(self.procs):
+                if p.is_alive():
+                    task_queues[worker_id].put(None)
+            for p in self.procs:
+                p.join()
+            result_queue.put(None)
+            if self.args.unix_socket and os.path.exists(self.args.unix_socket):
+                os.remove(self.args.unix_socket)
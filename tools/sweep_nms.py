@@ -0,0 +1,146 @@
+# -*- coding:utf-8 -*-
+# Sweep the per-class nms and the score threshold over the detections cached by
+# test_dota_base.py --raw_cache_dir, the network is not run again.
+#
+#   python sweep_nms.py --raw_cache ../raw_cache/<key> --iou_thresholds default,0.1,0.3 --score_thresholds 0.05,0.1 \
+#                       --test_annotation_path /data/dataset/DOTA/val/xmls
+# without annotations (DOTA test) the Task1 files of every setting are written to --save_dir.
+# A cache of --raw_cache_mode pre_nms holds the detections before the per-window nms and score filter of the
+# detector, they are applied here and --window_iou_thresholds / --score_thresholds sweep them as well.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append("../")
+
+from alpharotate.libs.label_name_dict.label_dict import LabelMap
+from alpharotate.libs.utils.coordinate_convert import backward_convert
+from alpharotate.libs.val_libs.voc_eval_r import EVAL
+from alpharotate.utils.detection_store import DetectionStore, RawDetectionCache
+from alpharotate.utils.tta import fuse_detections, window_nms
+from tools.test_dota_base import class_nms_thresholds
+
+
+def parse_args():
+    parser = argparse.ArgumentParser('Sweep the nms over the cached raw detections')
+    parser.add_argument('--raw_cache', type=str, required=True,
+                        help='directory of one checkpoint and setting in --raw_cache_dir of the test')
+    parser.add_argument('--iou_thresholds', default='default', type=str,
+                        help='comma separated, "default" is the per-class thresholds of test_dota_base')
+    parser.add_argument('--window_iou_thresholds', default='cfgs', type=str,
+                        help='comma separated iou thresholds of the per-window nms of a pre_nms cache, '
+                             '"cfgs" is the one of the detector')
+    parser.add_argument('--score_thresholds', default='cfgs', type=str,
+                        help='comma separated, "cfgs" is FILTERED_SCORE of the detector. The per-window score filter '
+                             'of a pre_nms cache, otherwise lower than FILTERED_SCORE of the cached run has no effect')
+    parser.add_argument('--test_annotation_path', default='', type=str)
+    parser.add_argument('--save_dir', default='', type=str)
+    parser.add_argument('--cpu_nms', '-cn', default=False, action='store_true')
+    return parser.parse_args()
+
+
+class NMSSweep(object):
+
+    def __init__(self, cfgs, raw_cache, cpu_nms=False):
+        self.cfgs = cfgs
+        label_map = LabelMap(cfgs)
+        self.label_name_map = label_map.label2name()
+        cache = RawDetectionCache(raw_cache)
+        self.items = cache.items()
+        settings = cache.settings()
+        # the score filter and nms of every window, if the detector was built without them (pre_nms)
+        self.window_nms_cfgs = settings.get('info', {}).get('window_nms')
+        self.filtered_score = settings['settings']['FILTERED_SCORE'] if self.window_nms_cfgs is None \
+            else self.window_nms_cfgs['score_threshold']
+        self.cpu_nms = cpu_nms
+
+    def iou_thresholds(self, iou_threshold, labels):
+        '''
+        :param iou_threshold: 'default' (the per-class thresholds of the test) or a threshold for all classes
+        :return: dict, label --> iou threshold
+        '''
+        if iou_threshold == 'default':
+            return class_nms_thresholds(self.label_name_map, labels)
+        return dict([(label, float(iou_threshold)) for label in np.unique(labels)])
+
+    def run(self, iou_threshold, score_threshold, window_iou_threshold=None):
+        '''
+        :param window_iou_threshold: iou threshold of the per-window nms of a pre_nms cache, None skips it
+        :return: detections of all images in the format of EVAL ([category, score, x, y, w, h, theta]),
+                 image names, quads of all images
+        '''
+        all_boxes_r, img_names, all_quads = [], [], []
+        for img_name, boxes, scores, labels in self.items:
+            if self.window_nms_cfgs is not None:
+                boxes, scores, labels = window_nms(boxes[:, :8], scores, labels, boxes[:, 8], window_iou_threshold,
+                                                   score_threshold, self.window_nms_cfgs['max_per_class'],
+                                                   self.cpu_nms)
+            else:
+                keep = scores >= score_threshold
+                boxes, scores, labels = boxes[keep], scores[keep], labels[keep]
+            quads, scores, labels = fuse_detections(boxes, scores, labels, self.iou_thresholds(iou_threshold, labels),
+                                                    cpu_nms=self.cpu_nms)
+            img_names.append(img_name)
+            all_quads.append((quads, scores, labels))
+            if scores.shape[0] == 0:
+                all_boxes_r.append(np.array([]))
+                continue
+            rboxes = np.reshape(backward_convert(quads, False), [-1, 5])
+            all_boxes_r.append(np.hstack([labels.reshape(-1, 1), scores.reshape(-1, 1), rboxes]))
+        return all_boxes_r, img_names, all_quads
+
+    def export(self, img_names, all_quads, save_dir):
+        store = DetectionStore(save_dir + '.det')
+        for img_name, (quads, scores, labels) in zip(img_names, all_quads):
+            store.append(img_name, quads, scores, labels)
+        store.export_dota(save_dir, self.label_name_map)
+        store.close()
+        os.remove(save_dir + '.det')
+
+
+if __name__ == '__main__':
+    from configs import cfgs
+
+    args = parse_args()
+    sweep = NMSSweep(cfgs, args.raw_cache, args.cpu_nms)
+    print('%d images in %s' % (len(sweep.items), args.raw_cache))
+
+    score_thresholds = [sweep.filtered_score if s == 'cfgs' else float(s) for s in args.score_thresholds.split(',')]
+    if sweep.window_nms_cfgs is None:
+        window_iou_thresholds = [None]
+    else:
+        window_iou_thresholds = [sweep.window_nms_cfgs['iou_threshold'] if s == 'cfgs' else float(s)
+                                 for s in args.window_iou_thresholds.split(',')]
+
+    results = []
+    for iou_threshold in args.iou_thresholds.split(','):
+        for window_iou_threshold in window_iou_thresholds:
+            for score_threshold in score_thresholds:
+                setting = 'iou_%s_score_%g' % (iou_threshold, score_threshold)
+                if sweep.window_nms_cfgs is not None:
+                    setting += '_window_%s' % window_iou_threshold
+                start = time.time()
+                all_boxes_r, img_names, all_quads = sweep.run(iou_threshold, score_threshold, window_iou_threshold)
+                cost = time.time() - start
+
+                mAP = None
+                if args.test_annotation_path:
+                    evaler = EVAL(cfgs)
+                    mAP = evaler.voc_evaluate_detections(all_boxes=all_boxes_r,
+                                                         test_imgid_list=[os.path.splitext(n)[0] for n in img_names],
+                                                         test_annotation_path=args.test_annotation_path)
+                if args.save_dir:
+                    sweep.export(img_names, all_quads, os.path.join(args.save_dir, setting))
+                results.append((setting, cost, mAP))
+
+    print('%-40s %10s %10s' % ('setting', 'nms(s)', 'mAP'))
+    for setting, cost, mAP in results:
+        print('%-40s %10.2f %10s' % (setting, cost, '-' if mAP is None else '%.4f' % mAP))
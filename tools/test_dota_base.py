@@ -10,24 +10,54 @@ from __future__ import print_function
 import argparse
 import math
 import os
-from multiprocessing import Queue, Process
+import threading
+from multiprocessing import Process
 
 import cv2
 import numpy as np
 import tensorflow as tf
-from alpharotate.libs.utils.rotate_polygon_nms import rotate_gpu_nms
 from tqdm import tqdm
 
 from alpharotate.libs.label_name_dict.label_dict import LabelMap
-from alpharotate.libs.utils import nms_rotate
 from alpharotate.libs.utils.coordinate_convert import forward_convert, backward_convert
 from alpharotate.libs.utils.draw_box_in_img import DrawBox
 from alpharotate.utils import tools
+from alpharotate.utils.detection_store import DetectionStore, RawDetectionCache
+from alpharotate.utils.shared_ring_buffer import SharedResultRing
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+from alpharotate.utils.tile_planner import TilePlanner, Window
+from alpharotate.utils.tta import fuse_detections, window_nms
 
 
 # from alpharotate.libs.utils.nms_cython.cpu_nms import cpu_nms
 
+# iou threshold of the per-class nms over the detections of all windows
+DOTA_NMS_THRESHOLD = {'roundabout': 0.1, 'tennis-court': 0.3, 'swimming-pool': 0.1, 'storage-tank': 0.2,
+                      'soccer-ball-field': 0.3, 'small-vehicle': 0.2, 'ship': 0.2, 'plane': 0.3,
+                      'large-vehicle': 0.1, 'helicopter': 0.2, 'harbor': 0.0001, 'ground-track-field': 0.3,
+                      'bridge': 0.0001, 'basketball-court': 0.3, 'baseball-diamond': 0.3,
+                      'container-crane': 0.05, 'airport': 0.5, 'helipad': 0.1}
+# what the raw detections depend on besides the checkpoint and the test arguments
+RAW_CACHE_CFGS = ['NET_NAME', 'IMG_SHORT_SIDE_LEN', 'IMG_MAX_LENGTH', 'CLASS_NUM', 'METHOD', 'ANGLE_RANGE',
+                  'ANCHOR_SCALES', 'ANCHOR_RATIOS', 'ANCHOR_ANGLES', 'BASE_ANCHOR_SIZE_LIST', 'ANCHOR_STRIDE',
+                  'VIS_SCORE', 'FILTERED_SCORE', 'NMS', 'NMS_IOU_THRESHOLD', 'NMS_OVERLAP_METRIC',
+                  'ROTATE_NMS_USE_GPU', 'MAXIMUM_DETECTIONS', 'FAST_RCNN_NMS_IOU_THRESHOLD',
+                  'FAST_RCNN_R_NMS_IOU_THRESHOLD', 'FAST_RCNN_H_NMS_IOU_THRESHOLD',
+                  'FAST_RCNN_NMS_MAX_BOXES_PER_CLASS']
+RAW_CACHE_ARGS = ['multi_scale', 'flip_img', 'tile_min_std', 'coarse_to_fine', 'coarse_len', 'coarse_score_thr',
+                  'coarse_margin', 'h_len', 'w_len', 'h_overlap', 'w_overlap', 'raw_cache_mode']
+# score filter of the detector in --raw_cache_mode pre_nms, its nms runs with an iou threshold of 1.0 (no suppression)
+PRE_NMS_FILTERED_SCORE = 0.001
+
+
+def class_nms_thresholds(label_name_map, labels):
+    '''
+    iou thresholds of the per-class nms over all windows, a detected class missing in DOTA_NMS_THRESHOLD is an error
+
+    :return: dict, label --> iou threshold
+    '''
+    return dict([(label, DOTA_NMS_THRESHOLD[label_name_map[label]]) for label in np.unique(labels)])
+
 
 def parse_args():
     parser = argparse.ArgumentParser('Start testing.')
@@ -40,12 +70,30 @@ def parse_args():
                         default='0,1,2,3,4,5,6,7', type=str)
     parser.add_argument('--show_box', '-s', default=False,
                         action='store_true')
+    parser.add_argument('--vis_max_len', dest='vis_max_len',
+                        help='long side of the --show_box images, 0 keeps the full resolution',
+                        default=0, type=int)
     parser.add_argument('--multi_scale', '-ms', default=False,
                         action='store_true')
     parser.add_argument('--flip_img', '-f', default=False,
                         action='store_true')
     parser.add_argument('--cpu_nms', '-cn', default=False,
                         action='store_true')
+    parser.add_argument('--tile_min_std', dest='tile_min_std',
+                        help='skip the windows whose gray std is lower (no content), 0 keeps all windows',
+                        default=1.0, type=float)
+    parser.add_argument('--coarse_to_fine', '-c2f', default=False,
+                        action='store_true',
+                        help='detect on the downsampled scene first, then only run the windows around its detections')
+    parser.add_argument('--coarse_len', dest='coarse_len',
+                        help='long side of the downsampled scene',
+                        default=2048, type=int)
+    parser.add_argument('--coarse_score_thr', dest='coarse_score_thr',
+                        help='score of the coarse detections that schedule the windows',
+                        default=0.05, type=float)
+    parser.add_argument('--coarse_margin', dest='coarse_margin',
+                        help='margin (pixels) around the coarse detections',
+                        default=100, type=int)
     parser.add_argument('--num_imgs', dest='num_imgs',
                         help='test image number',
                         default=np.inf, type=int)
@@ -61,6 +109,21 @@ def parse_args():
     parser.add_argument('--w_overlap', dest='w_overlap',
                         help='width overlap',
                         default=150, type=int)
+    parser.add_argument('--num_writers', dest='num_writers',
+                        help='number of threads writing the results',
+                        default=4, type=int)
+    parser.add_argument('--max_dets_per_img', dest='max_dets_per_img',
+                        help='detections of one image that fit in a shared memory slot',
+                        default=5000, type=int)
+    parser.add_argument('--raw_cache_dir', dest='raw_cache_dir',
+                        help='keep the detections before the nms here (per checkpoint and setting), '
+                             'cached images are not run again and tools/sweep_nms.py can tune the nms on them',
+                        default='', type=str)
+    parser.add_argument('--raw_cache_mode', dest='raw_cache_mode',
+                        help='post_nms caches the output of the detector, pre_nms builds it without the per-window '
+                             'nms and with a near-zero FILTERED_SCORE, they are applied afterwards '
+                             '(and can be swept by tools/sweep_nms.py)',
+                        default='post_nms', choices=['post_nms', 'pre_nms'], type=str)
     args = parser.parse_args()
     return args
 
@@ -72,8 +135,69 @@ class TestDOTA(object):
         self.args = parse_args()
         label_map = LabelMap(cfgs)
         self.name_label_map, self.label_name_map = label_map.name2label(), label_map.label2name()
-
-    def worker(self, gpu_id, images, det_net, result_queue):
+        self.window_nms_cfgs = None
+        if self.args.raw_cache_dir and self.args.raw_cache_mode == 'pre_nms':
+            self.window_nms_cfgs = self.disable_window_nms()
+
+    def disable_window_nms(self):
+        '''
+        build the detector without its per-window nms (iou threshold 1.0) and with a near-zero score filter,
+        must be called before the network is built. The in-graph nms still keeps at most max_output_size boxes
+        per class and window (the highest scores), the only difference to the nms of the detector.
+
+        :return: dict, the score filter, nms iou threshold (None without nms) and max boxes per class
+                 of every window, see window_nms
+        '''
+        if getattr(self.cfgs, 'NMS_OVERLAP_METRIC', 'iou') != 'iou' or getattr(self.cfgs, 'SOFT_NMS', False):
+            raise ValueError('--raw_cache_mode pre_nms only supports the rotated iou nms')
+        if hasattr(self.cfgs, 'FAST_RCNN_NMS_IOU_THRESHOLD'):
+            iou_threshold = self.cfgs.FAST_RCNN_NMS_IOU_THRESHOLD
+        else:
+            iou_threshold = self.cfgs.NMS_IOU_THRESHOLD if getattr(self.cfgs, 'NMS', True) else None
+        window_nms_cfgs = {'score_threshold': self.cfgs.FILTERED_SCORE,
+                           'iou_threshold': iou_threshold,
+                           'max_per_class': 4000 if 'DOTA' in self.cfgs.NET_NAME else 200}
+
+        self.cfgs.FILTERED_SCORE = PRE_NMS_FILTERED_SCORE
+        for k in ['NMS_IOU_THRESHOLD', 'FAST_RCNN_NMS_IOU_THRESHOLD']:
+            if hasattr(self.cfgs, k):
+                setattr(self.cfgs, k, 1.0)
+        return window_nms_cfgs
+
+    def raw_cache(self):
+        if not self.args.raw_cache_dir:
+            return None
+        ckpt_path = tf.train.latest_checkpoint(os.path.join(self.cfgs.TRAINED_CKPT, self.cfgs.VERSION))
+        if ckpt_path is None:
+            ckpt_path = self.cfgs.PRETRAINED_CKPT
+        settings = dict([(k, getattr(self.cfgs, k, None)) for k in RAW_CACHE_CFGS] +
+                        [(k, getattr(self.args, k)) for k in RAW_CACHE_ARGS])
+        return RawDetectionCache.create(self.args.raw_cache_dir, ckpt_path, settings,
+                                        info={'window_nms': self.window_nms_cfgs})
+
+    def window_nms(self, boxes, scores, labels):
+        '''
+        the per-window score filter and nms left out of the detector by --raw_cache_mode pre_nms
+
+        :param boxes: [N, 9] (quad, window run) in pre_nms mode, else [N, 8] and returned as they are
+        :return: boxes [K, 8], scores, labels
+        '''
+        if self.window_nms_cfgs is None:
+            return boxes, scores, labels
+        return window_nms(boxes[:, :8], scores, labels, boxes[:, 8], cpu_nms=self.args.cpu_nms,
+                          **self.window_nms_cfgs)
+
+    def nms(self, boxes, scores, labels):
+        '''
+        per-class nms over the detections of all windows
+
+        :param boxes: [N, 8]
+        '''
+        iou_thresholds = class_nms_thresholds(self.label_name_map, labels)
+        return fuse_detections(np.reshape(boxes, [-1, 8]), np.reshape(scores, [-1]), np.reshape(labels, [-1]),
+                               iou_thresholds, cpu_nms=self.args.cpu_nms)
+
+    def worker(self, gpu_id, images, det_net, result_queue, raw_cache=None):
         os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
 
         img_plac = tf.placeholder(dtype=tf.uint8, shape=[None, None, 3])  # is RGB. not BGR
@@ -106,6 +230,10 @@ class TestDOTA(object):
                 restorer.restore(sess, restore_ckpt)
                 print('restore model %d ...' % gpu_id)
 
+            planner = TilePlanner(min_std=self.args.tile_min_std)
+            window = Window(self.args.h_len, self.args.w_len, self.args.h_overlap, self.args.w_overlap)
+            raw_writer = raw_cache.writer('gpu%d' % gpu_id) if raw_cache is not None else None
+
             for img_path in images:
 
                 # if 'P0006' not in img_path:
@@ -117,6 +245,7 @@ class TestDOTA(object):
                 box_res_rotate = []
                 label_res_rotate = []
                 score_res_rotate = []
+                window_res_rotate = []  # index of the network run of every detection, for window_nms
 
                 imgH = img.shape[0]
                 imgW = img.shape[1]
@@ -137,173 +266,169 @@ class TestDOTA(object):
                     img = temp
                     imgW = self.args.w_len
 
-                for hh in range(0, imgH, self.args.h_len - self.args.h_overlap):
-                    if imgH - hh - 1 < self.args.h_len:
-                        hh_ = imgH - self.args.h_len
-                    else:
-                        hh_ = hh
-                    for ww in range(0, imgW, self.args.w_len - self.args.w_overlap):
-                        if imgW - ww - 1 < self.args.w_len:
-                            ww_ = imgW - self.args.w_len
+                regions = None
+                num_runs = 1
+                if self.args.coarse_to_fine:
+                    ratio = min(self.args.coarse_len / max(imgH, imgW), 1.)
+                    img_coarse = cv2.resize(img, (max(int(imgW * ratio), 1), max(int(imgH * ratio), 1)))
+                    det_boxes_c_, det_scores_c_, det_category_c_ = \
+                        sess.run(
+                            [detection_boxes, detection_scores, detection_category],
+                            feed_dict={img_plac: img_coarse[:, :, ::-1]}
+                        )
+                    regions = np.zeros([0, 4], np.float32)
+                    if len(det_boxes_c_) > 0:
+                        det_boxes_c_ = forward_convert(det_boxes_c_, False)
+                        det_boxes_c_[:, 0::2] *= (imgW / img_coarse.shape[1])
+                        det_boxes_c_[:, 1::2] *= (imgH / img_coarse.shape[0])
+
+                        # the coarse detections are merged with the fine ones by the nms below
+                        box_res_rotate.extend(det_boxes_c_)
+                        label_res_rotate.extend(det_category_c_)
+                        score_res_rotate.extend(det_scores_c_)
+                        window_res_rotate.extend([0] * len(det_boxes_c_))
+
+                        candidates = det_boxes_c_[det_scores_c_ >= self.args.coarse_score_thr]
+                        regions = np.stack([np.min(candidates[:, 0::2], axis=1), np.min(candidates[:, 1::2], axis=1),
+                                            np.max(candidates[:, 0::2], axis=1), np.max(candidates[:, 1::2], axis=1)],
+                                           axis=1) + np.array([-1, -1, 1, 1]) * self.args.coarse_margin
+
+                for hh_, ww_ in planner.plan(img, window, regions):
+                    src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
+
+                    for short_size in img_short_side_len_list:
+                        max_len = self.cfgs.IMG_MAX_LENGTH
+                        if self.args.h_len < self.args.w_len:
+                            new_h, new_w = short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
                         else:
-                            ww_ = ww
-                        src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
-
-                        for short_size in img_short_side_len_list:
-                            max_len = self.cfgs.IMG_MAX_LENGTH
-                            if self.args.h_len < self.args.w_len:
-                                new_h, new_w = short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
-                            else:
-                                new_h, new_w = min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
-                            img_resize = cv2.resize(src_img, (new_w, new_h))
-
-                            resized_img, det_boxes_r_, det_scores_r_, det_category_r_ = \
+                            new_h, new_w = min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
+                        img_resize = cv2.resize(src_img, (new_w, new_h))
+
+                        resized_img, det_boxes_r_, det_scores_r_, det_category_r_ = \
+                            sess.run(
+                                [img_batch, detection_boxes, detection_scores, detection_category],
+                                feed_dict={img_plac: img_resize[:, :, ::-1]}
+                            )
+
+                        resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
+                        src_h, src_w = src_img.shape[0], src_img.shape[1]
+
+                        if len(det_boxes_r_) > 0:
+                            det_boxes_r_ = forward_convert(det_boxes_r_, False)
+                            det_boxes_r_[:, 0::2] *= (src_w / resized_w)
+                            det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+
+                            for ii in range(len(det_boxes_r_)):
+                                box_rotate = det_boxes_r_[ii]
+                                box_rotate[0::2] = box_rotate[0::2] + ww_
+                                box_rotate[1::2] = box_rotate[1::2] + hh_
+                                box_res_rotate.append(box_rotate)
+                                label_res_rotate.append(det_category_r_[ii])
+                                score_res_rotate.append(det_scores_r_[ii])
+                                window_res_rotate.append(num_runs)
+                        num_runs += 1
+
+                        if self.args.flip_img:
+                            det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
                                 sess.run(
-                                    [img_batch, detection_boxes, detection_scores, detection_category],
-                                    feed_dict={img_plac: img_resize[:, :, ::-1]}
+                                    [detection_boxes, detection_scores, detection_category],
+                                    feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
                                 )
+                            if len(det_boxes_r_flip) > 0:
+                                det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
+                                det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
+
+                                for ii in range(len(det_boxes_r_flip)):
+                                    box_rotate = det_boxes_r_flip[ii]
+                                    box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
+                                    box_rotate[1::2] = box_rotate[1::2] + hh_
+                                    box_res_rotate.append(box_rotate)
+                                    label_res_rotate.append(det_category_r_flip[ii])
+                                    score_res_rotate.append(det_scores_r_flip[ii])
+                                    window_res_rotate.append(num_runs)
+                            num_runs += 1
 
-                            resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
-                            src_h, src_w = src_img.shape[0], src_img.shape[1]
-
-                            if len(det_boxes_r_) > 0:
-                                det_boxes_r_ = forward_convert(det_boxes_r_, False)
-                                det_boxes_r_[:, 0::2] *= (src_w / resized_w)
-                                det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+                            det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
+                                sess.run(
+                                    [detection_boxes, detection_scores, detection_category],
+                                    feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
+                                )
+                            if len(det_boxes_r_flip) > 0:
+                                det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
+                                det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
 
-                                for ii in range(len(det_boxes_r_)):
-                                    box_rotate = det_boxes_r_[ii]
+                                for ii in range(len(det_boxes_r_flip)):
+                                    box_rotate = det_boxes_r_flip[ii]
                                     box_rotate[0::2] = box_rotate[0::2] + ww_
-                                    box_rotate[1::2] = box_rotate[1::2] + hh_
+                                    box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
                                     box_res_rotate.append(box_rotate)
-                                    label_res_rotate.append(det_category_r_[ii])
-                                    score_res_rotate.append(det_scores_r_[ii])
-
-                            if self.args.flip_img:
-                                det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                    sess.run(
-                                        [detection_boxes, detection_scores, detection_category],
-                                        feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
-                                    )
-                                if len(det_boxes_r_flip) > 0:
-                                    det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                    det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_flip)):
-                                        box_rotate = det_boxes_r_flip[ii]
-                                        box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
-                                        box_rotate[1::2] = box_rotate[1::2] + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_flip[ii])
-                                        score_res_rotate.append(det_scores_r_flip[ii])
-
-                                det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                    sess.run(
-                                        [detection_boxes, detection_scores, detection_category],
-                                        feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
-                                    )
-                                if len(det_boxes_r_flip) > 0:
-                                    det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                    det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_flip)):
-                                        box_rotate = det_boxes_r_flip[ii]
-                                        box_rotate[0::2] = box_rotate[0::2] + ww_
-                                        box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_flip[ii])
-                                        score_res_rotate.append(det_scores_r_flip[ii])
-
-                box_res_rotate = np.array(box_res_rotate)
-                label_res_rotate = np.array(label_res_rotate)
-                score_res_rotate = np.array(score_res_rotate)
-
-                box_res_rotate_ = []
-                label_res_rotate_ = []
-                score_res_rotate_ = []
-                threshold = {'roundabout': 0.1, 'tennis-court': 0.3, 'swimming-pool': 0.1, 'storage-tank': 0.2,
-                             'soccer-ball-field': 0.3, 'small-vehicle': 0.2, 'ship': 0.2, 'plane': 0.3,
-                             'large-vehicle': 0.1, 'helicopter': 0.2, 'harbor': 0.0001, 'ground-track-field': 0.3,
-                             'bridge': 0.0001, 'basketball-court': 0.3, 'baseball-diamond': 0.3,
-                             'container-crane': 0.05, 'airport': 0.5, 'helipad': 0.1}
-
-                for sub_class in range(1, self.cfgs.CLASS_NUM + 1):
-                    index = np.where(label_res_rotate == sub_class)[0]
-                    if len(index) == 0:
-                        continue
-                    tmp_boxes_r = box_res_rotate[index]
-                    tmp_label_r = label_res_rotate[index]
-                    tmp_score_r = score_res_rotate[index]
-
-                    tmp_boxes_r_ = backward_convert(tmp_boxes_r, False)
-
-                    # cpu nms better than gpu nms (default)
-                    if self.args.cpu_nms:
-                        try:
-                            inx = nms_rotate.nms_rotate_cpu(boxes=np.array(tmp_boxes_r_),
-                                                            scores=np.array(tmp_score_r),
-                                                            iou_threshold=threshold[self.label_name_map[sub_class]],
-                                                            max_output_size=5000)
-
-                        except:
-                            tmp_boxes_r_ = np.array(tmp_boxes_r_)
-                            tmp = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                            tmp[:, 0:-1] = tmp_boxes_r_
-                            tmp[:, -1] = np.array(tmp_score_r)
-                            # Note: the IoU of two same rectangles is 0
-                            jitter = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                            jitter[:, 0] += np.random.rand(tmp_boxes_r_.shape[0], ) / 1000
-                            inx = rotate_gpu_nms(np.array(tmp, np.float32) + np.array(jitter, np.float32),
-                                                 float(threshold[self.label_name_map[sub_class]]), 0)
-                    else:
-                        tmp_boxes_r_ = np.array(tmp_boxes_r_)
-                        tmp = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                        tmp[:, 0:-1] = tmp_boxes_r_
-                        tmp[:, -1] = np.array(tmp_score_r)
-                        # Note: the IoU of two same rectangles is 0
-                        jitter = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                        jitter[:, 0] += np.random.rand(tmp_boxes_r_.shape[0], ) / 1000
-                        inx = rotate_gpu_nms(np.array(tmp, np.float32) + np.array(jitter, np.float32),
-                                             float(threshold[self.label_name_map[sub_class]]), 0)
-
-                    box_res_rotate_.extend(np.array(tmp_boxes_r)[inx])
-                    score_res_rotate_.extend(np.array(tmp_score_r)[inx])
-                    label_res_rotate_.extend(np.array(tmp_label_r)[inx])
+                                    label_res_rotate.append(det_category_r_flip[ii])
+                                    score_res_rotate.append(det_scores_r_flip[ii])
+                                    window_res_rotate.append(num_runs)
+                            num_runs += 1
+
+                box_res_rotate = np.reshape(np.array(box_res_rotate, np.float32), [-1, 8])
+                label_res_rotate = np.array(label_res_rotate, np.int32)
+                score_res_rotate = np.array(score_res_rotate, np.float32)
+                if self.window_nms_cfgs is not None:
+                    box_res_rotate = np.concatenate(
+                        [box_res_rotate, np.reshape(np.array(window_res_rotate, np.float32), [-1, 1])], axis=1)
+                if raw_writer is not None:
+                    raw_writer.append(RawDetectionCache.record_name(img_path),
+                                      box_res_rotate, score_res_rotate, label_res_rotate)
+                box_res_rotate, score_res_rotate, label_res_rotate = self.window_nms(box_res_rotate, score_res_rotate,
+                                                                                     label_res_rotate)
+
+                box_res_rotate_, score_res_rotate_, label_res_rotate_ = self.nms(box_res_rotate, score_res_rotate,
+                                                                                 label_res_rotate)
 
                 result_dict = {'boxes': np.array(box_res_rotate_), 'scores': np.array(score_res_rotate_),
                                'labels': np.array(label_res_rotate_), 'image_id': img_path}
                 result_queue.put_nowait(result_dict)
 
+            if raw_writer is not None:
+                raw_writer.close()
+            print('gpu %d: %s' % (gpu_id, planner.report()))
+
     def test_dota(self, det_net, real_test_img_list, txt_name):
 
         save_path = os.path.join('./test_dota', self.cfgs.VERSION)
 
+        pbar = tqdm(total=len(real_test_img_list))
+
+        # the cached images only need the nms
+        raw_cache = self.raw_cache()
+        cached = raw_cache.lookup(real_test_img_list) if raw_cache is not None else {}
+        real_test_img_list = [img_path for img_path in real_test_img_list if img_path not in cached]
+
         nr_records = len(real_test_img_list)
-        pbar = tqdm(total=nr_records)
         gpu_num = len(self.args.gpus.strip().split(','))
 
         nr_image = math.ceil(nr_records / gpu_num)
-        result_queue = Queue(5000)
+        result_queue = SharedResultRing(max_dets=self.args.max_dets_per_img)
         procs = []
 
         for i, gpu_id in enumerate(self.args.gpus.strip().split(',')):
             start = i * nr_image
             end = min(start + nr_image, nr_records)
             split_records = real_test_img_list[start:end]
-            proc = Process(target=self.worker, args=(int(gpu_id), split_records, det_net, result_queue))
+            proc = Process(target=self.worker, args=(int(gpu_id), split_records, det_net, result_queue, raw_cache))
             print('process:%d, start:%d, end:%d' % (i, start, end))
             proc.start()
             procs.append(proc)
 
-        for i in range(nr_records):
-            res = result_queue.get()
+        if self.args.show_box:
+            tools.makedirs(os.path.join(save_path, 'dota_img_vis'))
+        else:
+            store = DetectionStore(txt_name)
+        lock = threading.Lock()
 
+        def write_result(res):
             if self.args.show_box:
 
                 nake_name = res['image_id'].split('/')[-1]
-                tools.makedirs(os.path.join(save_path, 'dota_img_vis'))
                 draw_path = os.path.join(save_path, 'dota_img_vis', nake_name)
 
                 draw_img = np.array(cv2.imread(res['image_id']), np.float32)
@@ -322,59 +447,47 @@ class TestDOTA(object):
                                                                            scores=detected_scores,
                                                                            method=1,
                                                                            is_csl=True,
-                                                                           in_graph=False)
+                                                                           in_graph=False,
+                                                                           preview_max_len=self.args.vis_max_len or None)
                 cv2.imwrite(draw_path, final_detections)
 
             else:
-                CLASS_DOTA = self.name_label_map.keys()
-                write_handle = {}
-
-                tools.makedirs(os.path.join(save_path, 'dota_res'))
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle[sub_class] = open(os.path.join(save_path, 'dota_res', 'Task1_%s.txt' % sub_class), 'a+')
+                with lock:
+                    store.append(res['image_id'].split('/')[-1], res['boxes'], res['scores'], res['labels'])
 
-                for i, rbox in enumerate(res['boxes']):
-                    command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
-                                                                                     res['scores'][i],
-                                                                                     rbox[0], rbox[1], rbox[2], rbox[3],
-                                                                                     rbox[4], rbox[5], rbox[6], rbox[7],)
-                    write_handle[self.label_name_map[res['labels'][i]]].write(command)
+            with lock:
+                pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+                pbar.update(1)
 
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle[sub_class].close()
+        if len(cached) > 0:
+            print('%d images from the raw detection cache %s' % (len(cached), raw_cache.path))
+        for img_path, (boxes, scores, labels) in cached.items():
+            boxes, scores, labels = self.nms(*self.window_nms(boxes, scores, labels))
+            write_result({'boxes': boxes, 'scores': scores, 'labels': labels, 'image_id': img_path})
 
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
-
-            pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
-
-            pbar.update(1)
+        # several writer threads drain the shared memory ring filled by the workers
+        result_queue.drain(write_result, nr_records, self.args.num_writers)
 
         for p in procs:
             p.join()
 
-    def get_test_image(self):
-        txt_name = '{}.txt'.format(self.cfgs.VERSION)
         if not self.args.show_box:
-            if not os.path.exists(txt_name):
-                fw = open(txt_name, 'w')
-                fw.close()
+            store.export_dota(os.path.join(save_path, 'dota_res'), self.label_name_map)
+            store.close()
 
-            fr = open(txt_name, 'r')
-            img_filter = fr.readlines()
+    def get_test_image(self):
+        txt_name = '{}.det'.format(self.cfgs.VERSION)
+        if not self.args.show_box:
+            store = DetectionStore(txt_name)
+            img_filter = set(store.names())
+            store.close()
             print('****************************' * 3)
-            print('Already tested imgs:', img_filter)
+            print('Already tested imgs:', len(img_filter))
             print('****************************' * 3)
-            fr.close()
 
             test_imgname_list = [os.path.join(self.args.test_dir, img_name) for img_name in os.listdir(self.args.test_dir)
                                  if img_name.endswith(('.jpg', '.png', '.jpeg', '.tif', '.tiff')) and
-                                 (img_name + '\n' not in img_filter)]
+                                 (img_name not in img_filter)]
         else:
             test_imgname_list = [os.path.join(self.args.test_dir, img_name) for img_name in os.listdir(self.args.test_dir)
                                  if img_name.endswith(('.jpg', '.png', '.jpeg', '.tif', '.tiff'))]
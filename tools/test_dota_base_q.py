@@ -10,7 +10,8 @@ from __future__ import print_function
 import argparse
 import math
 import os
-from multiprocessing import Queue, Process
+import threading
+from multiprocessing import Process
 
 import cv2
 import numpy as np
@@ -23,7 +24,9 @@ from tqdm import tqdm
 from alpharotate.libs.label_name_dict.label_dict import LabelMap
 from alpharotate.libs.utils import nms_rotate
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+from alpharotate.utils.tile_planner import TilePlanner, Window
 from alpharotate.utils import tools
+from alpharotate.utils.shared_ring_buffer import SharedResultRing
 
 
 def parse_args():
@@ -43,6 +46,9 @@ def parse_args():
                         action='store_true')
     parser.add_argument('--cpu_nms', '-cn', default=False,
                         action='store_true')
+    parser.add_argument('--tile_min_std', dest='tile_min_std',
+                        help='skip the windows whose gray std is lower (no content), 0 keeps all windows',
+                        default=1.0, type=float)
     parser.add_argument('--num_imgs', dest='num_imgs',
                         help='test image number',
                         default=np.inf, type=int)
@@ -58,6 +64,12 @@ def parse_args():
     parser.add_argument('--w_overlap', dest='w_overlap',
                         help='width overlap',
                         default=150, type=int)
+    parser.add_argument('--num_writers', dest='num_writers',
+                        help='number of threads writing the results',
+                        default=4, type=int)
+    parser.add_argument('--max_dets_per_img', dest='max_dets_per_img',
+                        help='detections of one image that fit in a shared memory slot',
+                        default=5000, type=int)
     args = parser.parse_args()
     return args
 
@@ -103,6 +115,9 @@ class TestDOTA(object):
                 restorer.restore(sess, restore_ckpt)
                 print('restore model %d ...' % gpu_id)
 
+            planner = TilePlanner(min_std=self.args.tile_min_std)
+            window = Window(self.args.h_len, self.args.w_len, self.args.h_overlap, self.args.w_overlap)
+
             for img_path in images:
 
                 # if 'P0016' not in img_path:
@@ -133,84 +148,75 @@ class TestDOTA(object):
                     img = temp
                     imgW = self.args.w_len
 
-                for hh in range(0, imgH, self.args.h_len - self.args.h_overlap):
-                    if imgH - hh - 1 < self.args.h_len:
-                        hh_ = imgH - self.args.h_len
-                    else:
-                        hh_ = hh
-                    for ww in range(0, imgW, self.args.w_len - self.args.w_overlap):
-                        if imgW - ww - 1 < self.args.w_len:
-                            ww_ = imgW - self.args.w_len
+                for hh_, ww_ in planner.plan(img, window):
+                    src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
+
+                    for short_size in img_short_side_len_list:
+                        max_len = self.cfgs.IMG_MAX_LENGTH
+                        if self.args.h_len < self.args.w_len:
+                            new_h, new_w = short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
                         else:
-                            ww_ = ww
-                        src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
-
-                        for short_size in img_short_side_len_list:
-                            max_len = self.cfgs.IMG_MAX_LENGTH
-                            if self.args.h_len < self.args.w_len:
-                                new_h, new_w = short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
-                            else:
-                                new_h, new_w = min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
-                            img_resize = cv2.resize(src_img, (new_w, new_h))
-
-                            resized_img, det_boxes_r_, det_scores_r_, det_category_r_ = \
+                            new_h, new_w = min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
+                        img_resize = cv2.resize(src_img, (new_w, new_h))
+
+                        resized_img, det_boxes_r_, det_scores_r_, det_category_r_ = \
+                            sess.run(
+                                [img_batch, detection_boxes, detection_scores, detection_category],
+                                feed_dict={img_plac: img_resize[:, :, ::-1]}
+                            )
+
+                        resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
+                        src_h, src_w = src_img.shape[0], src_img.shape[1]
+
+                        if len(det_boxes_r_) > 0:
+                            # det_boxes_r_ = forward_convert(det_boxes_r_, False)
+                            det_boxes_r_[:, 0::2] *= (src_w / resized_w)
+                            det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+
+                            for ii in range(len(det_boxes_r_)):
+                                box_rotate = det_boxes_r_[ii]
+                                box_rotate[0::2] = box_rotate[0::2] + ww_
+                                box_rotate[1::2] = box_rotate[1::2] + hh_
+                                box_res_rotate.append(box_rotate)
+                                label_res_rotate.append(det_category_r_[ii])
+                                score_res_rotate.append(det_scores_r_[ii])
+
+                        if self.args.flip_img:
+                            det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
                                 sess.run(
-                                    [img_batch, detection_boxes, detection_scores, detection_category],
-                                    feed_dict={img_plac: img_resize[:, :, ::-1]}
+                                    [detection_boxes, detection_scores, detection_category],
+                                    feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
                                 )
+                            if len(det_boxes_r_flip) > 0:
+                                # det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
+                                det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
+
+                                for ii in range(len(det_boxes_r_flip)):
+                                    box_rotate = det_boxes_r_flip[ii]
+                                    box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
+                                    box_rotate[1::2] = box_rotate[1::2] + hh_
+                                    box_res_rotate.append(box_rotate)
+                                    label_res_rotate.append(det_category_r_flip[ii])
+                                    score_res_rotate.append(det_scores_r_flip[ii])
 
-                            resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
-                            src_h, src_w = src_img.shape[0], src_img.shape[1]
-
-                            if len(det_boxes_r_) > 0:
-                                # det_boxes_r_ = forward_convert(det_boxes_r_, False)
-                                det_boxes_r_[:, 0::2] *= (src_w / resized_w)
-                                det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+                            det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
+                                sess.run(
+                                    [detection_boxes, detection_scores, detection_category],
+                                    feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
+                                )
+                            if len(det_boxes_r_flip) > 0:
+                                # det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
+                                det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
 
-                                for ii in range(len(det_boxes_r_)):
-                                    box_rotate = det_boxes_r_[ii]
+                                for ii in range(len(det_boxes_r_flip)):
+                                    box_rotate = det_boxes_r_flip[ii]
                                     box_rotate[0::2] = box_rotate[0::2] + ww_
-                                    box_rotate[1::2] = box_rotate[1::2] + hh_
+                                    box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
                                     box_res_rotate.append(box_rotate)
-                                    label_res_rotate.append(det_category_r_[ii])
-                                    score_res_rotate.append(det_scores_r_[ii])
-
-                            if self.args.flip_img:
-                                det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                    sess.run(
-                                        [detection_boxes, detection_scores, detection_category],
-                                        feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
-                                    )
-                                if len(det_boxes_r_flip) > 0:
-                                    # det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                    det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_flip)):
-                                        box_rotate = det_boxes_r_flip[ii]
-                                        box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
-                                        box_rotate[1::2] = box_rotate[1::2] + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_flip[ii])
-                                        score_res_rotate.append(det_scores_r_flip[ii])
-
-                                det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                    sess.run(
-                                        [detection_boxes, detection_scores, detection_category],
-                                        feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
-                                    )
-                                if len(det_boxes_r_flip) > 0:
-                                    # det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                    det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_flip)):
-                                        box_rotate = det_boxes_r_flip[ii]
-                                        box_rotate[0::2] = box_rotate[0::2] + ww_
-                                        box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_flip[ii])
-                                        score_res_rotate.append(det_scores_r_flip[ii])
+                                    label_res_rotate.append(det_category_r_flip[ii])
+                                    score_res_rotate.append(det_scores_r_flip[ii])
 
                 box_res_rotate = np.array(box_res_rotate)
                 label_res_rotate = np.array(label_res_rotate)
@@ -272,6 +278,8 @@ class TestDOTA(object):
                                'labels': np.array(label_res_rotate_), 'image_id': img_path}
                 result_queue.put_nowait(result_dict)
 
+            print('gpu %d: %s' % (gpu_id, planner.report()))
+
     def test_dota(self, det_net, real_test_img_list, txt_name):
 
         save_path = os.path.join('./test_dota', self.cfgs.VERSION)
@@ -281,7 +289,7 @@ class TestDOTA(object):
         gpu_num = len(self.args.gpus.strip().split(','))
 
         nr_image = math.ceil(nr_records / gpu_num)
-        result_queue = Queue(500)
+        result_queue = SharedResultRing(max_dets=self.args.max_dets_per_img)
         procs = []
 
         for i, gpu_id in enumerate(self.args.gpus.strip().split(',')):
@@ -293,13 +301,15 @@ class TestDOTA(object):
             proc.start()
             procs.append(proc)
 
-        for i in range(nr_records):
-            res = result_queue.get()
+        if self.args.show_box:
+            tools.makedirs(os.path.join(save_path, 'dota_img_vis'))
+        lock = threading.Lock()
+
+        def write_result(res):
 
             if self.args.show_box:
 
                 nake_name = res['image_id'].split('/')[-1]
-                tools.makedirs(os.path.join(save_path, 'dota_img_vis'))
                 draw_path = os.path.join(save_path, 'dota_img_vis', nake_name)
 
                 draw_img = np.array(cv2.imread(res['image_id']), np.float32)
@@ -322,34 +332,38 @@ class TestDOTA(object):
                 cv2.imwrite(draw_path, final_detections)
 
             else:
-                CLASS_DOTA = self.name_label_map.keys()
-                write_handle = {}
-
-                tools.makedirs(os.path.join(save_path, 'dota_res'))
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle[sub_class] = open(os.path.join(save_path, 'dota_res', 'Task1_%s.txt' % sub_class), 'a+')
-
-                for i, rbox in enumerate(res['boxes']):
-                    command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
-                                                                                     res['scores'][i],
-                                                                                     rbox[0], rbox[1], rbox[2], rbox[3],
-                                                                                     rbox[4], rbox[5], rbox[6], rbox[7],)
-                    write_handle[self.label_name_map[res['labels'][i]]].write(command)
-
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle[sub_class].close()
-
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
-
-            pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
-
-            pbar.update(1)
+                with lock:
+                    CLASS_DOTA = self.name_label_map.keys()
+                    write_handle = {}
+
+                    tools.makedirs(os.path.join(save_path, 'dota_res'))
+                    for sub_class in CLASS_DOTA:
+                        if sub_class == 'back_ground':
+                            continue
+                        write_handle[sub_class] = open(os.path.join(save_path, 'dota_res', 'Task1_%s.txt' % sub_class), 'a+')
+
+                    for i, rbox in enumerate(res['boxes']):
+                        command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
+                                                                                         res['scores'][i],
+                                                                                         rbox[0], rbox[1], rbox[2], rbox[3],
+                                                                                         rbox[4], rbox[5], rbox[6], rbox[7],)
+                        write_handle[self.label_name_map[res['labels'][i]]].write(command)
+
+                    for sub_class in CLASS_DOTA:
+                        if sub_class == 'back_ground':
+                            continue
+                        write_handle[sub_class].close()
+
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
+
+            with lock:
+                pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+                pbar.update(1)
+
+        # several writer threads drain the shared memory ring filled by the workers
+        result_queue.drain(write_result, nr_records, self.args.num_writers)
 
         for p in procs:
             p.join()
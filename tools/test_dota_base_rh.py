@@ -11,7 +11,8 @@ import argparse
 import math
 import os
 import sys
-from multiprocessing import Queue, Process
+import threading
+from multiprocessing import Process
 
 import cv2
 import numpy as np
@@ -21,6 +22,7 @@ from tqdm import tqdm
 sys.path.append("../")
 
 from alpharotate.utils import tools
+from alpharotate.utils.shared_ring_buffer import SharedResultRing
 from alpharotate.libs.label_name_dict.label_dict import LabelMap
 from alpharotate.libs.utils.draw_box_in_img import DrawBox
 from alpharotate.libs.utils.coordinate_convert import forward_convert, backward_convert
@@ -28,6 +30,7 @@ from alpharotate.libs.utils import nms_rotate
 from alpharotate.libs.utils import nms
 from alpharotate.libs.utils.rotate_polygon_nms import rotate_gpu_nms
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+from alpharotate.utils.tile_planner import TilePlanner, Window
 
 
 def parse_args():
@@ -50,6 +53,9 @@ def parse_args():
                         action='store_true')
     parser.add_argument('--cpu_nms', '-cn', default=False,
                         action='store_true')
+    parser.add_argument('--tile_min_std', dest='tile_min_std',
+                        help='skip the windows whose gray std is lower (no content), 0 keeps all windows',
+                        default=1.0, type=float)
     parser.add_argument('--num_imgs', dest='num_imgs',
                         help='test image number',
                         default=np.inf, type=int)
@@ -65,6 +71,12 @@ def parse_args():
     parser.add_argument('--w_overlap', dest='w_overlap',
                         help='width overlap',
                         default=150, type=int)
+    parser.add_argument('--num_writers', dest='num_writers',
+                        help='number of threads writing the results',
+                        default=4, type=int)
+    parser.add_argument('--max_dets_per_img', dest='max_dets_per_img',
+                        help='detections of one image that fit in a shared memory slot',
+                        default=5000, type=int)
     args = parser.parse_args()
     return args
 
@@ -77,7 +89,7 @@ class TestDOTA(object):
         label_map = LabelMap(cfgs)
         self.name_label_map, self.label_name_map = label_map.name2label(), label_map.label2name()
 
-    def worker(self, gpu_id, images, det_net, result_queue):
+    def worker(self, gpu_id, images, det_net, result_queue_r, result_queue_h):
         os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
 
         img_plac = tf.placeholder(dtype=tf.uint8, shape=[None, None, 3])  # is RGB. not BGR
@@ -111,6 +123,9 @@ class TestDOTA(object):
                 restorer.restore(sess, restore_ckpt)
                 print('restore model %d ...' % gpu_id)
 
+            planner = TilePlanner(min_std=self.args.tile_min_std)
+            window = Window(self.args.h_len, self.args.w_len, self.args.h_overlap, self.args.w_overlap)
+
             for img_path in images:
 
                 # if 'P0016' not in img_path:
@@ -140,125 +155,116 @@ class TestDOTA(object):
                     img = temp
                     imgW = self.args.w_len
 
-                for hh in range(0, imgH, self.args.h_len - self.args.h_overlap):
-                    if imgH - hh - 1 < self.args.h_len:
-                        hh_ = imgH - self.args.h_len
-                    else:
-                        hh_ = hh
-                    for ww in range(0, imgW, self.args.w_len - self.args.w_overlap):
-                        if imgW - ww - 1 < self.args.w_len:
-                            ww_ = imgW - self.args.w_len
+                for hh_, ww_ in planner.plan(img, window):
+                    src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
+
+                    for short_size in img_short_side_len_list:
+                        max_len = self.cfgs.IMG_MAX_LENGTH
+                        if self.args.h_len < self.args.w_len:
+                            new_h, new_w = short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
                         else:
-                            ww_ = ww
-                        src_img = img[hh_:(hh_ + self.args.h_len), ww_:(ww_ + self.args.w_len), :]
-
-                        for short_size in img_short_side_len_list:
-                            max_len = self.cfgs.IMG_MAX_LENGTH
-                            if self.args.h_len < self.args.w_len:
-                                new_h, new_w = short_size, min(int(short_size * float(self.args.w_len) / self.args.h_len), max_len)
-                            else:
-                                new_h, new_w = min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
-                            img_resize = cv2.resize(src_img, (new_w, new_h))
-
-                            resized_img, det_boxes_h_, det_scores_h_, det_category_h_, \
-                            det_boxes_r_, det_scores_r_, det_category_r_ = \
+                            new_h, new_w = min(int(short_size * float(self.args.h_len) / self.args.w_len), max_len), short_size
+                        img_resize = cv2.resize(src_img, (new_w, new_h))
+
+                        resized_img, det_boxes_h_, det_scores_h_, det_category_h_, \
+                        det_boxes_r_, det_scores_r_, det_category_r_ = \
+                            sess.run(
+                                [img_batch, detection_boxes_h, detection_scores_h, detection_category_h,
+                                 detection_boxes_r, detection_scores_r, detection_category_r],
+                                feed_dict={img_plac: img_resize[:, :, ::-1]}
+                            )
+
+                        resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
+                        src_h, src_w = src_img.shape[0], src_img.shape[1]
+
+                        if len(det_boxes_h_) > 0:
+                            det_boxes_h_[:, 0::2] *= (src_w / resized_w)
+                            det_boxes_h_[:, 1::2] *= (src_h / resized_h)
+                            for ii in range(len(det_boxes_h_)):
+                                box = det_boxes_h_[ii]
+                                box[0::2] = box[0::2] + ww_
+                                box[1::2] = box[1::2] + hh_
+                                box_res.append(box)
+                                label_res.append(det_category_h_[ii])
+                                score_res.append(det_scores_h_[ii])
+
+                        if len(det_boxes_r_) > 0:
+                            det_boxes_r_ = forward_convert(det_boxes_r_, False)
+                            det_boxes_r_[:, 0::2] *= (src_w / resized_w)
+                            det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+
+                            for ii in range(len(det_boxes_r_)):
+                                box_rotate = det_boxes_r_[ii]
+                                box_rotate[0::2] = box_rotate[0::2] + ww_
+                                box_rotate[1::2] = box_rotate[1::2] + hh_
+                                box_res_rotate.append(box_rotate)
+                                label_res_rotate.append(det_category_r_[ii])
+                                score_res_rotate.append(det_scores_r_[ii])
+
+                        if self.args.flip_img:
+                            det_boxes_h_flip, det_scores_h_flip, det_category_h_flip, \
+                            det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
                                 sess.run(
-                                    [img_batch, detection_boxes_h, detection_scores_h, detection_category_h,
+                                    [detection_boxes_h, detection_scores_h, detection_category_h,
                                      detection_boxes_r, detection_scores_r, detection_category_r],
-                                    feed_dict={img_plac: img_resize[:, :, ::-1]}
+                                    feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
                                 )
 
-                            resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
-                            src_h, src_w = src_img.shape[0], src_img.shape[1]
+                            if len(det_boxes_h_) > 0:
+                                det_boxes_h_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_h_flip[:, 1::2] *= (src_h / resized_h)
+                                for ii in range(len(det_boxes_h_flip)):
+                                    box = det_boxes_h_flip[ii]
+                                    box[0::2] = src_w - box[0::2] + ww_
+                                    box[1::2] = box[1::2] + hh_
+                                    box_res.append(box)
+                                    label_res.append(det_category_h_flip[ii])
+                                    score_res.append(det_scores_h_flip[ii])
+
+                            if len(det_boxes_r_flip) > 0:
+                                det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
+                                det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
+
+                                for ii in range(len(det_boxes_r_flip)):
+                                    box_rotate = det_boxes_r_flip[ii]
+                                    box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
+                                    box_rotate[1::2] = box_rotate[1::2] + hh_
+                                    box_res_rotate.append(box_rotate)
+                                    label_res_rotate.append(det_category_r_flip[ii])
+                                    score_res_rotate.append(det_scores_r_flip[ii])
+
+                            det_boxes_h_flip, det_scores_h_flip, det_category_h_flip,\
+                            det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
+                                sess.run(
+                                    [detection_boxes_h, detection_scores_h, detection_category_h,
+                                     detection_boxes_r, detection_scores_r, detection_category_r],
+                                    feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
+                                )
 
                             if len(det_boxes_h_) > 0:
-                                det_boxes_h_[:, 0::2] *= (src_w / resized_w)
-                                det_boxes_h_[:, 1::2] *= (src_h / resized_h)
-                                for ii in range(len(det_boxes_h_)):
-                                    box = det_boxes_h_[ii]
+                                det_boxes_h_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_h_flip[:, 1::2] *= (src_h / resized_h)
+                                for ii in range(len(det_boxes_h_flip)):
+                                    box = det_boxes_h_flip[ii]
                                     box[0::2] = box[0::2] + ww_
-                                    box[1::2] = box[1::2] + hh_
+                                    box[1::2] = src_h - box[1::2] + hh_
                                     box_res.append(box)
-                                    label_res.append(det_category_h_[ii])
-                                    score_res.append(det_scores_h_[ii])
+                                    label_res.append(det_category_h_flip[ii])
+                                    score_res.append(det_scores_h_flip[ii])
 
-                            if len(det_boxes_r_) > 0:
-                                det_boxes_r_ = forward_convert(det_boxes_r_, False)
-                                det_boxes_r_[:, 0::2] *= (src_w / resized_w)
-                                det_boxes_r_[:, 1::2] *= (src_h / resized_h)
+                            if len(det_boxes_r_flip) > 0:
+                                det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
+                                det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
+                                det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
 
-                                for ii in range(len(det_boxes_r_)):
-                                    box_rotate = det_boxes_r_[ii]
+                                for ii in range(len(det_boxes_r_flip)):
+                                    box_rotate = det_boxes_r_flip[ii]
                                     box_rotate[0::2] = box_rotate[0::2] + ww_
-                                    box_rotate[1::2] = box_rotate[1::2] + hh_
+                                    box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
                                     box_res_rotate.append(box_rotate)
-                                    label_res_rotate.append(det_category_r_[ii])
-                                    score_res_rotate.append(det_scores_r_[ii])
-
-                            if self.args.flip_img:
-                                det_boxes_h_flip, det_scores_h_flip, det_category_h_flip, \
-                                det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                    sess.run(
-                                        [detection_boxes_h, detection_scores_h, detection_category_h,
-                                         detection_boxes_r, detection_scores_r, detection_category_r],
-                                        feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
-                                    )
-
-                                if len(det_boxes_h_) > 0:
-                                    det_boxes_h_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_h_flip[:, 1::2] *= (src_h / resized_h)
-                                    for ii in range(len(det_boxes_h_flip)):
-                                        box = det_boxes_h_flip[ii]
-                                        box[0::2] = src_w - box[0::2] + ww_
-                                        box[1::2] = box[1::2] + hh_
-                                        box_res.append(box)
-                                        label_res.append(det_category_h_flip[ii])
-                                        score_res.append(det_scores_h_flip[ii])
-
-                                if len(det_boxes_r_flip) > 0:
-                                    det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                    det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_flip)):
-                                        box_rotate = det_boxes_r_flip[ii]
-                                        box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
-                                        box_rotate[1::2] = box_rotate[1::2] + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_flip[ii])
-                                        score_res_rotate.append(det_scores_r_flip[ii])
-
-                                det_boxes_h_flip, det_scores_h_flip, det_category_h_flip,\
-                                det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                    sess.run(
-                                        [detection_boxes_h, detection_scores_h, detection_category_h,
-                                         detection_boxes_r, detection_scores_r, detection_category_r],
-                                        feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
-                                    )
-
-                                if len(det_boxes_h_) > 0:
-                                    det_boxes_h_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_h_flip[:, 1::2] *= (src_h / resized_h)
-                                    for ii in range(len(det_boxes_h_flip)):
-                                        box = det_boxes_h_flip[ii]
-                                        box[0::2] = box[0::2] + ww_
-                                        box[1::2] = src_h - box[1::2] + hh_
-                                        box_res.append(box)
-                                        label_res.append(det_category_h_flip[ii])
-                                        score_res.append(det_scores_h_flip[ii])
-
-                                if len(det_boxes_r_flip) > 0:
-                                    det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                    det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_flip)):
-                                        box_rotate = det_boxes_r_flip[ii]
-                                        box_rotate[0::2] = box_rotate[0::2] + ww_
-                                        box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_flip[ii])
-                                        score_res_rotate.append(det_scores_r_flip[ii])
+                                    label_res_rotate.append(det_category_r_flip[ii])
+                                    score_res_rotate.append(det_scores_r_flip[ii])
 
                 box_res = np.array(box_res)
                 label_res = np.array(label_res)
@@ -346,11 +352,12 @@ class TestDOTA(object):
                     score_res_.extend(np.array(tmp_score_h)[inx])
                     label_res_.extend(np.array(tmp_label_h)[inx])
 
-                result_dict = {'boxes_h': np.array(box_res_), 'scores_h': np.array(score_res_),
-                               'labels_h': np.array(label_res_), 'boxes_r': np.array(box_res_rotate_),
-                               'scores_r': np.array(score_res_rotate_),
-                               'labels_r': np.array(label_res_rotate_), 'image_id': img_path}
-                result_queue.put_nowait(result_dict)
+                result_queue_r.put_nowait({'boxes': np.array(box_res_rotate_), 'scores': np.array(score_res_rotate_),
+                                           'labels': np.array(label_res_rotate_), 'image_id': img_path})
+                result_queue_h.put_nowait({'boxes': np.array(box_res_), 'scores': np.array(score_res_),
+                                           'labels': np.array(label_res_), 'image_id': img_path})
+
+            print('gpu %d: %s' % (gpu_id, planner.report()))
 
     def test_dota(self, det_net, real_test_img_list, txt_name):
 
@@ -361,98 +368,118 @@ class TestDOTA(object):
         gpu_num = len(self.args.gpus.strip().split(','))
 
         nr_image = math.ceil(nr_records / gpu_num)
-        result_queue = Queue(500)
+        # rotated quads and horizontal boxes do not share a slot layout, one ring each
+        result_queue_r = SharedResultRing(max_dets=self.args.max_dets_per_img, box_dim=8)
+        result_queue_h = SharedResultRing(max_dets=self.args.max_dets_per_img, box_dim=4)
         procs = []
 
         for i, gpu_id in enumerate(self.args.gpus.strip().split(',')):
             start = i * nr_image
             end = min(start + nr_image, nr_records)
             split_records = real_test_img_list[start:end]
-            proc = Process(target=self.worker, args=(int(gpu_id), split_records, det_net, result_queue))
+            proc = Process(target=self.worker,
+                           args=(int(gpu_id), split_records, det_net, result_queue_r, result_queue_h))
             print('process:%d, start:%d, end:%d' % (i, start, end))
             proc.start()
             procs.append(proc)
 
-        for i in range(nr_records):
-            res = result_queue.get()
+        if self.args.show_box:
+            tools.makedirs(os.path.join(save_path, 'dota_img_vis_r'))
+            tools.makedirs(os.path.join(save_path, 'dota_img_vis_h'))
+        else:
+            tools.makedirs(os.path.join(save_path, 'dota_res_r'))
+            tools.makedirs(os.path.join(save_path, 'dota_res_h'))
+        lock = threading.Lock()
+        # an image is done once both of its results are written
+        num_written = {}
+
+        def write_result(res, mode):
 
             if self.args.show_box:
 
                 nake_name = res['image_id'].split('/')[-1]
-                tools.makedirs(os.path.join(save_path, 'dota_img_vis_r'))
-                draw_path_r = os.path.join(save_path, 'dota_img_vis_r', nake_name)
+                draw_path = os.path.join(save_path, 'dota_img_vis_%s' % mode, nake_name)
 
                 draw_img = np.array(cv2.imread(res['image_id']), np.float32)
-                detected_boxes = backward_convert(res['boxes_r'], with_label=False)
+                if mode == 'r':
+                    detected_boxes = backward_convert(res['boxes'], with_label=False)
+                else:
+                    detected_boxes = res['boxes']
 
-                detected_indices = res['scores_r'] >= self.cfgs.VIS_SCORE
-                detected_scores = res['scores_r'][detected_indices]
+                detected_indices = res['scores'] >= self.cfgs.VIS_SCORE
+                detected_scores = res['scores'][detected_indices]
                 detected_boxes = detected_boxes[detected_indices]
-                detected_categories = res['labels_r'][detected_indices]
+                detected_categories = res['labels'][detected_indices]
 
                 drawer = DrawBox(self.cfgs)
 
-                final_detections = drawer.draw_boxes_with_label_and_scores(draw_img,
-                                                                           boxes=detected_boxes,
-                                                                           labels=detected_categories,
-                                                                           scores=detected_scores,
-                                                                           method=1,
-                                                                           is_csl=True,
-                                                                           in_graph=False)
-                cv2.imwrite(draw_path_r, final_detections)
-
-                tools.makedirs(os.path.join(save_path, 'dota_img_vis_h'))
-                draw_path_h = os.path.join(save_path, 'dota_img_vis_h', nake_name)
-                detected_indices = res['scores_h'] >= self.cfgs.VIS_SCORE
-                detected_scores = res['scores_h'][detected_indices]
-                detected_boxes = res['boxes_h'][detected_indices]
-                detected_categories = res['labels_h'][detected_indices]
-
-                final_detections = drawer.draw_boxes_with_label_and_scores(draw_img,
-                                                                           boxes=detected_boxes,
-                                                                           labels=detected_categories,
-                                                                           scores=detected_scores,
-                                                                           method=0,
-                                                                           in_graph=False)
-                cv2.imwrite(draw_path_h, final_detections)
+                if mode == 'r':
+                    final_detections = drawer.draw_boxes_with_label_and_scores(draw_img,
+                                                                               boxes=detected_boxes,
+                                                                               labels=detected_categories,
+                                                                               scores=detected_scores,
+                                                                               method=1,
+                                                                               is_csl=True,
+                                                                               in_graph=False)
+                else:
+                    final_detections = drawer.draw_boxes_with_label_and_scores(draw_img,
+                                                                               boxes=detected_boxes,
+                                                                               labels=detected_categories,
+                                                                               scores=detected_scores,
+                                                                               method=0,
+                                                                               in_graph=False)
+                cv2.imwrite(draw_path, final_detections)
 
             else:
-                CLASS_DOTA = self.name_label_map.keys()
-                write_handle_r, write_handle_h = {}, {}
-
-                tools.makedirs(os.path.join(save_path, 'dota_res_r'))
-                tools.makedirs(os.path.join(save_path, 'dota_res_h'))
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle_r[sub_class] = open(os.path.join(save_path, 'dota_res_r', 'Task1_%s.txt' % sub_class), 'a+')
-                    write_handle_h[sub_class] = open(os.path.join(save_path, 'dota_res_h', 'Task2_%s.txt' % sub_class), 'a+')
-
-                for i, rbox in enumerate(res['boxes_r']):
-                    command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
-                                                                                     res['scores_r'][i],
-                                                                                     rbox[0], rbox[1], rbox[2], rbox[3],
-                                                                                     rbox[4], rbox[5], rbox[6], rbox[7],)
-                    write_handle_r[self.label_name_map[res['labels_r'][i]]].write(command)
-                for i, hbox in enumerate(res['boxes_h']):
-                    command = '%s %.3f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
-                                                                 res['scores_h'][i],
-                                                                 hbox[0], hbox[1], hbox[2], hbox[3])
-                    write_handle_h[self.label_name_map[res['labels_h'][i]]].write(command)
-
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle_r[sub_class].close()
-                    write_handle_h[sub_class].close()
-
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
-
-            pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
-
-            pbar.update(1)
+                with lock:
+                    CLASS_DOTA = self.name_label_map.keys()
+                    write_handle = {}
+
+                    for sub_class in CLASS_DOTA:
+                        if sub_class == 'back_ground':
+                            continue
+                        if mode == 'r':
+                            write_handle[sub_class] = open(os.path.join(save_path, 'dota_res_r', 'Task1_%s.txt' % sub_class), 'a+')
+                        else:
+                            write_handle[sub_class] = open(os.path.join(save_path, 'dota_res_h', 'Task2_%s.txt' % sub_class), 'a+')
+
+                    for i, box in enumerate(res['boxes']):
+                        if mode == 'r':
+                            command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
+                                                                                             res['scores'][i],
+                                                                                             box[0], box[1], box[2], box[3],
+                                                                                             box[4], box[5], box[6], box[7],)
+                        else:
+                            command = '%s %.3f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
+                                                                         res['scores'][i],
+                                                                         box[0], box[1], box[2], box[3])
+                        write_handle[self.label_name_map[res['labels'][i]]].write(command)
+
+                    for sub_class in CLASS_DOTA:
+                        if sub_class == 'back_ground':
+                            continue
+                        write_handle[sub_class].close()
+
+            with lock:
+                num_written[res['image_id']] = num_written.get(res['image_id'], 0) + 1
+                if num_written[res['image_id']] < 2:
+                    return
+                del num_written[res['image_id']]
+
+                if not self.args.show_box:
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
+
+                pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+                pbar.update(1)
+
+        # several writer threads drain each of the shared memory rings filled by the workers
+        drain_h = threading.Thread(target=result_queue_h.drain,
+                                   args=(lambda res: write_result(res, 'h'), nr_records, self.args.num_writers))
+        drain_h.start()
+        result_queue_r.drain(lambda res: write_result(res, 'r'), nr_records, self.args.num_writers)
+        drain_h.join()
 
         for p in procs:
             p.join()
@@ -10,20 +10,22 @@ from __future__ import print_function
 import argparse
 import math
 import os
-from multiprocessing import Queue, Process
+import threading
+from multiprocessing import Process
 
 import cv2
 import numpy as np
 import tensorflow as tf
-from alpharotate.libs.utils.rotate_polygon_nms import rotate_gpu_nms
 from tqdm import tqdm
 
 from alpharotate.libs.label_name_dict.label_dict import LabelMap
-from alpharotate.libs.utils import nms_rotate
-from alpharotate.libs.utils.coordinate_convert import forward_convert, backward_convert
+from alpharotate.libs.utils.coordinate_convert import backward_convert
 from alpharotate.libs.utils.draw_box_in_img import DrawBox
 from alpharotate.utils import tools
+from alpharotate.utils.shared_ring_buffer import SharedResultRing
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
+from alpharotate.utils.tile_planner import TilePlanner, Window
+from alpharotate.utils.tta import build_views, TTAEngine, fuse_detections
 
 
 def parse_args():
@@ -43,6 +45,15 @@ def parse_args():
                         action='store_true')
     parser.add_argument('--cpu_nms', '-cn', default=False,
                         action='store_true')
+    parser.add_argument('--fusion', dest='fusion',
+                        help='fusion of the TTA results, nms or wbf (weighted box fusion)',
+                        default='nms', choices=['nms', 'wbf'], type=str)
+    parser.add_argument('--time_budget', dest='time_budget',
+                        help='TTA seconds per image, the remaining views are skipped (0: no limit)',
+                        default=0, type=float)
+    parser.add_argument('--tile_min_std', dest='tile_min_std',
+                        help='skip the windows whose gray std is lower (no content), 0 keeps all windows',
+                        default=1.0, type=float)
     parser.add_argument('--num_imgs', dest='num_imgs',
                         help='test image number',
                         default=np.inf, type=int)
@@ -58,6 +69,12 @@ def parse_args():
     parser.add_argument('--w_overlap', dest='w_overlap',
                         help='width overlap',
                         default=[150, 200, 300, 300, 400], type=list)
+    parser.add_argument('--num_writers', dest='num_writers',
+                        help='number of threads writing the results',
+                        default=4, type=int)
+    parser.add_argument('--max_dets_per_img', dest='max_dets_per_img',
+                        help='detections of one image that fit in a shared memory slot',
+                        default=5000, type=int)
     args = parser.parse_args()
     return args
 
@@ -106,6 +123,27 @@ class TestDOTA(object):
                 restorer.restore(sess, restore_ckpt)
                 print('restore model %d ...' % gpu_id)
 
+            def detect(img_resize):
+                return sess.run([detection_boxes, detection_scores, detection_category],
+                                feed_dict={img_plac: img_resize})
+
+            windows = [Window(*w) for w in zip(self.args.h_len, self.args.w_len, self.args.h_overlap, self.args.w_overlap)]
+            img_short_side_len_list = self.cfgs.IMG_SHORT_SIDE_LEN if isinstance(self.cfgs.IMG_SHORT_SIDE_LEN, list) else [
+                self.cfgs.IMG_SHORT_SIDE_LEN]
+            img_short_side_len_list = [img_short_side_len_list[0]] if not self.args.multi_scale else img_short_side_len_list
+            views = build_views(windows, img_short_side_len_list, flips=(None, 'h', 'v') if self.args.flip_img else (None,))
+            planner = TilePlanner(min_std=self.args.tile_min_std)
+            tta = TTAEngine(views, detect, self.cfgs.IMG_MAX_LENGTH,
+                            time_budget=self.args.time_budget if self.args.time_budget > 0 else None,
+                            planner=planner)
+
+            threshold = {'roundabout': 0.1, 'tennis-court': 0.3, 'swimming-pool': 0.05, 'storage-tank': 0.2,
+                         'soccer-ball-field': 0.3, 'small-vehicle': 0.2, 'ship': 0.2, 'plane': 0.15,
+                         'large-vehicle': 0.1, 'helicopter': 0.2, 'harbor': 0.0001, 'ground-track-field': 0.3,
+                         'bridge': 0.0001, 'basketball-court': 0.3, 'baseball-diamond': 0.1,
+                         'container-crane': 0.05, 'airport': 0.5, 'helipad': 0.1}
+            threshold = dict([(label, threshold[name]) for label, name in self.label_name_map.items() if name in threshold])
+
             for img_path in images:
 
                 # if 'P0302' not in img_path:
@@ -114,170 +152,17 @@ class TestDOTA(object):
                 img = cv2.imread(img_path)
                 # img = np.load(img_path.replace('images', 'npy').replace('.png', '.npy'))
 
-                box_res_rotate = []
-                label_res_rotate = []
-                score_res_rotate = []
-
-                imgH = img.shape[0]
-                imgW = img.shape[1]
-
-                for h_len, w_len, h_overlap, w_overlap in zip(self.args.h_len, self.args.w_len, self.args.h_overlap, self.args.w_overlap):
-
-                    img_short_side_len_list = self.cfgs.IMG_SHORT_SIDE_LEN if isinstance(self.cfgs.IMG_SHORT_SIDE_LEN, list) else [
-                        self.cfgs.IMG_SHORT_SIDE_LEN]
-                    img_short_side_len_list = [img_short_side_len_list[0]] if not self.args.multi_scale else img_short_side_len_list
-
-                    if imgH < h_len:
-                        temp = np.zeros([h_len, imgW, 3], np.float32)
-                        temp[0:imgH, :, :] = img
-                        img = temp
-                        imgH = h_len
-
-                    if imgW < w_len:
-                        temp = np.zeros([imgH, w_len, 3], np.float32)
-                        temp[:, 0:imgW, :] = img
-                        img = temp
-                        imgW = w_len
-
-                    for hh in range(0, imgH, h_len - h_overlap):
-                        if imgH - hh - 1 < h_len:
-                            hh_ = imgH - h_len
-                        else:
-                            hh_ = hh
-                        for ww in range(0, imgW, w_len - w_overlap):
-                            if imgW - ww - 1 < w_len:
-                                ww_ = imgW - w_len
-                            else:
-                                ww_ = ww
-                            src_img = img[hh_:(hh_ + h_len), ww_:(ww_ + w_len), :]
-
-                            for short_size in img_short_side_len_list:
-                                max_len = self.cfgs.IMG_MAX_LENGTH
-                                if h_len < w_len:
-                                    new_h, new_w = short_size, min(int(short_size * float(w_len) / h_len), max_len)
-                                else:
-                                    new_h, new_w = min(int(short_size * float(h_len) / w_len), max_len), short_size
-                                img_resize = cv2.resize(src_img, (new_w, new_h))
-
-                                resized_img, det_boxes_r_, det_scores_r_, det_category_r_ = \
-                                    sess.run(
-                                        [img_batch, detection_boxes, detection_scores, detection_category],
-                                        feed_dict={img_plac: img_resize[:, :, ::-1]}
-                                    )
-
-                                resized_h, resized_w = resized_img.shape[1], resized_img.shape[2]
-                                src_h, src_w = src_img.shape[0], src_img.shape[1]
-
-                                if len(det_boxes_r_) > 0:
-                                    det_boxes_r_ = forward_convert(det_boxes_r_, False)
-                                    det_boxes_r_[:, 0::2] *= (src_w / resized_w)
-                                    det_boxes_r_[:, 1::2] *= (src_h / resized_h)
-
-                                    for ii in range(len(det_boxes_r_)):
-                                        box_rotate = det_boxes_r_[ii]
-                                        box_rotate[0::2] = box_rotate[0::2] + ww_
-                                        box_rotate[1::2] = box_rotate[1::2] + hh_
-                                        box_res_rotate.append(box_rotate)
-                                        label_res_rotate.append(det_category_r_[ii])
-                                        score_res_rotate.append(det_scores_r_[ii])
-
-                                if self.args.flip_img:
-                                    det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                        sess.run(
-                                            [detection_boxes, detection_scores, detection_category],
-                                            feed_dict={img_plac: cv2.flip(img_resize, flipCode=1)[:, :, ::-1]}
-                                        )
-                                    if len(det_boxes_r_flip) > 0:
-                                        det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                        det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                        det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                        for ii in range(len(det_boxes_r_flip)):
-                                            box_rotate = det_boxes_r_flip[ii]
-                                            box_rotate[0::2] = (src_w - box_rotate[0::2]) + ww_
-                                            box_rotate[1::2] = box_rotate[1::2] + hh_
-                                            box_res_rotate.append(box_rotate)
-                                            label_res_rotate.append(det_category_r_flip[ii])
-                                            score_res_rotate.append(det_scores_r_flip[ii])
-
-                                    det_boxes_r_flip, det_scores_r_flip, det_category_r_flip = \
-                                        sess.run(
-                                            [detection_boxes, detection_scores, detection_category],
-                                            feed_dict={img_plac: cv2.flip(img_resize, flipCode=0)[:, :, ::-1]}
-                                        )
-                                    if len(det_boxes_r_flip) > 0:
-                                        det_boxes_r_flip = forward_convert(det_boxes_r_flip, False)
-                                        det_boxes_r_flip[:, 0::2] *= (src_w / resized_w)
-                                        det_boxes_r_flip[:, 1::2] *= (src_h / resized_h)
-
-                                        for ii in range(len(det_boxes_r_flip)):
-                                            box_rotate = det_boxes_r_flip[ii]
-                                            box_rotate[0::2] = box_rotate[0::2] + ww_
-                                            box_rotate[1::2] = (src_h - box_rotate[1::2]) + hh_
-                                            box_res_rotate.append(box_rotate)
-                                            label_res_rotate.append(det_category_r_flip[ii])
-                                            score_res_rotate.append(det_scores_r_flip[ii])
-
-                box_res_rotate = np.array(box_res_rotate)
-                label_res_rotate = np.array(label_res_rotate)
-                score_res_rotate = np.array(score_res_rotate)
-
-                box_res_rotate_ = []
-                label_res_rotate_ = []
-                score_res_rotate_ = []
-                threshold = {'roundabout': 0.1, 'tennis-court': 0.3, 'swimming-pool': 0.05, 'storage-tank': 0.2,
-                             'soccer-ball-field': 0.3, 'small-vehicle': 0.2, 'ship': 0.2, 'plane': 0.15,
-                             'large-vehicle': 0.1, 'helicopter': 0.2, 'harbor': 0.0001, 'ground-track-field': 0.3,
-                             'bridge': 0.0001, 'basketball-court': 0.3, 'baseball-diamond': 0.1,
-                             'container-crane': 0.05, 'airport': 0.5, 'helipad': 0.1}
-
-                for sub_class in range(1, self.cfgs.CLASS_NUM + 1):
-                    index = np.where(label_res_rotate == sub_class)[0]
-                    if len(index) == 0:
-                        continue
-                    tmp_boxes_r = box_res_rotate[index]
-                    tmp_label_r = label_res_rotate[index]
-                    tmp_score_r = score_res_rotate[index]
-
-                    tmp_boxes_r_ = backward_convert(tmp_boxes_r, False)
-
-                    # cpu nms better than gpu nms (default)
-                    if self.args.cpu_nms:
-                        try:
-                            inx = nms_rotate.nms_rotate_cpu(boxes=np.array(tmp_boxes_r_),
-                                                            scores=np.array(tmp_score_r),
-                                                            iou_threshold=threshold[self.label_name_map[sub_class]],
-                                                            max_output_size=5000)
-
-                        except:
-                            tmp_boxes_r_ = np.array(tmp_boxes_r_)
-                            tmp = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                            tmp[:, 0:-1] = tmp_boxes_r_
-                            tmp[:, -1] = np.array(tmp_score_r)
-                            # Note: the IoU of two same rectangles is 0
-                            jitter = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                            jitter[:, 0] += np.random.rand(tmp_boxes_r_.shape[0], ) / 1000
-                            inx = rotate_gpu_nms(np.array(tmp, np.float32) + np.array(jitter, np.float32),
-                                                 float(threshold[self.label_name_map[sub_class]]), 0)
-                    else:
-                        tmp_boxes_r_ = np.array(tmp_boxes_r_)
-                        tmp = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                        tmp[:, 0:-1] = tmp_boxes_r_
-                        tmp[:, -1] = np.array(tmp_score_r)
-                        # Note: the IoU of two same rectangles is 0
-                        jitter = np.zeros([tmp_boxes_r_.shape[0], tmp_boxes_r_.shape[1] + 1])
-                        jitter[:, 0] += np.random.rand(tmp_boxes_r_.shape[0], ) / 1000
-                        inx = rotate_gpu_nms(np.array(tmp, np.float32) + np.array(jitter, np.float32),
-                                             float(threshold[self.label_name_map[sub_class]]), 0)
-
-                    box_res_rotate_.extend(np.array(tmp_boxes_r)[inx])
-                    score_res_rotate_.extend(np.array(tmp_score_r)[inx])
-                    label_res_rotate_.extend(np.array(tmp_label_r)[inx])
+                box_res_rotate, score_res_rotate, label_res_rotate, num_views = tta.run(img)
+                box_res_rotate_, score_res_rotate_, label_res_rotate_ = fuse_detections(
+                    box_res_rotate, score_res_rotate, label_res_rotate, threshold,
+                    method=self.args.fusion, num_views=num_views, cpu_nms=self.args.cpu_nms)
 
                 result_dict = {'boxes': np.array(box_res_rotate_), 'scores': np.array(score_res_rotate_),
                                'labels': np.array(label_res_rotate_), 'image_id': img_path}
                 result_queue.put_nowait(result_dict)
 
+            print('gpu %d: %s' % (gpu_id, planner.report()))
+
     def test_dota(self, det_net, real_test_img_list, txt_name):
 
         save_path = os.path.join('./test_dota', self.cfgs.VERSION)
@@ -287,7 +172,7 @@ class TestDOTA(object):
         gpu_num = len(self.args.gpus.strip().split(','))
 
         nr_image = math.ceil(nr_records / gpu_num)
-        result_queue = Queue(500)
+        result_queue = SharedResultRing(max_dets=self.args.max_dets_per_img)
         procs = []
 
         for i, gpu_id in enumerate(self.args.gpus.strip().split(',')):
@@ -299,13 +184,15 @@ class TestDOTA(object):
             proc.start()
             procs.append(proc)
 
-        for i in range(nr_records):
-            res = result_queue.get()
+        if self.args.show_box:
+            tools.makedirs(os.path.join(save_path, 'dota_img_vis'))
+        lock = threading.Lock()
+
+        def write_result(res):
 
             if self.args.show_box:
 
                 nake_name = res['image_id'].split('/')[-1]
-                tools.makedirs(os.path.join(save_path, 'dota_img_vis'))
                 draw_path = os.path.join(save_path, 'dota_img_vis', nake_name)
 
                 draw_img = np.array(cv2.imread(res['image_id']), np.float32)
@@ -341,34 +228,38 @@ class TestDOTA(object):
 
 
             else:
-                CLASS_DOTA = self.name_label_map.keys()
-                write_handle = {}
-
-                tools.makedirs(os.path.join(save_path, 'dota_res'))
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle[sub_class] = open(os.path.join(save_path, 'dota_res', 'Task1_%s.txt' % sub_class), 'a+')
-
-                for i, rbox in enumerate(res['boxes']):
-                    command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
-                                                                                     res['scores'][i],
-                                                                                     rbox[0], rbox[1], rbox[2], rbox[3],
-                                                                                     rbox[4], rbox[5], rbox[6], rbox[7],)
-                    write_handle[self.label_name_map[res['labels'][i]]].write(command)
-
-                for sub_class in CLASS_DOTA:
-                    if sub_class == 'back_ground':
-                        continue
-                    write_handle[sub_class].close()
-
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
-
-            pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
-
-            pbar.update(1)
+                with lock:
+                    CLASS_DOTA = self.name_label_map.keys()
+                    write_handle = {}
+
+                    tools.makedirs(os.path.join(save_path, 'dota_res'))
+                    for sub_class in CLASS_DOTA:
+                        if sub_class == 'back_ground':
+                            continue
+                        write_handle[sub_class] = open(os.path.join(save_path, 'dota_res', 'Task1_%s.txt' % sub_class), 'a+')
+
+                    for i, rbox in enumerate(res['boxes']):
+                        command = '%s %.3f %.1f %.1f %.1f %.1f %.1f %.1f %.1f %.1f\n' % (res['image_id'].split('/')[-1].split('.')[0],
+                                                                                         res['scores'][i],
+                                                                                         rbox[0], rbox[1], rbox[2], rbox[3],
+                                                                                         rbox[4], rbox[5], rbox[6], rbox[7],)
+                        write_handle[self.label_name_map[res['labels'][i]]].write(command)
+
+                    for sub_class in CLASS_DOTA:
+                        if sub_class == 'back_ground':
+                            continue
+                        write_handle[sub_class].close()
+
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
+
+            with lock:
+                pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+                pbar.update(1)
+
+        # several writer threads drain the shared memory ring filled by the workers
+        result_queue.drain(write_result, nr_records, self.args.num_writers)
 
         for p in procs:
             p.join()
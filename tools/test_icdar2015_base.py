@@ -10,7 +10,8 @@ from __future__ import print_function
 import argparse
 import math
 import os
-from multiprocessing import Queue, Process
+import threading
+from multiprocessing import Process
 
 import cv2
 import numpy as np
@@ -22,9 +23,11 @@ from tqdm import tqdm
 
 from alpharotate.libs.label_name_dict.label_dict import LabelMap
 from alpharotate.libs.utils import nms_rotate
+from alpharotate.libs.val_libs.icdar_eval import ICDAREval, load_samples, sample_key
 from alpharotate.utils.pretrain_zoo import PretrainModelZoo
 from alpharotate.utils.order_points import sort_corners
 from alpharotate.utils import tools
+from alpharotate.utils.shared_ring_buffer import SharedResultRing
 
 
 def parse_args():
@@ -48,6 +51,15 @@ def parse_args():
                         action='store_true')
     parser.add_argument('--cpu_nms', '-cn', default=False,
                         action='store_true')
+    parser.add_argument('--gt_path', dest='gt_path',
+                        help='gt.zip or gt directory, evaluate the results in memory after testing',
+                        default='', type=str)
+    parser.add_argument('--num_writers', dest='num_writers',
+                        help='number of threads writing the results',
+                        default=4, type=int)
+    parser.add_argument('--max_dets_per_img', dest='max_dets_per_img',
+                        help='detections of one image that fit in a shared memory slot',
+                        default=5000, type=int)
     args = parser.parse_args()
     return args
 
@@ -239,7 +251,7 @@ class TestICDAR2015(object):
                 score_res_rotate_ = np.array(score_res_rotate_)
                 label_res_rotate_ = np.array(label_res_rotate_)
 
-                result_dict = {'scales': [1, 1], 'boxes': box_res_rotate_,
+                result_dict = {'boxes': box_res_rotate_,
                                'scores': score_res_rotate_, 'labels': label_res_rotate_,
                                'image_id': a_img}
                 result_queue.put_nowait(result_dict)
@@ -254,7 +266,7 @@ class TestICDAR2015(object):
         gpu_num = len(self.args.gpus.strip().split(','))
 
         nr_image = math.ceil(nr_records / gpu_num)
-        result_queue = Queue(500)
+        result_queue = SharedResultRing(max_dets=self.args.max_dets_per_img)
         procs = []
 
         for i, gpu_id in enumerate(self.args.gpus.strip().split(',')):
@@ -266,33 +278,34 @@ class TestICDAR2015(object):
             proc.start()
             procs.append(proc)
 
-        for i in range(nr_records):
-            res = result_queue.get()
-            tools.makedirs(os.path.join(save_path, 'icdar2015_res'))
+        all_dets = {}
+        tools.makedirs(os.path.join(save_path, 'icdar2015_res'))
+        if self.args.show_box:
+            tools.makedirs(os.path.join(save_path, 'icdar2015_img_vis'))
+        lock = threading.Lock()
+
+        def write_result(res):
             if res['boxes'].shape[0] == 0:
                 fw_txt_dt = open(os.path.join(save_path, 'icdar2015_res', 'res_{}.txt'.format(res['image_id'].split('/')[-1].split('.')[0])),
                                  'w')
                 fw_txt_dt.close()
-                pbar.update(1)
 
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
-                continue
+                with lock:
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
+                    pbar.update(1)
+                return
             x1, y1, x2, y2, x3, y3, x4, y4 = res['boxes'][:, 0], res['boxes'][:, 1], res['boxes'][:, 2], res['boxes'][:, 3],\
                                              res['boxes'][:, 4], res['boxes'][:, 5], res['boxes'][:, 6], res['boxes'][:, 7]
 
-            x1, y1 = x1 * res['scales'][0], y1 * res['scales'][1]
-            x2, y2 = x2 * res['scales'][0], y2 * res['scales'][1]
-            x3, y3 = x3 * res['scales'][0], y3 * res['scales'][1]
-            x4, y4 = x4 * res['scales'][0], y4 * res['scales'][1]
-
             boxes = np.transpose(np.stack([x1, y1, x2, y2, x3, y3, x4, y4]))
+            with lock:
+                all_dets[res['image_id']] = (boxes, res['scores'])
 
             if self.args.show_box:
                 boxes = backward_convert(boxes, False)
                 nake_name = res['image_id'].split('/')[-1]
-                tools.makedirs(os.path.join(save_path, 'icdar2015_img_vis'))
                 draw_path = os.path.join(save_path, 'icdar2015_img_vis', nake_name)
                 draw_img = np.array(cv2.imread(res['image_id']), np.float32)
 
@@ -315,17 +328,31 @@ class TestICDAR2015(object):
                     fw_txt_dt.write(line)
                 fw_txt_dt.close()
 
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
+                with lock:
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
 
-            pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+            with lock:
+                pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+                pbar.update(1)
 
-            pbar.update(1)
+        # several writer threads drain the shared memory ring filled by the workers
+        result_queue.drain(write_result, nr_records, self.args.num_writers)
 
         for p in procs:
             p.join()
 
+        if self.args.gt_path != '':
+            # images skipped by resume are read back from their result files
+            res_dir = os.path.join(save_path, 'icdar2015_res')
+            if os.path.exists(res_dir):
+                tested = set([sample_key(img_name) for img_name in all_dets.keys()])
+                for key, (boxes, _, scores) in load_samples(res_dir, with_transcription=False).items():
+                    if key not in tested:
+                        all_dets[key] = (boxes, scores)
+            print(ICDAREval().evaluate(self.args.gt_path, all_dets)['method'])
+
     def get_test_image(self):
 
         txt_name = '{}.txt'.format(self.cfgs.VERSION)
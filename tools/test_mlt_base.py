@@ -10,7 +10,8 @@ from __future__ import print_function
 import argparse
 import math
 import os
-from multiprocessing import Queue, Process
+import threading
+from multiprocessing import Process
 
 import cv2
 import numpy as np
@@ -25,6 +26,7 @@ from alpharotate.libs.label_name_dict.label_dict import LabelMap
 from alpharotate.libs.utils import nms_rotate
 from alpharotate.utils.order_points import sort_corners
 from alpharotate.utils import tools
+from alpharotate.utils.shared_ring_buffer import SharedResultRing
 
 
 def parse_args():
@@ -48,6 +50,12 @@ def parse_args():
                         action='store_true')
     parser.add_argument('--cpu_nms', '-cn', default=False,
                         action='store_true')
+    parser.add_argument('--num_writers', dest='num_writers',
+                        help='number of threads writing the results',
+                        default=4, type=int)
+    parser.add_argument('--max_dets_per_img', dest='max_dets_per_img',
+                        help='detections of one image that fit in a shared memory slot',
+                        default=5000, type=int)
     args = parser.parse_args()
     return args
 
@@ -243,7 +251,7 @@ class TestMLT(object):
                 score_res_rotate_ = np.array(score_res_rotate_)
                 label_res_rotate_ = np.array(label_res_rotate_)
 
-                result_dict = {'scales': [1, 1], 'boxes': box_res_rotate_,
+                result_dict = {'boxes': box_res_rotate_,
                                'scores': score_res_rotate_, 'labels': label_res_rotate_,
                                'image_id': a_img}
                 result_queue.put_nowait(result_dict)
@@ -258,7 +266,7 @@ class TestMLT(object):
         gpu_num = len(self.args.gpus.strip().split(','))
 
         nr_image = math.ceil(nr_records / gpu_num)
-        result_queue = Queue(500)
+        result_queue = SharedResultRing(max_dets=self.args.max_dets_per_img)
         procs = []
 
         for i, gpu_id in enumerate(self.args.gpus.strip().split(',')):
@@ -270,33 +278,31 @@ class TestMLT(object):
             proc.start()
             procs.append(proc)
 
-        for i in range(nr_records):
-            res = result_queue.get()
-            tools.makedirs(os.path.join(save_path, 'mlt_res'))
+        tools.makedirs(os.path.join(save_path, 'mlt_res'))
+        if self.args.show_box:
+            tools.makedirs(os.path.join(save_path, 'mlt_img_vis'))
+        lock = threading.Lock()
+
+        def write_result(res):
             if res['boxes'].shape[0] == 0:
                 fw_txt_dt = open(os.path.join(save_path, 'mlt_res', 'res_{}.txt'.format(
                     res['image_id'].split('/')[-1].split('.')[0].split('ts_')[1])), 'w')
                 fw_txt_dt.close()
-                pbar.update(1)
 
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
-                continue
+                with lock:
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
+                    pbar.update(1)
+                return
             x1, y1, x2, y2, x3, y3, x4, y4 = res['boxes'][:, 0], res['boxes'][:, 1], res['boxes'][:, 2], res['boxes'][:, 3],\
                                              res['boxes'][:, 4], res['boxes'][:, 5], res['boxes'][:, 6], res['boxes'][:, 7]
 
-            x1, y1 = x1 * res['scales'][0], y1 * res['scales'][1]
-            x2, y2 = x2 * res['scales'][0], y2 * res['scales'][1]
-            x3, y3 = x3 * res['scales'][0], y3 * res['scales'][1]
-            x4, y4 = x4 * res['scales'][0], y4 * res['scales'][1]
-
             boxes = np.transpose(np.stack([x1, y1, x2, y2, x3, y3, x4, y4]))
 
             if self.args.show_box:
                 boxes = backward_convert(boxes, False)
                 nake_name = res['image_id'].split('/')[-1]
-                tools.makedirs(os.path.join(save_path, 'mlt_img_vis'))
                 draw_path = os.path.join(save_path, 'mlt_img_vis', nake_name)
                 draw_img = np.array(cv2.imread(res['image_id']), np.float32)
 
@@ -321,13 +327,17 @@ class TestMLT(object):
                     fw_txt_dt.write(line)
                 fw_txt_dt.close()
 
-                fw = open(txt_name, 'a+')
-                fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
-                fw.close()
+                with lock:
+                    fw = open(txt_name, 'a+')
+                    fw.write('{}\n'.format(res['image_id'].split('/')[-1]))
+                    fw.close()
 
-            pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+            with lock:
+                pbar.set_description("Test image %s" % res['image_id'].split('/')[-1])
+                pbar.update(1)
 
-            pbar.update(1)
+        # several writer threads drain the shared memory ring filled by the workers
+        result_queue.drain(write_result, nr_records, self.args.num_writers)
 
         for p in procs:
             p.join()
@@ -19,6 +19,7 @@ sys.path.append("../")
 from dataloader.dataset.read_tfrecord import ReadTFRecord
 from alpharotate.libs.utils.show_box_in_tensor import DrawBoxTensor
 from alpharotate.utils import tools
+from alpharotate.utils.step_profiler import StepProfiler
 
 
 class Train(object):
@@ -214,18 +215,28 @@ class Train(object):
 
             self.stats_graph(graph)
 
+            profiler = None
+            if self.cfgs.PROFILE_TRAIN:
+                profiler = StepProfiler(graph, os.path.join(summary_path, 'profile'),
+                                        self.cfgs.PROFILE_WINDOW, self.cfgs.PROFILE_TRACE_INTE)
+
+            def run_step(fetches, step):
+                if profiler is None:
+                    return sess.run(fetches)
+                return profiler.run(sess, fetches, step)
+
             for step in range(self.cfgs.MAX_ITERATION // num_gpu):
                 training_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time()))
 
                 if step % self.cfgs.SHOW_TRAIN_INFO_INTE != 0 and step % self.cfgs.SMRY_ITER != 0:
-                    _, global_stepnp = sess.run([train_op, global_step])
+                    _, global_stepnp = run_step([train_op, global_step], step)
 
                 else:
                     if step % self.cfgs.SHOW_TRAIN_INFO_INTE == 0 and step % self.cfgs.SMRY_ITER != 0:
                         start = time.time()
 
                         _, global_stepnp, total_loss_dict_ = \
-                            sess.run([train_op, global_step, total_loss_dict])
+                            run_step([train_op, global_step, total_loss_dict], step)
 
                         end = time.time()
 
@@ -244,12 +255,15 @@ class Train(object):
                             loss_str += '%s:%.3f\n' % (k, total_loss_dict_[k])
                         print(loss_str)
 
+                        if profiler is not None:
+                            print(profiler.summary())
+
                         if np.isnan(total_loss_dict_['total_losses']):
                             sys.exit(0)
 
                     else:
                         if step % self.cfgs.SMRY_ITER == 0:
-                            _, global_stepnp, summary_str = sess.run([train_op, global_step, summary_op])
+                            _, global_stepnp, summary_str = run_step([train_op, global_step, summary_op], step)
                             summary_writer.add_summary(summary_str, (global_stepnp-1)*num_gpu)
                             summary_writer.flush()
 